@@ -0,0 +1,37 @@
+""" batch 계산 benchmark
+
+서로 다른 수식 여러 개 / 하나의 수식과 여러 bindings를 process 개수별로 계산한 시간 비교
+
+    python -m benchmarks.bench_batch
+"""
+import os
+import time
+
+from mathpreter.batch import evaluate_bindings, evaluate_formulas
+
+
+def measure(run) -> float:
+    begin = time.perf_counter()
+    run()
+    return time.perf_counter() - begin
+
+
+def main():
+    formulas = [
+        f"let a = {i} * x; \\sum_{{k=1}}^{{40}}{{k * a + k % 3}} - _{{{i % 50 + 10}}}\\mathrm{{C}}_{{3}}"
+        for i in range(20_000)
+    ]
+    formula = "let y = x^2 + 3*x; \\sum_{k=1}^{40}{k * y % 7} / (x + 1)"
+    bindings_list = [{"x": i} for i in range(20_000)]
+
+    cpus = os.cpu_count() or 1
+    for workers in sorted({1, 2, 4, cpus}):
+        print(f"workers = {workers}")
+        elapsed = measure(lambda: evaluate_formulas(formulas, {"x": 3}, workers=workers))
+        print(f"  {len(formulas)} formulas      : {elapsed * 1000:9.1f} ms")
+        elapsed = measure(lambda: evaluate_bindings(formula, bindings_list, workers=workers))
+        print(f"  {len(bindings_list)} binding sets  : {elapsed * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+""" mmap lexing benchmark
+
+수식 파일을 str로 읽어 `RegexLexer`로 토큰화할 때와, mmap 위에서 `BufferLexer`로 토큰화할 때의
+시간과 할당량 비교. 토큰 유형만 확인하고 literal은 읽지 않음 (검증 / 색인 용도)
+
+    python -m benchmarks.bench_buffer
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_lexer import generate_equation
+from mathpreter.lexer import BufferLexer, RegexLexer, map_file
+from mathpreter.token import TokenType
+
+
+def count_tokens(lexer) -> int:
+    count = 0
+    while lexer.next_token().type != TokenType.EOF:
+        count += 1
+    return count
+
+
+def read_string(path: str) -> int:
+    with open(path, encoding="utf-8") as file:
+        return count_tokens(RegexLexer(file.read()))
+
+
+def read_mapped(path: str) -> int:
+    with map_file(path) as buffer:
+        return count_tokens(BufferLexer(buffer))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "formulas.tex")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(generate_equation(5000))
+        print(f"input: {os.path.getsize(path) / 1e6:.1f} MB")
+
+        for name, func in (("str + RegexLexer", read_string), ("mmap + BufferLexer", read_mapped)):
+            begin = time.perf_counter()
+            count = func(path)
+            elapsed = time.perf_counter() - begin
+
+            tracemalloc.start()
+            func(path)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"  {name:<20}: {count:,} tokens, {elapsed * 1000:8.1f} ms, peak {peak / 1e6:6.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+""" Python source 생성 benchmark
+
+Monte-Carlo 처럼 같은 수식을 무작위 입력으로 아주 많이 계산할 때, 평가 1회당 비용 비교 (float backend)
+tree-walking evaluator, closure 컴파일, bytecode VM, 생성된 Python 함수
+
+    python -m benchmarks.bench_codegen
+"""
+import random
+import timeit
+
+from mathpreter.codegen import compile_to_function
+from mathpreter.compiler import compile_to_bytecode
+from mathpreter.evaluator import Evaluator, compile_program
+from mathpreter.lexer import Lexer
+from mathpreter.parser import Parser
+from mathpreter.vm import VM
+
+FORMULAS = [
+    "let r2 = x^2 + y^2; r2 - 1",
+    "let y2 = x^2 + 3*x; y2 * (x - 1) / 7 + y2 % 5 + y",
+    "\\sum_{k=1}^{4}{(x * k - y)^2}",
+    "\\sum_{k=1}^{20}{k * x + y}",
+    "\\sum_{i=1}^{10}{\\prod_{j=1}^{i}{j + x}} + _{12}\\mathrm{C}_{5} * y",
+]
+
+
+def main():
+    rng = random.Random(0)
+    samples = [{"x": rng.random(), "y": rng.random()} for _ in range(1000)]
+
+    for text in FORMULAS:
+        program = Parser(Lexer(text), backend="float").parse_program()
+        evaluator = Evaluator(backend="float", closed_form=False)
+        run = compile_program(program, backend="float", closed_form=False)
+        vm = VM(compile_to_bytecode(program, "float"))
+        func = compile_to_function(program, "float")
+        parameters = func.parameters
+
+        engines = [
+            ("tree-walking", lambda: [evaluator.evaluate(program, sample) for sample in samples]),
+            ("closure", lambda: [run(sample) for sample in samples]),
+            ("bytecode VM", lambda: [vm.run(sample) for sample in samples]),
+            ("codegen", lambda: [func(*[sample[name] for name in parameters]) for sample in samples]),
+        ]
+        print(text)
+        base = None
+        for name, engine in engines:
+            elapsed = min(timeit.repeat(engine, repeat=5, number=1)) / len(samples)
+            base = base or elapsed
+            print(f"  {name:12s} : {elapsed * 1e6:8.2f} us/eval  ({base / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+""" 조합론 benchmark
+
+\\sum body 안에서 n이 수만인 _{n}\\mathrm{C}_{k} 를 계산할 때, factorial을 매번 새로 계산하는 방식과 cache 엔진 비교
+
+    python -m benchmarks.bench_combinatorics
+"""
+import time
+
+from mathpreter.combinatorics import FACTORIALS, ROWS, combination
+
+
+def naive_combination(n: int, k: int) -> int:
+    def factorial(m: int) -> int:
+        result = 1
+        for value in range(2, m + 1):
+            result *= value
+        return result
+
+    return factorial(n) // (factorial(k) * factorial(n - k))
+
+
+def measure(func, n: int, ks) -> float:
+    begin = time.perf_counter()
+    for k in ks:
+        func(n, k)
+    return time.perf_counter() - begin
+
+
+def main():
+    for n in (2000, 10000, 20000):
+        ks = range(0, n + 1, max(1, n // 200))
+        FACTORIALS.clear()
+        ROWS.clear()
+        naive = measure(naive_combination, n, ks)
+        cached = measure(combination, n, ks)
+        print(f"n={n:>6}, {len(ks)} terms")
+        print(f"  recompute factorials : {naive * 1000:10.2f} ms")
+        print(f"  cached engine        : {cached * 1000:10.2f} ms  ({naive / cached:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
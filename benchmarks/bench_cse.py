@@ -0,0 +1,71 @@
+""" 공통 부분식 제거(CSE)와 hash-consing benchmark
+
+* 계산 : 같은 부분식이 합기호 body에 반복되는 수식을 Evaluator / CSEEvaluator로 계산 (closed form 없이)
+* 메모리 : 생성된 수식 여러 개의 AST를 그대로 보관할 때와 하나의 Interner로 intern해서 보관할 때
+
+    python -m benchmarks.bench_cse
+"""
+import gc
+import timeit
+import tracemalloc
+
+from mathpreter.cse import CSEEvaluator, Interner
+from mathpreter.evaluator import Evaluator
+from mathpreter.lexer import Lexer
+from mathpreter.parser import Parser
+
+FORMULAS = [
+    "\\sum_{k=1}^{1000}{(x+1)^2 * k + (x+1)^2 / 3 - (x+1)^2 + (x+1)^2 % 7 + (x+1)^2}",
+    "\\sum_{k=1}^{1000}{(k*x + 1)^2 + (k*x + 1)^2 / 2 + (y - x)^3 * k}",
+    "\\sum_{i=1}^{30}{\\sum_{j=1}^{30}{(i + y)^2 * j + (i + y)^2 + (x * y)^3}}",
+]
+
+
+def generate_formulas(n: int):
+    for i in range(n):
+        yield f"let y = (x+1)^2 * {i % 10}; \\sum_{{k=1}}^{{n}}{{(x+1)^2 * k + y / (x+1)^2}} + (x+1)^2"
+
+
+def parse(text: str):
+    return Parser(Lexer(text)).parse_program()
+
+
+def measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main():
+    bindings = {"x": 3, "y": 2}
+    for text in FORMULAS:
+        program = parse(text)
+        evaluator = Evaluator(closed_form=False)
+        cse = CSEEvaluator(closed_form=False)
+        assert evaluator.evaluate(program, bindings) == cse.evaluate(program, bindings)
+
+        base = min(timeit.repeat(lambda: evaluator.evaluate(program, bindings), repeat=5, number=3)) / 3
+        elapsed = min(timeit.repeat(lambda: cse.evaluate(program, bindings), repeat=5, number=3)) / 3
+        print(text)
+        print(f"  Evaluator    : {base * 1e3:8.2f} ms/eval")
+        print(f"  CSEEvaluator : {elapsed * 1e3:8.2f} ms/eval  ({base / elapsed:.2f}x)")
+
+    texts = list(generate_formulas(10000))
+    plain = measure(lambda: [parse(text) for text in texts])
+
+    def interned():
+        interner = Interner()
+        return [interner.intern_program(parse(text)) for text in texts]
+
+    shared = measure(interned)
+    print(f"AST of {len(texts)} formulas")
+    print(f"  as parsed : {plain / 2 ** 20:8.2f} MiB")
+    print(f"  interned  : {shared / 2 ** 20:8.2f} MiB  ({plain / shared:.2f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+""" Evaluator benchmark
+
+같은 수식을 bindings만 바꿔가며 반복 계산할 때, tree-walking evaluator와 compile 모드의 평가 1회당 비용 비교
+
+    python -m benchmarks.bench_evaluator
+"""
+import timeit
+
+from mathpreter.evaluator import Evaluator, compile_program
+from mathpreter.lexer import Lexer
+from mathpreter.parser import Parser
+
+FORMULAS = [
+    "1 + 3^3 * 5 + 2/5",
+    "let y = x^2 + 3*x; y * (x - 1) / 7 + y % 5",
+    "\\sum_{k=1}^{20}{k * x + 1}",
+]
+
+
+def main():
+    evaluator = Evaluator()
+    for text in FORMULAS:
+        program = Parser(Lexer(text)).parse_program()
+        run = compile_program(program)
+        bindings = {"x": 3}
+
+        number = 2000
+        walk = min(timeit.repeat(lambda: evaluator.evaluate(program, bindings), repeat=5, number=number)) / number
+        compiled = min(timeit.repeat(lambda: run(bindings), repeat=5, number=number)) / number
+        print(text)
+        print(f"  tree-walking : {walk * 1e6:8.2f} us/eval")
+        print(f"  compiled     : {compiled * 1e6:8.2f} us/eval  ({walk / compiled:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
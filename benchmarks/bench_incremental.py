@@ -0,0 +1,64 @@
+""" 증분 파싱 benchmark
+
+긴 문서에 한 글자씩 입력할 때, 입력 1회마다 전체를 다시 파싱하는 경우와 IncrementalDocument.edit 비교
+
+    python -m benchmarks.bench_incremental
+"""
+import time
+
+from mathpreter.errors import LexerException, ParserException
+from mathpreter.incremental import IncrementalDocument
+from mathpreter.lexer import RegexLexer
+from mathpreter.parser import Parser
+
+
+def generate_document(n: int) -> str:
+    return "; ".join(
+        f"let a{i} = \\sum_{{k=1}}^{{n}}{{(k * x{i % 7} + {i})^2}} - _{{n}}\\mathrm{{C}}_{{{i % 5}}} / (a{max(i - 1, 0)} + 1)"
+        for i in range(n)
+    )
+
+
+def keystrokes(document: IncrementalDocument, offset: int, typed: str):
+    """ offset에 typed를 한 글자씩 입력. 입력 1회당 평균 시간 (full, incremental)
+    """
+    full = incremental = 0.0
+    for i, char in enumerate(typed):
+        text = document.text[:offset + i] + char + document.text[offset + i:]
+
+        # 입력 중간에는 파싱에 실패하는 텍스트도 있음
+        start = time.perf_counter()
+        try:
+            Parser(RegexLexer(text)).parse_program()
+        except (LexerException, ParserException):
+            pass
+        full += time.perf_counter() - start
+
+        start = time.perf_counter()
+        try:
+            document.edit(offset + i, 0, char)
+        except (LexerException, ParserException):
+            pass
+        incremental += time.perf_counter() - start
+    return full / len(typed), incremental / len(typed)
+
+
+def main():
+    for n in (100, 1000, 5000):
+        text = generate_document(n)
+        print(f"{n} statements ({len(text)} chars)")
+        for name, offset, typed in [
+            ("middle, inside a reducer body", text.index(f"+ {n // 2})^2"), "+ 2*y"),
+            ("middle, after a reducer", text.index("- _{n}", text.index(f"a{n // 2} =")), "* 3 "),
+            ("start of document", 0, "let z = 1; "),
+        ]:
+            document = IncrementalDocument(text)
+            full, incremental = keystrokes(document, offset, typed)
+            print(
+                f"  {name:32s} : full {full * 1e3:8.3f} ms, incremental {incremental * 1e3:7.3f} ms "
+                f"({full / incremental:.0f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
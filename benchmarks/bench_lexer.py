@@ -0,0 +1,41 @@
+""" Lexer throughput benchmark
+
+문자 단위 `Lexer`와 master pattern 기반 `RegexLexer`의 처리량 비교 (수십 KB 크기의 생성된 수식)
+
+    python -m benchmarks.bench_lexer
+"""
+import timeit
+
+from mathpreter.lexer import Lexer, RegexLexer
+
+
+def generate_equation(n_statements: int) -> str:
+    lines = []
+    for i in range(n_statements):
+        lines.append(f"let x{i} = \\sum_{{k=1}}^{{{i + 10}}}{{k^2 * 3.25 + x{i} / (k + \\pi)}} - _{{{i}}}\\mathrm{{C}}_{{3}};")
+    return "\n".join(lines)
+
+
+def main():
+    text = generate_equation(500)
+    size_kb = len(text) / 1024
+
+    engines = [
+        ("Lexer.tokenize", lambda: Lexer(text).tokenize()),
+        ("RegexLexer.next_token", lambda: _drain(RegexLexer(text))),
+        ("RegexLexer.tokenize", lambda: RegexLexer(text).tokenize()),
+    ]
+    n_tokens = len(RegexLexer(text).tokenize())
+    print(f"input: {size_kb:.1f} KB, {n_tokens:,} tokens")
+    for name, func in engines:
+        best = min(timeit.repeat(func, repeat=5, number=3)) / 3
+        print(f"{name:<24}: {best * 1000:8.2f} ms  ({size_kb / best / 1024:6.2f} MB/s)")
+
+
+def _drain(lexer: RegexLexer):
+    while lexer.next_token().literal:
+        pass
+
+
+if __name__ == "__main__":
+    main()
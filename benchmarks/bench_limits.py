@@ -0,0 +1,33 @@
+""" 자원 제한 benchmark
+
+제한이 없을 때와 EvaluationLimits를 줬을 때, 합기호 반복 1회당 비용 (CHECK_INTERVAL번마다 확인하는 비용)
+
+    python -m benchmarks.bench_limits
+"""
+import timeit
+
+from mathpreter.evaluator import Evaluator, compile_program
+from mathpreter.lexer import Lexer
+from mathpreter.limits import EvaluationLimits
+from mathpreter.parser import Parser
+
+FORMULA = "\\sum_{k=1}^{20000}{k % 7 + k * 3}"
+
+LIMITS = EvaluationLimits(max_iterations=10 ** 7, max_digits=10 ** 4, max_depth=100, timeout=60)
+
+
+def main():
+    iterations = 20000
+    for backend in ("float", "decimal"):
+        program = Parser(Lexer(FORMULA), backend=backend).parse_program()
+        for name, limits in (("no limits", None), ("limits", LIMITS)):
+            evaluator = Evaluator(backend=backend, limits=limits, closed_form=False)
+            run = compile_program(program, backend=backend, limits=limits, closed_form=False)
+
+            walk = min(timeit.repeat(lambda: evaluator.evaluate(program), repeat=3, number=1)) / iterations
+            compiled = min(timeit.repeat(run, repeat=3, number=1)) / iterations
+            print(f"{backend:8s} {name:10s} : evaluator {walk * 1e9:8.1f} ns/iter, compiled {compiled * 1e9:8.1f} ns/iter")
+
+
+if __name__ == "__main__":
+    main()
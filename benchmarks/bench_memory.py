@@ -0,0 +1,60 @@
+""" AST 메모리 benchmark
+
+생성된 수식 여러 개를 파싱해서 상주시킬 때, AST node(Token 포함) 1개당 메모리 사용량
+
+    python -m benchmarks.bench_memory
+"""
+import gc
+import tracemalloc
+
+from mathpreter.ast import (
+    Node, Program, LetStatement, ExpressionStatement, PrefixExpression, InfixExpression,
+    MathReducerExpression, CombinatoricsExpression
+)
+from mathpreter.lexer import RegexLexer
+from mathpreter.parser import Parser
+
+
+def generate_formulas(n: int):
+    for i in range(n):
+        yield f"let y{i} = -x{i} * 3.5 + \\sum_{{k=1}}^{{{i}}}{{k^2 + x{i} / 7}}; y{i} % 4 + _{{{i}}}\\mathrm{{C}}_{{2}}"
+
+
+def count_nodes(node: Node) -> int:
+    if isinstance(node, Program):
+        return 1 + sum(count_nodes(stmt) for stmt in node.statements)
+    if isinstance(node, LetStatement):
+        return 1 + count_nodes(node.name) + count_nodes(node.value)
+    if isinstance(node, ExpressionStatement):
+        return 1 + count_nodes(node.expression)
+    if isinstance(node, PrefixExpression):
+        return 1 + count_nodes(node.right)
+    if isinstance(node, InfixExpression):
+        return 1 + count_nodes(node.left) + count_nodes(node.right)
+    if isinstance(node, MathReducerExpression):
+        return 1 + sum(count_nodes(child) for child in (node.identifier, node.start, node.end, node.body))
+    if isinstance(node, CombinatoricsExpression):
+        return 1 + sum(count_nodes(child) for child in (node.identifier, node.left, node.right))
+    return 1
+
+
+def main():
+    formulas = list(generate_formulas(20000))
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    programs = [Parser(RegexLexer(text)).parse_program() for text in formulas]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    n_nodes = sum(count_nodes(program) for program in programs)
+    print(f"programs : {len(programs):,}")
+    print(f"nodes    : {n_nodes:,}")
+    print(f"memory   : {(after - before) / 1024 / 1024:.1f} MB")
+    print(f"per node : {(after - before) / n_nodes:.1f} bytes (including tokens and literal values)")
+
+
+if __name__ == "__main__":
+    main()
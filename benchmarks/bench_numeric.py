@@ -0,0 +1,33 @@
+""" numeric backend benchmark
+
+같은 수식을 float / Decimal / Fraction backend로 반복 계산할 때의 평가 1회당 비용 비교
+
+    python -m benchmarks.bench_numeric
+"""
+import timeit
+
+from mathpreter.evaluator import compile_program
+from mathpreter.lexer import Lexer
+from mathpreter.parser import Parser
+
+FORMULAS = [
+    "1 + 3^3 * 5 + 2/5",
+    "let y = x^2 + 3*x; y * (x - 1) / 7 + y % 5",
+    "\\sum_{k=1}^{50}{x / k}",
+]
+
+
+def main():
+    for text in FORMULAS:
+        print(text)
+        timings = {}
+        for backend in ("float", "decimal", "fraction"):
+            run = compile_program(Parser(Lexer(text), backend=backend).parse_program(), backend=backend)
+            number = 2000
+            timings[backend] = min(timeit.repeat(lambda: run({"x": 3}), repeat=5, number=number)) / number
+        for backend, elapsed in timings.items():
+            print(f"  {backend:<8}: {elapsed * 1e6:8.2f} us/eval  ({elapsed / timings['float']:.1f}x float)")
+
+
+if __name__ == "__main__":
+    main()
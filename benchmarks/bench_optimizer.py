@@ -0,0 +1,32 @@
+""" 최적화 benchmark
+
+큰 상수 부분식을 가진 생성된 수식을 최적화 전 / 후로 반복 계산할 때의 평가 1회당 비용 비교
+
+    python -m benchmarks.bench_optimizer
+"""
+import timeit
+
+from mathpreter.evaluator import compile_program
+from mathpreter.lexer import Lexer
+from mathpreter.optimizer import optimize
+from mathpreter.parser import Parser
+
+
+def generate_formula(depth: int) -> str:
+    constant = " + ".join(f"({i} * 2^3 - {i} / 4)" for i in range(depth))
+    return f"let c = {constant}; \\sum_{{k=1}}^{{n}}{{(x * 1 + 0) * ({constant}) * k % 7}} + c * x"
+
+
+def main():
+    program = Parser(Lexer(generate_formula(20))).parse_program()
+    optimized = optimize(program)
+    bindings = {"x": 3, "n": 50}
+
+    for name, target in (("original", program), ("optimized", optimized)):
+        run = compile_program(target)
+        elapsed = min(timeit.repeat(lambda: run(bindings), repeat=5, number=200)) / 200
+        print(f"{name:<10}: {elapsed * 1e6:10.2f} us/eval")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+""" 합기호 / 곱기호 범위 분할 benchmark
+
+closed form이 없는 큰 정수 곱셈(fraction backend)을 한 process에서 순서대로 반복한 시간과
+범위를 나누어 worker process에서 계산한 뒤 balanced tree로 곱한 시간 비교
+
+    python -m benchmarks.bench_parallel
+"""
+import os
+import time
+
+from mathpreter.evaluator import compile_program
+from mathpreter.lexer import Lexer
+from mathpreter.parser import Parser
+
+
+def measure(run) -> float:
+    begin = time.perf_counter()
+    run()
+    return time.perf_counter() - begin
+
+
+def main():
+    print(f"{os.cpu_count()} CPUs")
+    for text in (
+            "\\prod_{k=1}^{20000}{k}",
+            "\\prod_{k=1}^{50000}{(2*k + 1)}",
+            "\\sum_{k=1}^{2000}{_{k}\\mathrm{C}_{k / 2 - k % 2 / 2}}",
+    ):
+        program = Parser(Lexer(text)).parse_program()
+        strategies = [
+            ("sequential", compile_program(program, backend="fraction", parallel_threshold=None)),
+            ("split, 1 process", compile_program(program, backend="fraction", parallel_threshold=1000, workers=1)),
+            ("split, processes", compile_program(program, backend="fraction", parallel_threshold=1000)),
+        ]
+        print(text)
+        for name, run in strategies:
+            print(f"  {name:<18}: {measure(run) * 1000:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+""" 재귀 Parser와 IterativeParser의 파싱 시간 비교 (10^5 항의 생성된 수식)
+
+* chain : `x0 * 0 + x1 * 1 + ...` 처럼 긴 연산자 연쇄
+* nested : `(((x + 1) * 2 - 3) ...)` 처럼 깊은 괄호 중첩 (재귀 Parser는 재귀 한도에 걸림)
+
+    python -m benchmarks.bench_parser
+"""
+import sys
+import timeit
+
+from mathpreter.lexer import RegexLexer
+from mathpreter.parser import Parser, IterativeParser
+
+TERMS = 10 ** 5
+
+
+def operator_chain(terms: int) -> str:
+    return " + ".join(f"x{i} * {i % 97 + 1}" for i in range(terms))
+
+
+def nested_parens(terms: int) -> str:
+    operators = "+-*/"
+    return "(" * terms + "x" + "".join(f" {operators[i % 4]} {i % 9 + 1})" for i in range(terms))
+
+
+def main():
+    print(f"recursion limit : {sys.getrecursionlimit()}")
+    for name, text in (("chain", operator_chain(TERMS)), ("nested", nested_parens(TERMS))):
+        tokens = RegexLexer(text).tokenize()
+        lexing = min(timeit.repeat(lambda: RegexLexer(text).tokenize(), repeat=3, number=1))
+        print(f"{name:6s} : {len(tokens):,} tokens (lexing {lexing * 1000:.0f} ms)")
+        for parser_cls in (Parser, IterativeParser):
+            try:
+                best = min(timeit.repeat(lambda: parser_cls(RegexLexer(text)).parse_program(), repeat=3, number=1))
+            except RecursionError:
+                print(f"  {parser_cls.__name__:16s}: RecursionError")
+                continue
+            print(f"  {parser_cls.__name__:16s}: {best * 1000:8.1f} ms  ({best / len(tokens) * 1e9:6.0f} ns/token)")
+
+
+if __name__ == "__main__":
+    main()
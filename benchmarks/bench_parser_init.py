@@ -0,0 +1,33 @@
+""" 짧은 수식 하나에 대한 Parser 생성 + 파싱 시간
+
+작은 수식을 아주 많이 파싱할 때는 파싱 자체보다 Parser 생성 비용이 큼
+
+    python -m benchmarks.bench_parser_init
+"""
+import timeit
+
+from mathpreter.lexer import Lexer, RegexLexer
+from mathpreter.parser import Parser
+
+FORMULAS = ["1", "x + 1", "let y = 2 * x; y^2 - 3", "\\sum_{k=1}^{n}{k}"]
+
+
+def best(func, number: int) -> float:
+    return min(timeit.repeat(func, repeat=5, number=number)) / number
+
+
+def main():
+    number = 5000
+    for formula in FORMULAS:
+        construct = best(lambda: Parser(RegexLexer(formula)), number)
+        lexing = best(lambda: RegexLexer(formula).tokenize(), number)
+        total = best(lambda: Parser(RegexLexer(formula)).parse_program(), number)
+        char_lexer = best(lambda: Parser(Lexer(formula)).parse_program(), number)
+        print(
+            f"{formula!r:28s}: construct {construct * 1e6:6.2f} us, lex {lexing * 1e6:6.2f} us, "
+            f"construct + parse {total * 1e6:6.2f} us (Lexer {char_lexer * 1e6:6.2f} us)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+""" profiling 비용 benchmark
+
+profile을 한번도 쓰지 않았을 때 / profile이 끝난 뒤 / profile 중의 파싱 + 계산 시간 비교
+(profile이 끝나면 wrapper를 제거하므로 앞의 두 값은 같아야 함)
+
+    python -m benchmarks.bench_profiling
+"""
+import timeit
+
+from mathpreter.evaluator import Evaluator
+from mathpreter.lexer import RegexLexer
+from mathpreter.parser import Parser
+from mathpreter.profiling import profile
+
+FORMULA = "let a = x^2; \\sum_{k=1}^{200}{k % 7 + a * k} + _{10}\\mathrm{C}_{3}"
+
+
+def parse_and_evaluate():
+    program = Parser(RegexLexer(FORMULA)).parse_program()
+    return Evaluator(closed_form=False).evaluate(program, {"x": 3})
+
+
+def measure(number: int = 50) -> float:
+    return min(timeit.repeat(parse_and_evaluate, repeat=5, number=number)) / number
+
+
+def main():
+    before = measure()
+    with profile() as report:
+        during = measure()
+    after = measure()
+
+    print(f"before profile : {before * 1e6:9.1f} us/formula")
+    print(f"during profile : {during * 1e6:9.1f} us/formula")
+    print(f"after profile  : {after * 1e6:9.1f} us/formula")
+    print()
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
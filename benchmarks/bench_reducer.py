@@ -0,0 +1,37 @@
+""" 합기호 benchmark
+
+같은 \\sum 을 반복 계산(naive loop), NumPy reduction(vectorized), closed form으로 계산한 시간 비교
+
+    python -m benchmarks.bench_reducer
+"""
+import time
+
+from mathpreter.evaluator import compile_program
+from mathpreter.lexer import Lexer
+from mathpreter.parser import Parser
+
+
+def measure(run) -> float:
+    begin = time.perf_counter()
+    run()
+    return time.perf_counter() - begin
+
+
+def main():
+    for end in ("10^5", "10^6", "10^8"):
+        text = f"\\sum_{{k=1}}^{{{end}}}{{3*k^2 + 5 - k/7}}"
+        program = Parser(Lexer(text)).parse_program()
+        strategies = [
+            ("closed form", compile_program(program)),
+            ("vectorized", compile_program(program, closed_form=False, vectorize_reducers=True)),
+        ]
+        if end != "10^8":
+            strategies.append(("naive loop", compile_program(program, closed_form=False)))
+
+        print(text)
+        for name, run in strategies:
+            print(f"  {name:<12}: {measure(run) * 1000:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
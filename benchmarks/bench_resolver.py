@@ -0,0 +1,34 @@
+""" slot frame benchmark
+
+`let` 이 많은 Program에서 합기호 body가 여러 변수를 반복해서 읽을 때, compile 모드의 평가 1회당 비용
+
+    python -m benchmarks.bench_resolver
+"""
+import timeit
+
+from mathpreter.evaluator import compile_program
+from mathpreter.lexer import Lexer
+from mathpreter.parser import Parser
+
+
+def many_lets(count: int) -> str:
+    """ a0 .. a{count-1} 를 정의한 뒤 합기호 body에서 모두 읽는 Program
+    """
+    lets = ["let a0 = x"] + [f"let a{i} = a{i - 1} + {i}" for i in range(1, count)]
+    body = " + ".join(f"a{i} * k" for i in range(0, count, max(count // 8, 1)))
+    return "; ".join(lets + [f"\\sum_{{k=1}}^{{200}}{{{body}}}"])
+
+
+def main():
+    for count in (8, 32, 64):
+        program = Parser(Lexer(many_lets(count)), backend="float").parse_program()
+        run = compile_program(program, backend="float", closed_form=False)
+        bindings = {"x": 3}
+
+        number = 200
+        elapsed = min(timeit.repeat(lambda: run(bindings), repeat=5, number=number)) / number
+        print(f"{count:3d} lets : {elapsed * 1e6:8.2f} us/eval")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+""" 계산 server load generator
+
+server를 같은 process에서 띄운 뒤, 여러 연결에서 동시에 요청을 보내 처리량과 지연 시간(p50, p99)을 측정
+
+    python -m benchmarks.bench_server
+"""
+import asyncio
+import json
+import time
+
+from mathpreter.server import EvaluationServer
+
+FORMULAS = [
+    "1 + 3^3 * 5 + 2/5",
+    "let y = x^2 + 3*x; y * (x - 1) / 7 + y % 5",
+    "\\sum_{k=1}^{200}{k * x % 7}",
+    "_{40}\\mathrm{C}_{x}",
+]
+
+
+async def client(host: str, port: int, requests: int, offset: int, latencies: list):
+    reader, writer = await asyncio.open_connection(host, port)
+    for i in range(requests):
+        request = {"id": i, "formula": FORMULAS[(offset + i) % len(FORMULAS)], "bindings": {"x": i % 20}}
+        begin = time.perf_counter()
+        writer.write(json.dumps(request).encode("utf-8") + b"\n")
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - begin)
+        assert "result" in response, response
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run(connections: int, requests: int, workers: int, queue_depth: int):
+    server = EvaluationServer(workers=workers, queue_depth=queue_depth)
+    listener = await server.start_tcp()
+    host, port = listener.sockets[0].getsockname()[:2]
+
+    latencies = []
+    begin = time.perf_counter()
+    await asyncio.gather(*(client(host, port, requests, offset, latencies) for offset in range(connections)))
+    elapsed = time.perf_counter() - begin
+    await server.close()
+
+    latencies.sort()
+    total = connections * requests
+    print(
+        f"  {connections:3d} connections x {requests} requests : {total / elapsed:8.0f} req/s, "
+        f"p50 {latencies[total // 2] * 1000:6.2f} ms, p99 {latencies[int(total * 0.99)] * 1000:6.2f} ms"
+    )
+
+
+def main():
+    for workers, queue_depth in ((1, 8), (4, 64)):
+        print(f"workers = {workers}, queue_depth = {queue_depth}")
+        for connections in (1, 16, 64):
+            asyncio.run(run(connections, 200, workers, queue_depth))
+
+
+if __name__ == "__main__":
+    main()
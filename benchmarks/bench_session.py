@@ -0,0 +1,48 @@
+""" 증분 계산 benchmark
+
+let이 많은 Program에서 입력 변수 1개만 바꿔 반복해서 계산할 때, 매번 전체를 계산하는 Evaluator와 EvaluationSession 비교
+
+    python -m benchmarks.bench_session
+"""
+import timeit
+
+from mathpreter.evaluator import Evaluator
+from mathpreter.lexer import Lexer
+from mathpreter.parser import Parser
+from mathpreter.session import EvaluationSession
+
+
+def generate_program(n: int) -> str:
+    """ 입력 x0 ... x9 를 각각 읽는 let 사슬 10개
+    """
+    lets = []
+    for i in range(n):
+        chain = i % 10
+        previous = f"x{chain}" if i < 10 else f"v{i - 10}"
+        lets.append(f"let v{i} = {previous} * 3 + \\sum_{{k=1}}^{{20}}{{k % 7 + {previous}}}")
+    total = " + ".join(f"v{i}" for i in range(n - 10, n))
+    return "; ".join(lets) + f"; {total}"
+
+
+def main():
+    for n in (100, 1000):
+        program = Parser(Lexer(generate_program(n))).parse_program()
+        bindings = [{f"x{j}": 1 for j in range(10)} for _ in range(10)]
+        for i, binding in enumerate(bindings):
+            binding["x0"] = i
+
+        evaluator = Evaluator(closed_form=False)
+        session = EvaluationSession(program, Evaluator(closed_form=False))
+        session.evaluate(bindings[-1])
+        for binding in bindings:
+            assert session.evaluate(binding) == evaluator.evaluate(program, binding)
+
+        base = min(timeit.repeat(lambda: [evaluator.evaluate(program, b) for b in bindings], repeat=3, number=1))
+        elapsed = min(timeit.repeat(lambda: [session.evaluate(b) for b in bindings], repeat=3, number=1))
+        print(f"{n} let statements, x0 changes on every refresh")
+        print(f"  Evaluator         : {base / len(bindings) * 1e3:8.2f} ms/refresh")
+        print(f"  EvaluationSession : {elapsed / len(bindings) * 1e3:8.2f} ms/refresh  ({base / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
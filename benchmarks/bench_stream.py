@@ -0,0 +1,60 @@
+""" streaming 파싱 benchmark
+
+여러 수식이 `;` 로 이어진 파일을 한번에 읽어 파싱할 때와 parse_stream으로 구문 단위로 파싱할 때의
+시간과 최대 메모리 사용량 비교 (구문은 계산 후 버림)
+
+    python -m benchmarks.bench_stream
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+
+from mathpreter.lexer import RegexLexer
+from mathpreter.parser import Parser
+from mathpreter.stream import parse_stream
+
+
+def write_formulas(path: str, count: int):
+    with open(path, "w", encoding="utf-8") as file:
+        for i in range(count):
+            file.write(f"let a{i % 100} = \\sum_{{k=1}}^{{{i % 50 + 1}}}{{k * x + {i}}} - y ^ 2 / 7;\n")
+
+
+def whole_file(path: str) -> int:
+    with open(path, encoding="utf-8") as file:
+        text = file.read()
+    return len(Parser(RegexLexer(text)).parse_program().statements)
+
+
+def streaming(path: str) -> int:
+    return sum(1 for _ in parse_stream(path))
+
+
+def measure(func, path: str):
+    begin = time.perf_counter()
+    count = func(path)
+    elapsed = time.perf_counter() - begin
+
+    # tracemalloc은 실행을 크게 느리게 하므로 시간과 따로 측정
+    tracemalloc.start()
+    func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "formulas.tex")
+        for count in (5_000, 20_000):
+            write_formulas(path, count)
+            print(f"{count} statements, {os.path.getsize(path) / 1e6:.1f} MB")
+            for name, func in (("whole file", whole_file), ("parse_stream", streaming)):
+                statements, elapsed, peak = measure(func, path)
+                assert statements == count
+                print(f"  {name:<12}: {elapsed * 1000:8.1f} ms, peak {peak / 1e6:8.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
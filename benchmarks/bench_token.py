@@ -0,0 +1,62 @@
+""" Token 분류 micro-benchmark
+
+linear scan 방식(기존 Token.__init__)과 TOKEN_TABLE 조회 방식의 초당 토큰 처리량 비교
+
+    python -m benchmarks.bench_token
+"""
+import timeit
+
+from mathpreter.token import CONSTANTS, Token, TokenType
+from mathpreter.utils import is_numeric
+
+WORDS = [
+    "\\sum", "_", "{", "k", "=", "1", "}", "^", "{", "100", "}", "{", "k", "*", "3.5", "+", "\\pi", "}",
+    ";", "let", "x", "=", "-", "(", "12", "/", "y", ")", "%", "\\mathrm", "\\exp", "variable",
+]
+
+
+def classify_with_linear_scan(word: str):
+    """ 기존 Token.__init__ 의 분류 로직 """
+    word = word.strip()
+    if not word:
+        return TokenType.EOF, ""
+    for symbol in TokenType.symbols():
+        if word == symbol:
+            return symbol, word
+    for token in TokenType.latex_syntax():
+        if word == token:
+            return TokenType.TEX_REDUCE_OP, word
+    for k, v in CONSTANTS.items():
+        if word == k:
+            return TokenType.NUMBER, v
+    for token in TokenType.reserved_words():
+        if word == token:
+            return token, word
+    if is_numeric(word):
+        return TokenType.NUMBER, word
+    elif word[0].isalpha() and word.isalnum():
+        return TokenType.IDENT, word
+    elif word[0] == '\\' and word[1:].isalpha():
+        return TokenType.TEX_SYMBOL, word
+    return TokenType.ILLEGAL, word
+
+
+def tokens_per_second(func, repeat: int = 5, number: int = 2000) -> float:
+    def run():
+        for word in WORDS:
+            func(word)
+
+    best = min(timeit.repeat(run, repeat=repeat, number=number))
+    return len(WORDS) * number / best
+
+
+def main():
+    before = tokens_per_second(classify_with_linear_scan)
+    after = tokens_per_second(Token)
+    print(f"linear scan : {before:>12,.0f} tokens/s")
+    print(f"token table : {after:>12,.0f} tokens/s")
+    print(f"speedup     : {after / before:>12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+""" 배열 계산 benchmark
+
+하나의 수식을 10^7개의 데이터에 대해 계산할 때, compile 모드 scalar 반복과 NumPy 배열 연산 비교
+(scalar 반복은 10^4개로 측정한 뒤 환산)
+
+    python -m benchmarks.bench_vectorize
+"""
+import time
+
+import numpy as np
+
+from mathpreter.evaluator import compile_program
+from mathpreter.lexer import Lexer
+from mathpreter.parser import Parser
+from mathpreter.vectorize import vectorize_program
+
+
+def main():
+    program = Parser(Lexer("x^2 + 3*x - x / \\pi")).parse_program()
+    n_points = 10 ** 7
+    xs = np.random.default_rng(0).random(n_points)
+
+    run = compile_program(program)
+    sample = xs[:10 ** 4].tolist()
+    begin = time.perf_counter()
+    for x in sample:
+        run({"x": x})
+    scalar = (time.perf_counter() - begin) * n_points / len(sample)
+
+    vectorized = vectorize_program(program)
+    begin = time.perf_counter()
+    vectorized({"x": xs})
+    elapsed = time.perf_counter() - begin
+
+    print(f"points          : {n_points:,}")
+    print(f"scalar (approx) : {scalar:8.2f} s")
+    print(f"vectorized      : {elapsed:8.2f} s  ({scalar / elapsed:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
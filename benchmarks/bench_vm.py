@@ -0,0 +1,54 @@
+""" VM benchmark
+
+같은 수식을 tree-walking evaluator, closure 컴파일, bytecode VM으로 반복 계산한 평가 1회당 비용 비교
+세 방식 모두 합기호는 closed form 없이 반복 계산
+
+    python -m benchmarks.bench_vm
+"""
+import timeit
+
+from mathpreter.compiler import compile_to_bytecode
+from mathpreter.evaluator import Evaluator, compile_program
+from mathpreter.lexer import Lexer
+from mathpreter.parser import Parser
+from mathpreter.vm import VM
+
+
+def deep_formula(depth: int) -> str:
+    """ 괄호가 depth 단계로 중첩된 수식
+    """
+    text = "x"
+    for i in range(depth):
+        text = f"({text} * {i % 7 + 1} + x - {i % 3})"
+    return text
+
+
+FORMULAS = [
+    "1 + 3^3 * 5 + 2/5",
+    "let y = x^2 + 3*x; y * (x - 1) / 7 + y % 5",
+    "\\sum_{k=1}^{20}{k * x + 1}",
+    "\\sum_{i=1}^{10}{\\prod_{j=1}^{i}{j + x}}",
+    deep_formula(60),
+]
+
+
+def main():
+    for text in FORMULAS:
+        program = Parser(Lexer(text), backend="float").parse_program()
+        evaluator = Evaluator(backend="float", closed_form=False)
+        run = compile_program(program, backend="float", closed_form=False)
+        vm = VM(compile_to_bytecode(program, "float"))
+        bindings = {"x": 3}
+
+        number = 500
+        walk = min(timeit.repeat(lambda: evaluator.evaluate(program, bindings), repeat=5, number=number)) / number
+        closure = min(timeit.repeat(lambda: run(bindings), repeat=5, number=number)) / number
+        bytecode = min(timeit.repeat(lambda: vm.run(bindings), repeat=5, number=number)) / number
+        print(text if len(text) < 60 else text[:57] + "...")
+        print(f"  tree-walking : {walk * 1e6:8.2f} us/eval")
+        print(f"  closure      : {closure * 1e6:8.2f} us/eval  ({walk / closure:.2f}x)")
+        print(f"  bytecode VM  : {bytecode * 1e6:8.2f} us/eval  ({walk / bytecode:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Set, Union
 from decimal import Decimal
+from fractions import Fraction
 
 from mathpreter.token import Token
 
 
 class Node(ABC):
     """AST(Abstract Syntax Tree) 내 Node들"""
+    __slots__ = ()
 
     @abstractmethod
     def literal(self) -> str:
@@ -15,15 +17,23 @@ class Node(ABC):
 
 class Expression(Node):
     """표현식"""
-    pass
+    __slots__ = ()
+
+    @abstractmethod
+    def structural_key(self) -> tuple:
+        """ 구조 비교에 사용하는 값들 (연산자, 리터럴, 이름, 하위 표현식). 하위 표현식은 node 그대로 담음
+        같은 유형이고 key가 같으면 같은 구조 (hash-consing, CSE에 사용. cse.Interner 참고)
+        """
+        pass
 
 
 class Statement(Node):
     """명령문"""
-    pass
+    __slots__ = ()
 
 
 class Program(Node):
+    __slots__ = ("statements",)
     statements: List[Statement]
 
     def __init__(self, statements: Optional[List[Statement]] = None):
@@ -44,6 +54,7 @@ class Program(Node):
 class ExpressionStatement(Statement):
     """ 표현식
     """
+    __slots__ = ("token", "expression")
     token: Token
     expression: Expression
 
@@ -61,6 +72,7 @@ class ExpressionStatement(Statement):
 class Identifier(Expression):
     """ 식별자
     """
+    __slots__ = ("token", "value")
     token: Token
     value: str
 
@@ -71,22 +83,32 @@ class Identifier(Expression):
     def literal(self) -> str:
         return self.token.literal
 
+    def structural_key(self) -> tuple:
+        return (self.value,)
+
     def __str__(self):
         return str(self.token.literal)
 
 
 class NumberLiteral(Expression):
-    """ 숫자 리터럴 """
+    """ 숫자 리터럴
+    value는 numeric backend의 수 표현 (기본값 : Decimal)
+    """
+    __slots__ = ("token", "value")
     token: Token
-    value: Decimal
+    value: Union[Decimal, float, Fraction]
 
-    def __init__(self, token: Token):
+    def __init__(self, token: Token, value: Union[Decimal, float, Fraction, None] = None):
         self.token = token
-        self.value = Decimal(token.literal)
+        self.value = Decimal(token.literal) if value is None else value
 
     def literal(self) -> str:
         return self.token.literal
 
+    def structural_key(self) -> tuple:
+        # Decimal("1.0")과 Decimal("1")처럼 값이 같아도 리터럴이 다르면 다른 표현식
+        return self.token.literal, type(self.value), self.value
+
     def __str__(self):
         return str(self.token.literal)
 
@@ -94,6 +116,7 @@ class NumberLiteral(Expression):
 class LetStatement(Statement):
     """let 명령문
     """
+    __slots__ = ("token", "name", "value")
     token: Token
     name: Identifier
     value: Expression
@@ -112,11 +135,12 @@ class LetStatement(Statement):
 
 class AssignStatement(Statement):
     """할당 명령문"""
-    pass
+    __slots__ = ()
 
 
 class PrefixExpression(Expression):
     """전위연산자 표현식"""
+    __slots__ = ("token", "operator", "right")
     token: Token
     operator: str
     right: Expression
@@ -129,12 +153,16 @@ class PrefixExpression(Expression):
     def literal(self) -> str:
         return self.token.literal
 
+    def structural_key(self) -> tuple:
+        return self.operator, self.right
+
     def __str__(self):
         return f"{self.operator}{self.right}"
 
 
 class InfixExpression(Expression):
     """중위연산자 표현식"""
+    __slots__ = ("token", "left", "operator", "right")
     token: Token
     left: Expression
     operator: str
@@ -149,6 +177,9 @@ class InfixExpression(Expression):
     def literal(self) -> str:
         return self.token.literal
 
+    def structural_key(self) -> tuple:
+        return self.operator, self.left, self.right
+
     def __str__(self):
         return f"({self.left}{self.operator}{self.right})"
 
@@ -161,6 +192,7 @@ class MathReducerExpression(Expression):
     2. 곱기호
     \prod_{i=1}^{5} (i+1)
     """
+    __slots__ = ("token", "identifier", "start", "end", "body")
     token: Token
 
     identifier: Identifier
@@ -178,6 +210,9 @@ class MathReducerExpression(Expression):
     def literal(self) -> str:
         return self.token.literal
 
+    def structural_key(self) -> tuple:
+        return self.token.literal, self.identifier.value, self.start, self.end, self.body
+
     def __str__(self):
         return f"{self.token.literal}_{{{self.identifier}={self.start}}}^{{{self.end}}}{{{self.body}}}"
 
@@ -196,6 +231,7 @@ class CombinatoricsExpression(Expression):
     3. combination with repetition(중복 조합)
     : _{n}\mathrm{H}_{k}
     """
+    __slots__ = ("token", "identifier", "left", "right")
     token: Token
     identifier: Expression
     left: Expression
@@ -210,5 +246,57 @@ class CombinatoricsExpression(Expression):
     def literal(self) -> str:
         return self.token.literal
 
+    def structural_key(self) -> tuple:
+        return self.identifier.literal(), self.left, self.right
+
     def __str__(self):
         return f"_{{{self.left}}}\mathrm{{{self.identifier.literal()}}}_{{{self.right}}})"
+
+
+def node_children(node: Node) -> tuple:
+    """ 바로 아래의 하위 node들 (Statement, Expression)
+    """
+    if isinstance(node, Program):
+        return tuple(node.statements)
+    if isinstance(node, LetStatement):
+        return (node.value,)
+    if isinstance(node, ExpressionStatement):
+        return (node.expression,)
+    if isinstance(node, PrefixExpression):
+        return (node.right,)
+    if isinstance(node, (InfixExpression, CombinatoricsExpression)):
+        return (node.left, node.right)
+    if isinstance(node, MathReducerExpression):
+        return (node.start, node.end, node.body)
+    return ()
+
+
+def free_identifiers(node: Node) -> Set[str]:
+    """ node 안에서 바인딩되지 않고 참조되는 식별자 이름들
+    합기호/곱기호의 변수는 body 안에서만 바인딩됨 (start, end에서는 자유 변수)
+    """
+    if isinstance(node, Identifier):
+        return {node.value}
+    elif isinstance(node, (NumberLiteral, AssignStatement)):
+        return set()
+    elif isinstance(node, InfixExpression):
+        return free_identifiers(node.left) | free_identifiers(node.right)
+    elif isinstance(node, PrefixExpression):
+        return free_identifiers(node.right)
+    elif isinstance(node, MathReducerExpression):
+        body = free_identifiers(node.body) - {node.identifier.value}
+        return free_identifiers(node.start) | free_identifiers(node.end) | body
+    elif isinstance(node, CombinatoricsExpression):
+        return free_identifiers(node.left) | free_identifiers(node.right)
+    elif isinstance(node, LetStatement):
+        return free_identifiers(node.value)
+    elif isinstance(node, ExpressionStatement):
+        return free_identifiers(node.expression)
+    elif isinstance(node, Program):
+        names, bound = set(), set()
+        for stmt in node.statements:
+            names |= free_identifiers(stmt) - bound
+            if isinstance(stmt, LetStatement):
+                bound.add(stmt.name.value)
+        return names
+    return set()
@@ -0,0 +1,166 @@
+""" process pool 기반 batch 계산
+
+파싱과 계산은 GIL 아래에서 도는 순수 CPU 작업이므로, 입력을 chunk로 나누어 여러 process에서 계산
+* 여러 수식을 각각 계산 (evaluate_formulas)
+* 하나의 수식을 여러 bindings로 계산 (evaluate_bindings) : worker는 chunk마다 한번만 파싱 / compile
+
+결과는 입력 순서대로 반환
+"""
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Sequence, Union
+
+from mathpreter.cache import parse
+from mathpreter.errors import LexerException, ParserException, EvaluatorException, LimitExceededException
+from mathpreter.evaluator import Evaluator, compile_program
+from mathpreter.lexer import RegexLexer
+from mathpreter.limits import EvaluationLimits
+from mathpreter.numeric import NumericBackend, get_backend
+from mathpreter.parser import Parser
+
+# 지정하지 않았을 때 worker 하나당 chunk 개수
+CHUNKS_PER_WORKER = 4
+
+# return_exceptions=True 일 때 결과 자리에 담는 에러 (0으로 나누기 포함)
+FORMULA_ERRORS = (LexerException, ParserException, EvaluatorException, LimitExceededException, ArithmeticError)
+
+
+def _evaluate_formulas(
+        bindings: Optional[Dict[str, Any]],
+        backend: NumericBackend,
+        limits: Optional[EvaluationLimits],
+        return_exceptions: bool,
+        formulas: Sequence[str]
+) -> list:
+    """ worker : 수식 chunk를 계산. 같은 수식은 worker process의 parse cache에서 재사용
+    """
+    global FORMULA_ERRORS
+    evaluator = Evaluator(backend=backend, limits=limits)
+    results = []
+    for formula in formulas:
+        try:
+            results.append(evaluator.evaluate(parse(formula, backend), bindings))
+        except FORMULA_ERRORS as e:
+            if not return_exceptions:
+                raise
+            results.append(e)
+    return results
+
+
+def _evaluate_bindings(
+        formula: str,
+        backend: NumericBackend,
+        limits: Optional[EvaluationLimits],
+        return_exceptions: bool,
+        bindings_list: Sequence[Dict[str, Any]]
+) -> list:
+    """ worker : 수식을 한번만 파싱 / compile 한 뒤 bindings chunk를 계산
+    """
+    global FORMULA_ERRORS
+    try:
+        program = Parser(RegexLexer(formula), backend=backend).parse_program()
+        run = compile_program(program, backend=backend, limits=limits)
+    except FORMULA_ERRORS as e:
+        if not return_exceptions:
+            raise
+        return [e] * len(bindings_list)
+
+    results = []
+    for bindings in bindings_list:
+        try:
+            results.append(run(bindings))
+        except FORMULA_ERRORS as e:
+            if not return_exceptions:
+                raise
+            results.append(e)
+    return results
+
+
+def run_chunks(
+        task: Callable[[Sequence], list],
+        items: Sequence,
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        executor: Optional[Executor] = None
+) -> list:
+    """ items를 chunk로 나누어 task를 worker process에서 실행하고, 결과를 입력 순서대로 이어 붙임
+
+    :param task: chunk -> 결과 리스트. pickle 가능해야 함 (module 최상위 함수의 partial)
+    :param workers: process 개수. 기본값은 CPU 개수, 1이면 현재 process에서 실행
+    :param chunk_size: chunk 하나의 크기. 기본값은 worker 하나당 CHUNKS_PER_WORKER개가 되도록 나눔
+    :param executor: 이미 만들어 둔 executor (workers는 무시)
+    """
+    global CHUNKS_PER_WORKER
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(-(-len(items) // (workers * CHUNKS_PER_WORKER)), 1)
+    elif chunk_size < 1:
+        raise ValueError(f"chunk_size should be positive. (as-is : {chunk_size})")
+    chunks = [items[i: i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+    if executor is None and (workers == 1 or len(chunks) <= 1):
+        # 나눌 작업이 없으면 process를 만들지 않음
+        return [result for chunk in chunks for result in task(chunk)]
+
+    def collect(pool: Executor) -> list:
+        futures = [pool.submit(task, chunk) for chunk in chunks]
+        # 제출한 순서대로 모으므로 결과도 입력 순서
+        return [result for future in futures for result in future.result()]
+
+    if executor is not None:
+        return collect(executor)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return collect(pool)
+
+
+def evaluate_formulas(
+        formulas: Sequence[str],
+        bindings: Optional[Dict[str, Any]] = None,
+        backend: Union[str, NumericBackend, None] = None,
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        return_exceptions: bool = False,
+        executor: Optional[Executor] = None,
+        limits: Optional[EvaluationLimits] = None
+) -> list:
+    """ 여러 수식을 같은 bindings로 계산
+
+    :param formulas: 수식 텍스트 리스트
+    :param bindings: 모든 수식에 공통인 자유 변수의 값
+    :param backend: 수 표현
+    :param workers: process 개수 (run_chunks 참고)
+    :param chunk_size: chunk 하나의 수식 개수 (run_chunks 참고)
+    :param return_exceptions: True이면 실패한 수식의 자리에 에러를 담아 반환, False이면 첫 에러를 raise
+    :param executor: 이미 만들어 둔 executor
+    :param limits: 수식 계산 1회마다의 자원 제한 (mathpreter.limits 참고)
+    :return: 수식 순서대로 마지막 표현식의 값
+    """
+    task = partial(_evaluate_formulas, bindings, get_backend(backend), limits, return_exceptions)
+    return run_chunks(task, list(formulas), workers, chunk_size, executor)
+
+
+def evaluate_bindings(
+        formula: str,
+        bindings_list: Sequence[Dict[str, Any]],
+        backend: Union[str, NumericBackend, None] = None,
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        return_exceptions: bool = False,
+        executor: Optional[Executor] = None,
+        limits: Optional[EvaluationLimits] = None
+) -> list:
+    """ 하나의 수식을 여러 bindings로 계산
+
+    :param formula: 수식 텍스트
+    :param bindings_list: 자유 변수 값의 리스트
+    :param backend: 수 표현
+    :param workers: process 개수 (run_chunks 참고)
+    :param chunk_size: chunk 하나의 bindings 개수 (run_chunks 참고)
+    :param return_exceptions: True이면 실패한 bindings의 자리에 에러를 담아 반환, False이면 첫 에러를 raise
+    :param executor: 이미 만들어 둔 executor
+    :param limits: 수식 계산 1회마다의 자원 제한 (mathpreter.limits 참고)
+    :return: bindings 순서대로 마지막 표현식의 값
+    """
+    task = partial(_evaluate_bindings, formula, get_backend(backend), limits, return_exceptions)
+    return run_chunks(task, list(bindings_list), workers, chunk_size, executor)
@@ -0,0 +1,109 @@
+""" 파싱 결과 cache
+
+같은 수식이 반복해서 들어오는 경우, 공백을 정규화한 수식 텍스트를 key로 Program을 LRU cache에 보관
+cache에서 반환된 Program은 여러 호출자가 공유하므로 수정하면 안 됨 (statements는 tuple로 고정)
+"""
+import re
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Tuple, Union
+
+from mathpreter.ast import Program
+from mathpreter.lexer import RegexLexer, WHITESPACE_CHARS
+from mathpreter.numeric import NumericBackend, get_backend
+from mathpreter.parser import IterativeParser
+
+# 파싱 결과를 보관할 최대 개수
+PARSE_CACHE_SIZE = 4096
+
+WHITESPACE_PATTERN = re.compile("[" + re.escape("".join(sorted(WHITESPACE_CHARS))) + "]+")
+
+
+def normalize_whitespace(text: str) -> str:
+    """ 연속된 공백(WHITESPACE_CHARS)을 공백 한 칸으로 바꾸고, 양 끝의 공백을 제거
+    """
+    global WHITESPACE_PATTERN
+    return WHITESPACE_PATTERN.sub(" ", text).strip(" ")
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class ParseCache:
+    """ (정규화된 수식 텍스트, backend) -> Program 의 LRU cache
+    """
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self, maxsize: int = PARSE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.programs: "OrderedDict[Tuple[str, str], Program]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def parse(self, text: str, backend: Union[str, NumericBackend, None] = None) -> Program:
+        backend = get_backend(backend)
+        normalized = normalize_whitespace(text)
+        key = (normalized, backend.name)
+
+        with self.lock:
+            if (program := self.programs.get(key)) is not None:
+                self.hits += 1
+                self.programs.move_to_end(key)
+                return program
+            self.misses += 1
+
+        # 파싱은 lock 밖에서 수행. 같은 수식을 동시에 파싱하면 나중 결과가 남음
+        # 괄호가 깊게 중첩된 수식(server 요청 등)도 재귀 한도에 걸리지 않도록 IterativeParser 사용
+        program = IterativeParser(RegexLexer(normalized), backend=backend).parse_program()
+        program.statements = tuple(program.statements)
+
+        with self.lock:
+            self.programs[key] = program
+            self.programs.move_to_end(key)
+            while len(self.programs) > self.maxsize:
+                self.programs.popitem(last=False)
+                self.evictions += 1
+        return program
+
+    def cache_info(self) -> CacheInfo:
+        with self.lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self.programs))
+
+    def cache_clear(self):
+        with self.lock:
+            self.programs.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+PARSE_CACHE = ParseCache()
+
+
+def parse(text: str, backend: Union[str, NumericBackend, None] = None) -> Program:
+    """ 수식을 파싱하고 결과를 module 단위 LRU cache에 보관
+
+    :param text: 수식 텍스트
+    :param backend: NumberLiteral의 수 표현
+    :return: 공유되는 Program (수정하면 안 됨)
+    """
+    global PARSE_CACHE
+    return PARSE_CACHE.parse(text, backend)
+
+
+def cache_info() -> CacheInfo:
+    global PARSE_CACHE
+    return PARSE_CACHE.cache_info()
+
+
+def cache_clear():
+    global PARSE_CACHE
+    PARSE_CACHE.cache_clear()
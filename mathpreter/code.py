@@ -0,0 +1,105 @@
+""" bytecode 명령어 정의
+
+명령어는 정수 opcode와 정수 operand들로 이루어진 평탄한 리스트로 표현
+"""
+from enum import IntEnum
+from typing import Dict, List, Tuple
+
+
+class Opcode(IntEnum):
+    CONSTANT = 0  # (constant index) 상수를 push
+    LOAD = 1  # (slot) 변수를 push
+    STORE = 2  # (slot) pop 해서 변수에 저장
+
+    ADD = 3
+    SUB = 4
+    MUL = 5
+    DIV = 6
+    MOD = 7
+    POW = 8
+    NEG = 9
+
+    COMBINATORICS = 10  # (kind index) n, k 를 pop 해서 조합론 값을 push
+
+    STORE_INT = 11  # (slot, message index) pop 해서 정수인지 확인한 뒤 int로 변수에 저장
+    LOOP = 12  # (counter slot, end slot, variable slot, exit address) counter > end 이면 exit로 이동, 아니면 변수 = counter, counter += 1
+    ACCUMULATE_ADD = 13  # (slot) pop 해서 변수에 더함
+    ACCUMULATE_MUL = 14  # (slot) pop 해서 변수에 곱함
+    JUMP = 15  # (address)
+
+    RESULT = 16  # pop 해서 결과 레지스터에 저장 (ExpressionStatement)
+
+
+# opcode -> operand 개수
+OPERAND_COUNTS: Dict[Opcode, int] = {
+    Opcode.CONSTANT: 1,
+    Opcode.LOAD: 1,
+    Opcode.STORE: 1,
+    Opcode.COMBINATORICS: 1,
+    Opcode.STORE_INT: 2,
+    Opcode.LOOP: 4,
+    Opcode.ACCUMULATE_ADD: 1,
+    Opcode.ACCUMULATE_MUL: 1,
+    Opcode.JUMP: 1,
+}
+
+# opcode -> stack 크기 변화
+STACK_EFFECTS: Dict[Opcode, int] = {
+    Opcode.CONSTANT: 1,
+    Opcode.LOAD: 1,
+    Opcode.STORE: -1,
+    Opcode.ADD: -1,
+    Opcode.SUB: -1,
+    Opcode.MUL: -1,
+    Opcode.DIV: -1,
+    Opcode.MOD: -1,
+    Opcode.POW: -1,
+    Opcode.NEG: 0,
+    Opcode.COMBINATORICS: -1,
+    Opcode.STORE_INT: -1,
+    Opcode.LOOP: 0,
+    Opcode.ACCUMULATE_ADD: -1,
+    Opcode.ACCUMULATE_MUL: -1,
+    Opcode.JUMP: 0,
+    Opcode.RESULT: -1,
+}
+
+# infix 연산자 -> opcode
+INFIX_OPCODES: Dict[str, Opcode] = {
+    "+": Opcode.ADD,
+    "-": Opcode.SUB,
+    "*": Opcode.MUL,
+    "/": Opcode.DIV,
+    "%": Opcode.MOD,
+    "^": Opcode.POW,
+}
+
+# COMBINATORICS operand -> 기호
+COMBINATORICS_KINDS: Tuple[str, ...] = ("P", "C", "\\Pi", "H")
+
+# STORE_INT operand -> 에러 메시지에 사용할 피연산자 이름
+INTEGER_OPERANDS: Tuple[str, ...] = ("start of reducer", "end of reducer")
+
+
+def make(op: Opcode, *operands: int) -> List[int]:
+    """ 명령어 하나를 만듦
+    """
+    global OPERAND_COUNTS
+    if len(operands) != OPERAND_COUNTS.get(op, 0):
+        raise ValueError(f"{op.name} expects {OPERAND_COUNTS.get(op, 0)} operands. (as-is : {len(operands)})")
+    return [int(op), *operands]
+
+
+def disassemble(instructions: List[int]) -> str:
+    """ 사람이 읽을 수 있는 형태로 변환
+    """
+    global OPERAND_COUNTS
+    lines = []
+    ip = 0
+    while ip < len(instructions):
+        op = Opcode(instructions[ip])
+        count = OPERAND_COUNTS.get(op, 0)
+        operands = " ".join(str(operand) for operand in instructions[ip + 1: ip + 1 + count])
+        lines.append(f"{ip:04d} {op.name} {operands}".rstrip())
+        ip += 1 + count
+    return "\n".join(lines)
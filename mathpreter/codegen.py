@@ -0,0 +1,276 @@
+""" Program -> Python source 코드 생성
+
+Program을 Python 함수의 source로 바꾸고 compile()을 한번만 호출해서, 자유 변수를 인자로 받는 평범한 함수를 반환
+node 유형 판별이나 closure 호출 없이 Python bytecode로 바로 계산하므로, 같은 수식을 아주 많이 계산할 때 사용
+
+    area = compile_formula("let r2 = r^2; \\pi * r2", backend="float")
+    area(2.0)  # 12.566370614359172
+    area(r=3)
+
+* `+ - * /` 와 prefix `-` 는 Python 연산자, `^` 는 `**` (backend.power와 결과가 같을 때. 아니면 backend.power 호출)
+* 합기호 / 곱기호는 `sum` / `math.prod` 의 generator. 범위가 작은 리터럴이면 풀어서 더함 (UNROLL_LIMIT)
+* 조합론은 `math.comb` / `math.perm`
+* closed form과 limits는 적용하지 않음 (범위만큼 반복)
+"""
+import keyword
+import math
+import operator
+from contextlib import nullcontext
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from mathpreter.ast import (
+    Expression, Program,
+    LetStatement, ExpressionStatement, Identifier,
+    PrefixExpression, NumberLiteral, InfixExpression, MathReducerExpression, CombinatoricsExpression,
+    free_identifiers
+)
+from mathpreter.cache import normalize_whitespace, parse
+from mathpreter.errors import EvaluatorException
+from mathpreter.evaluator import REDUCERS, literal_value, reducer_identity, to_integer
+from mathpreter.numeric import DecimalBackend, FloatBackend, NumericBackend, get_backend
+
+# 시작과 끝이 리터럴이고 반복 횟수가 이 값 이하이면 generator 대신 항을 풀어서 더함
+UNROLL_LIMIT = 8
+
+# 컴파일된 함수를 보관할 최대 개수 (compile_formula)
+CODEGEN_CACHE_SIZE = 1024
+
+# Python keyword와 같은 이름의 변수는 뒤에 `_`를 붙임
+# 생성된 source가 사용하는 module / builtin은 `_`로 시작하는 이름으로 쓰므로 변수 이름과 겹치지 않음 (변수 이름에는 `_`가 없음)
+RESERVED_NAMES = frozenset(keyword.kwlist)
+
+
+def multiset_combination(n: int, k: int) -> int:
+    """ nHk = (n+k-1)Ck
+    """
+    if n == 0:
+        return int(k == 0)
+    return math.comb(n + k - 1, k)
+
+
+COMBINATORICS_FUNCTIONS = {
+    "C": "_math.comb",
+    "P": "_math.perm",
+    "\\Pi": "_power_int",
+    "H": "_multiset_combination",
+}
+
+
+def combinatorics_operands(n, k) -> Tuple[int, int]:
+    n = to_integer(n, "left operand of combinatorics")
+    k = to_integer(k, "right operand of combinatorics")
+    if n < 0 or k < 0:
+        raise EvaluatorException(f"combinatorics operands should be non-negative. (as-is : n={n}, k={k})")
+    return n, k
+
+
+def python_name(name: str) -> str:
+    global RESERVED_NAMES
+    return f"{name}_" if name in RESERVED_NAMES else name
+
+
+class CodeGenerator:
+    """ Program을 Python 함수 source로 변환
+    상수(NumberLiteral의 값, 항등원)와 helper 함수는 source에 `_`로 시작하는 이름으로 쓰고 namespace에 담음
+    """
+    backend: NumericBackend
+    namespace: Dict[str, Any]  # 생성된 source의 global 이름 -> 값
+    parameters: List[str]  # 함수 인자 (Program의 자유 변수, 이름순)
+
+    def __init__(self, backend: Union[str, NumericBackend, None] = None):
+        self.backend = get_backend(backend)
+        # Decimal은 `**`, `%` 의 의미가 backend.power, backend.modulo와 같음
+        self.native_operators = isinstance(self.backend, DecimalBackend)
+        self.namespace = {
+            "_math": math,
+            "_sum": sum,
+            "_map": map,
+            "_range": range,
+            "_power": self.backend.power,
+            "_modulo": self.backend.modulo,
+            "_from_int": self.backend.from_int,
+            "_convert": self.backend.convert,
+            "_context": self.backend.context,
+            "_to_int": to_integer,
+            "_operands": combinatorics_operands,
+            "_power_int": operator.pow,
+            "_multiset_combination": multiset_combination,
+        }
+        self.constants: Dict[Tuple[type, str], str] = {}
+        self.substitutions: Dict[str, str] = {}  # 풀어 쓴 합기호의 반복 변수 -> 상수 이름
+        self.parameters = []
+
+    def constant(self, value) -> str:
+        if isinstance(self.backend, FloatBackend) and math.isfinite(value):
+            return repr(value)
+        # Decimal("1.0")과 Decimal("1")은 같은 값이지만 표현이 다름
+        key = (type(value), str(value))
+        if (name := self.constants.get(key)) is None:
+            name = self.constants[key] = f"_c{len(self.constants)}"
+            self.namespace[name] = value
+        return name
+
+    def generate(self, program: Program, name: str = "formula") -> str:
+        """ 마지막 표현식의 값을 반환하는 함수 source (표현식이 없으면 None)
+        """
+        self.parameters = sorted(free_identifiers(program))
+        arguments = [python_name(parameter) for parameter in self.parameters]
+
+        body = [f"{argument} = _convert({argument})" for argument in arguments]
+        result = "None"
+        for stmt in program.statements:
+            if isinstance(stmt, LetStatement):
+                body.append(f"{python_name(stmt.name.value)} = {self.generate_expression(stmt.value)}")
+            elif isinstance(stmt, ExpressionStatement):
+                body.append(f"_result = {self.generate_expression(stmt.expression)}")
+                result = "_result"
+            else:
+                raise EvaluatorException(f"unsupported statement. (as-is : {type(stmt).__name__})")
+        body.append(f"return {result}")
+
+        lines = [f"def {name}({', '.join(arguments)}):"]
+        if isinstance(self.backend.context(), nullcontext):
+            lines += [f"    {line}" for line in body]
+        else:
+            lines.append("    with _context():")
+            lines += [f"        {line}" for line in body]
+        return "\n".join(lines) + "\n"
+
+    def generate_expression(self, expr: Expression) -> str:
+        global COMBINATORICS_FUNCTIONS
+        if isinstance(expr, NumberLiteral):
+            return self.constant(literal_value(expr, self.backend))
+
+        elif isinstance(expr, Identifier):
+            return self.substitutions.get(expr.value) or python_name(expr.value)
+
+        elif isinstance(expr, InfixExpression):
+            return self.generate_infix_expression(expr)
+
+        elif isinstance(expr, PrefixExpression):
+            if expr.operator != "-":
+                raise EvaluatorException(f"unsupported prefix operator. (as-is : {expr.operator})")
+            return f"(-{self.generate_expression(expr.right)})"
+
+        elif isinstance(expr, MathReducerExpression):
+            return self.generate_reducer_expression(expr)
+
+        elif isinstance(expr, CombinatoricsExpression):
+            kind = expr.identifier.literal()
+            if (func := COMBINATORICS_FUNCTIONS.get(kind)) is None:
+                raise EvaluatorException(f"unknown combinatorics symbol. (as-is : {kind})")
+            left = self.generate_expression(expr.left)
+            right = self.generate_expression(expr.right)
+            return f"_from_int({func}(*_operands({left}, {right})))"
+
+        raise EvaluatorException(f"unsupported expression. (as-is : {type(expr).__name__})")
+
+    def generate_infix_expression(self, expr: InfixExpression) -> str:
+        left = self.generate_expression(expr.left)
+        right = self.generate_expression(expr.right)
+
+        if expr.operator in ("+", "-", "*", "/"):
+            return f"({left} {expr.operator} {right})"
+        elif expr.operator == "%":
+            return f"({left} % {right})" if self.native_operators else f"_modulo({left}, {right})"
+        elif expr.operator == "^":
+            # 음이 아닌 정수 리터럴 지수는 모든 backend에서 `**` 와 backend.power의 결과가 같음
+            exponent = integer_literal(expr.right, self.backend)
+            if exponent is not None and exponent >= 0:
+                return f"({left} ** {exponent})"
+            return f"({left} ** {right})" if self.native_operators else f"_power({left}, {right})"
+        raise EvaluatorException(f"unsupported infix operator. (as-is : {expr.operator})")
+
+    def generate_reducer_expression(self, expr: MathReducerExpression) -> str:
+        global UNROLL_LIMIT
+        reducer = expr.token.literal
+        if reducer not in REDUCERS:
+            raise EvaluatorException(f"unsupported reducer. (as-is : {reducer})")
+        is_sum = reducer == "\\sum"
+        identity = self.constant(reducer_identity(reducer, self.backend))
+        name = expr.identifier.value
+
+        # 범위는 바깥 scope에서 계산
+        first = integer_literal(expr.start, self.backend)
+        last = integer_literal(expr.end, self.backend)
+        if first is not None and last is not None and last - first + 1 <= UNROLL_LIMIT:
+            outer = self.substitutions.get(name)
+            terms = [identity]
+            for k in range(first, last + 1):
+                self.substitutions[name] = self.constant(self.backend.from_int(k))
+                terms.append(self.generate_expression(expr.body))
+            if outer is None:
+                self.substitutions.pop(name, None)
+            else:
+                self.substitutions[name] = outer
+            return f"({(' + ' if is_sum else ' * ').join(terms)})"
+
+        start = self.generate_expression(expr.start)
+        end = self.generate_expression(expr.end)
+        # body 안에서는 반복 변수가 풀어 쓴 바깥 합기호의 같은 이름을 가림
+        outer = self.substitutions.pop(name, None)
+        body = self.generate_expression(expr.body)
+        if outer is not None:
+            self.substitutions[name] = outer
+
+        variable = python_name(name)
+        loop = (
+            f"({body} for {variable} in _map(_from_int, _range("
+            f"_to_int({start}, 'start of reducer'), _to_int({end}, 'end of reducer') + 1)))"
+        )
+        return f"_sum({loop}, {identity})" if is_sum else f"_math.prod({loop}, start={identity})"
+
+
+def integer_literal(expr: Expression, backend: NumericBackend) -> Optional[int]:
+    """ 정수값인 NumberLiteral이면 int, 아니면 None
+    """
+    if not isinstance(expr, NumberLiteral):
+        return None
+    value = literal_value(expr, backend)
+    if not math.isfinite(value) or int(value) != value:
+        return None
+    return int(value)
+
+
+def compile_to_function(
+        program: Program, backend: Union[str, NumericBackend, None] = None, name: str = "formula"
+) -> Callable[..., Any]:
+    """ Program을 Python 함수로 변환
+
+    :param program: 파싱된 Program
+    :param backend: 수 표현
+    :param name: 생성할 함수 이름
+    :return: 자유 변수(이름순)를 인자로 받아 마지막 표현식의 값을 반환하는 함수.
+        `source`, `parameters` 속성에 생성된 source와 인자 이름을 담음
+    """
+    generator = CodeGenerator(backend)
+    source = generator.generate(program, name)
+    namespace = generator.namespace
+    exec(compile(source, f"<mathpreter:{name}>", "exec"), namespace)
+
+    func = namespace[name]
+    func.source = source
+    func.parameters = generator.parameters
+    return func
+
+
+@lru_cache(maxsize=CODEGEN_CACHE_SIZE)
+def _compile_formula(normalized: str, backend: NumericBackend) -> Callable[..., Any]:
+    return compile_to_function(parse(normalized, backend), backend)
+
+
+def compile_formula(text: str, backend: Union[str, NumericBackend, None] = None) -> Callable[..., Any]:
+    """ 수식 텍스트를 파싱하고 Python 함수로 변환. 같은 수식(공백 정규화)과 backend의 함수는 cache에서 재사용
+
+        compile_formula("x^2 + y", backend="float")(3, 1)  # 10.0
+    """
+    return _compile_formula(normalize_whitespace(text), get_backend(backend))
+
+
+def cache_info():
+    return _compile_formula.cache_info()
+
+
+def cache_clear():
+    _compile_formula.cache_clear()
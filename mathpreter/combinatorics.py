@@ -0,0 +1,245 @@
+""" 조합론 정수 연산 엔진
+
+순열(P), 조합(C), 중복순열(\\Pi), 중복조합(H)을 정수로 정확하게 계산
+* factorial은 크기가 제한된 LRU cache에 보관하고, 없는 값은 가장 가까운 cache 값에서 이어서 계산
+* k가 작으면 factorial 전체 대신 falling factorial로 계산 (multiplicative formula)
+* 같은 n에 대해 가까운 k를 연달아 계산하면(e.g. \\sum body), 마지막 값에서 점화식으로 이어서 계산
+* 연속된 정수의 곱은 binary splitting으로 계산
+
+cache는 module 전역이고 server는 여러 thread에서 계산하므로, cache 조회 / 갱신은 lock 안에서 수행
+"""
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
+
+from mathpreter.errors import EvaluatorException
+
+# factorial cache에 보관할 최대 개수
+FACTORIAL_CACHE_SIZE = 1024
+
+# falling factorial cache에 보관할 최대 개수
+FALLING_FACTORIAL_CACHE_SIZE = 4096
+
+# 이 값 이하의 k는 falling factorial로 계산
+MULTIPLICATIVE_THRESHOLD = 64
+
+# 같은 n에 대해 마지막으로 계산한 값을 보관할 최대 개수
+ROW_CACHE_SIZE = 256
+
+# 마지막으로 계산한 k와의 거리가 이 값 이하이면, 그 값에서 이어서 계산
+ROW_STEP_THRESHOLD = 1024
+
+# 이 개수 이하의 연속된 정수는 순서대로 곱함
+BINARY_SPLITTING_THRESHOLD = 32
+
+
+def range_product(low: int, high: int) -> int:
+    """ low * (low+1) * ... * high. 비어 있으면 1
+    크기가 비슷한 수끼리 곱하도록 구간을 반으로 나누어 계산 (binary splitting)
+    """
+    global BINARY_SPLITTING_THRESHOLD
+    if high - low < BINARY_SPLITTING_THRESHOLD:
+        result = 1
+        for value in range(low, high + 1):
+            result *= value
+        return result
+    middle = (low + high) // 2
+    return range_product(low, middle) * range_product(middle + 1, high)
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class FactorialCache:
+    """ n! 의 LRU cache
+    cache에 없는 n! 은 가장 가까운 cache 값 m! 에서 (m+1)..n 을 곱하거나 n+1..m 으로 나누어 계산
+    곱셈 / 나눗셈은 lock 밖에서 계산
+    """
+    maxsize: int
+    hits: int
+    misses: int
+    lock: threading.Lock  # values, keys, hits, misses를 보호
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.values: "OrderedDict[int, int]" = OrderedDict()
+            self.keys: List[int] = []  # cache에 있는 n (정렬됨)
+
+    def factorial(self, n: int) -> int:
+        if n < 0:
+            raise EvaluatorException(f"factorial is not defined for negative numbers. (as-is : {n})")
+        if n < 2:
+            return 1
+
+        with self.lock:
+            if (value := self.values.get(n)) is not None:
+                self.hits += 1
+                self.values.move_to_end(n)
+                return value
+            self.misses += 1
+
+            index = bisect_left(self.keys, n)
+            lower = self.keys[index - 1] if index else 1
+            lower_value = self.values[lower] if index else 1
+            upper = self.keys[index] if index < len(self.keys) else None
+            upper_value = None if upper is None else self.values[upper]
+
+        if upper is not None and upper - n < n - lower:
+            value = upper_value // range_product(n + 1, upper)
+        else:
+            value = lower_value * range_product(lower + 1, n)
+
+        with self.lock:
+            if n in self.values:
+                # 계산하는 동안 다른 thread가 넣음
+                self.values.move_to_end(n)
+                return value
+            self.values[n] = value
+            self.keys.insert(bisect_left(self.keys, n), n)
+            if len(self.values) > self.maxsize:
+                evicted, _ = self.values.popitem(last=False)
+                del self.keys[bisect_left(self.keys, evicted)]
+        return value
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self.values))
+
+
+FACTORIALS = FactorialCache(FACTORIAL_CACHE_SIZE)
+
+
+def factorial(n: int) -> int:
+    global FACTORIALS
+    return FACTORIALS.factorial(n)
+
+
+@lru_cache(maxsize=FALLING_FACTORIAL_CACHE_SIZE)
+def falling_factorial(n: int, k: int) -> int:
+    """ n * (n-1) * ... * (n-k+1)
+    """
+    return range_product(n - k + 1, n)
+
+
+class RowCache:
+    """ (종류, n) -> 마지막으로 계산한 (k, 값) 의 LRU cache
+    """
+    maxsize: int
+    lock: threading.Lock  # rows를 보호
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self.rows: "OrderedDict[Tuple[str, int], Tuple[int, int]]" = OrderedDict()
+
+    def nearest(self, kind: str, n: int, k: int) -> Optional[Tuple[int, int]]:
+        global ROW_STEP_THRESHOLD
+        with self.lock:
+            row = self.rows.get((kind, n))
+        if row is None or abs(row[0] - k) > ROW_STEP_THRESHOLD:
+            return None
+        return row
+
+    def store(self, kind: str, n: int, k: int, value: int):
+        with self.lock:
+            self.rows[(kind, n)] = (k, value)
+            self.rows.move_to_end((kind, n))
+            if len(self.rows) > self.maxsize:
+                self.rows.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.rows.clear()
+
+
+ROWS = RowCache(ROW_CACHE_SIZE)
+
+
+def permutation(n: int, k: int) -> int:
+    """ nPk = n! / (n-k)!
+    """
+    global MULTIPLICATIVE_THRESHOLD, ROWS
+    if k > n:
+        return 0
+    if k <= MULTIPLICATIVE_THRESHOLD:
+        return falling_factorial(n, k)
+
+    if (row := ROWS.nearest("P", n, k)) is not None:
+        # nP(k1) = nP(k0) * (n-k0) * ... * (n-k1+1)
+        k0, value = row
+        if k >= k0:
+            value = value * range_product(n - k + 1, n - k0)
+        else:
+            value = value // range_product(n - k0 + 1, n - k)
+    else:
+        value = factorial(n) // factorial(n - k)
+    ROWS.store("P", n, k, value)
+    return value
+
+
+def combination(n: int, k: int) -> int:
+    """ nCk = n! / (k! (n-k)!)
+    """
+    global MULTIPLICATIVE_THRESHOLD, ROWS
+    if k > n:
+        return 0
+    if min(k, n - k) <= MULTIPLICATIVE_THRESHOLD:
+        k = min(k, n - k)
+        return falling_factorial(n, k) // factorial(k)
+
+    if (row := ROWS.nearest("C", n, k)) is not None:
+        # nC(k+1) = nCk * (n-k) / (k+1) 를 여러 단계 한번에 적용
+        k0, value = row
+        if k >= k0:
+            value = value * range_product(n - k + 1, n - k0) // range_product(k0 + 1, k)
+        else:
+            value = value * range_product(k + 1, k0) // range_product(n - k0 + 1, n - k)
+    else:
+        value = factorial(n) // (factorial(k) * factorial(n - k))
+    ROWS.store("C", n, k, value)
+    return value
+
+
+def permutation_with_repetition(n: int, k: int) -> int:
+    """ nΠk = n^k
+    """
+    return n ** k
+
+
+def combination_with_repetition(n: int, k: int) -> int:
+    """ nHk = (n+k-1)Ck
+    """
+    if n == 0:
+        return int(k == 0)
+    return combination(n + k - 1, k)
+
+
+COMBINATORICS_FUNCTIONS = {
+    "P": permutation,
+    "C": combination,
+    "\\Pi": permutation_with_repetition,
+    "H": combination_with_repetition,
+}
+
+
+def evaluate_combinatorics(kind: str, n: int, k: int) -> int:
+    """ 순열(P), 조합(C), 중복순열(\\Pi), 중복조합(H)
+    """
+    global COMBINATORICS_FUNCTIONS
+    if (func := COMBINATORICS_FUNCTIONS.get(kind)) is None:
+        raise EvaluatorException(f"unknown combinatorics symbol. (as-is : {kind})")
+    if n < 0 or k < 0:
+        raise EvaluatorException(f"combinatorics operands should be non-negative. (as-is : n={n}, k={k})")
+    return func(n, k)
@@ -0,0 +1,180 @@
+""" Program -> bytecode 컴파일러
+
+상수와 변수는 컴파일할 때 index / slot으로 결정되며, VM은 이름 조회 없이 평탄한 명령어 리스트를 실행
+"""
+from typing import Any, Dict, List, Union
+
+from mathpreter.ast import (
+    Expression, Program,
+    LetStatement, ExpressionStatement, Identifier,
+    PrefixExpression, NumberLiteral, InfixExpression, MathReducerExpression, CombinatoricsExpression
+)
+from mathpreter.code import Opcode, STACK_EFFECTS, INFIX_OPCODES, COMBINATORICS_KINDS, make, disassemble
+from mathpreter.errors import EvaluatorException
+from mathpreter.evaluator import REDUCERS, literal_value, reducer_identity
+from mathpreter.numeric import NumericBackend, get_backend
+from mathpreter.resolver import Resolver
+
+
+class Bytecode:
+    """ 컴파일 결과
+    """
+    instructions: List[int]
+    constants: List[Any]
+    slot_names: List[str]  # slot -> 변수 이름 (에러 메시지 용)
+    inputs: Dict[str, int]  # bindings로 값을 받을 수 있는 이름 -> slot
+    max_stack: int  # 실행에 필요한 최대 stack 크기
+    backend: NumericBackend
+
+    def __init__(
+            self,
+            instructions: List[int],
+            constants: List[Any],
+            slot_names: List[str],
+            inputs: Dict[str, int],
+            max_stack: int,
+            backend: NumericBackend
+    ):
+        self.instructions = instructions
+        self.constants = constants
+        self.slot_names = slot_names
+        self.inputs = inputs
+        self.max_stack = max_stack
+        self.backend = backend
+
+    def __str__(self):
+        return disassemble(self.instructions)
+
+
+class Compiler:
+    """ Program을 stack VM의 bytecode로 변환
+    """
+    backend: NumericBackend
+
+    instructions: List[int]
+    constants: List[Any]
+    resolver: Resolver
+
+    def __init__(self, backend: Union[str, NumericBackend, None] = None):
+        self.backend = get_backend(backend)
+
+    def compile(self, program: Program) -> Bytecode:
+        self.instructions = []
+        self.constants = []
+        self.constant_indexes: Dict[Any, int] = {}
+        self.resolver = Resolver()
+        self.depth = 0
+        self.max_depth = 0
+
+        for stmt in program.statements:
+            if isinstance(stmt, LetStatement):
+                self.compile_expression(stmt.value)
+                self.emit(Opcode.STORE, self.resolver.resolve(stmt.name.value))
+            elif isinstance(stmt, ExpressionStatement):
+                self.compile_expression(stmt.expression)
+                self.emit(Opcode.RESULT)
+            else:
+                raise EvaluatorException(f"unsupported statement. (as-is : {type(stmt).__name__})")
+
+        return Bytecode(
+            self.instructions, self.constants, self.resolver.slot_names, self.resolver.inputs, self.max_depth,
+            self.backend
+        )
+
+    def compile_expression(self, expr: Expression):
+        if isinstance(expr, NumberLiteral):
+            self.emit(Opcode.CONSTANT, self.add_constant(literal_value(expr, self.backend)))
+
+        elif isinstance(expr, Identifier):
+            self.emit(Opcode.LOAD, self.resolver.resolve(expr.value))
+
+        elif isinstance(expr, InfixExpression):
+            if (op := INFIX_OPCODES.get(expr.operator)) is None:
+                raise EvaluatorException(f"unsupported infix operator. (as-is : {expr.operator})")
+            self.compile_expression(expr.left)
+            self.compile_expression(expr.right)
+            self.emit(op)
+
+        elif isinstance(expr, PrefixExpression):
+            if expr.operator != "-":
+                raise EvaluatorException(f"unsupported prefix operator. (as-is : {expr.operator})")
+            self.compile_expression(expr.right)
+            self.emit(Opcode.NEG)
+
+        elif isinstance(expr, MathReducerExpression):
+            self.compile_reducer_expression(expr)
+
+        elif isinstance(expr, CombinatoricsExpression):
+            kind = expr.identifier.literal()
+            if kind not in COMBINATORICS_KINDS:
+                raise EvaluatorException(f"unknown combinatorics symbol. (as-is : {kind})")
+            self.compile_expression(expr.left)
+            self.compile_expression(expr.right)
+            self.emit(Opcode.COMBINATORICS, COMBINATORICS_KINDS.index(kind))
+
+        else:
+            raise EvaluatorException(f"unsupported expression. (as-is : {type(expr).__name__})")
+
+    def compile_reducer_expression(self, expr: MathReducerExpression):
+        """
+        <start> STORE_INT counter
+        <end>   STORE_INT end
+        CONSTANT identity, STORE accumulator
+        loop:
+            LOOP counter end variable exit
+            <body> ACCUMULATE accumulator
+            JUMP loop
+        exit:
+            LOAD accumulator
+        """
+        reducer = expr.token.literal
+        if reducer not in REDUCERS:
+            raise EvaluatorException(f"unsupported reducer. (as-is : {reducer})")
+        name = expr.identifier.value
+
+        counter = self.resolver.new_slot(f"<{name} counter>")
+        end = self.resolver.new_slot(f"<{name} end>")
+        accumulator = self.resolver.new_slot(f"<{reducer} accumulator>")
+
+        # 범위는 바깥 scope에서 계산
+        self.compile_expression(expr.start)
+        self.emit(Opcode.STORE_INT, counter, 0)
+        self.compile_expression(expr.end)
+        self.emit(Opcode.STORE_INT, end, 1)
+        self.emit(Opcode.CONSTANT, self.add_constant(reducer_identity(reducer, self.backend)))
+        self.emit(Opcode.STORE, accumulator)
+
+        variable = self.resolver.enter(name)
+        loop = self.emit(Opcode.LOOP, counter, end, variable, -1)
+        self.compile_expression(expr.body)
+        self.resolver.leave()
+        self.emit(Opcode.ACCUMULATE_ADD if reducer == "\\sum" else Opcode.ACCUMULATE_MUL, accumulator)
+        self.emit(Opcode.JUMP, loop)
+
+        # LOOP의 exit address를 채움
+        self.instructions[loop + 4] = len(self.instructions)
+        self.emit(Opcode.LOAD, accumulator)
+
+    def emit(self, op: Opcode, *operands: int) -> int:
+        position = len(self.instructions)
+        self.instructions.extend(make(op, *operands))
+        self.depth += STACK_EFFECTS[op]
+        self.max_depth = max(self.max_depth, self.depth)
+        return position
+
+    def add_constant(self, value) -> int:
+        key = (type(value), str(value))
+        if (index := self.constant_indexes.get(key)) is None:
+            index = self.constant_indexes[key] = len(self.constants)
+            self.constants.append(value)
+        return index
+
+
+def compile_to_bytecode(program: Program, backend: Union[str, NumericBackend, None] = None) -> Bytecode:
+    """ Program을 bytecode로 컴파일
+
+    :param program: 파싱된 Program
+    :param backend: 상수의 수 표현
+    :return: VM에서 실행할 Bytecode
+    """
+    return Compiler(backend).compile(program)
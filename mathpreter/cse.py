@@ -0,0 +1,209 @@
+""" 공통 부분식 제거(CSE)와 AST hash-consing
+
+* Interner : 구조가 같은 Expression을 하나의 node로 모아 AST를 DAG로 만듦
+  여러 수식을 같은 Interner로 intern하면 수식 사이에서도 node를 공유하므로, 많은 수식을 보관할 때 메모리가 줄어듦
+* CSEEvaluator : DAG에서 두 번 이상 참조되는 부분식은 evaluate 1회에 한번만 계산
+  부분식이 참조하는 변수가 바뀌면(let, 합기호 / 곱기호의 반복 변수) 보관한 값을 버림
+
+    evaluator = CSEEvaluator()
+    evaluator.evaluate(Parser(Lexer("\\sum_{k=1}^{100}{(x+1)^2 * k + (x+1)^2}")).parse_program(), {"x": 2})
+"""
+from typing import Any, Callable, Dict, List, Optional
+
+from mathpreter.ast import (
+    Node, Expression, Program, Statement,
+    LetStatement, ExpressionStatement, Identifier,
+    PrefixExpression, NumberLiteral, InfixExpression, MathReducerExpression, CombinatoricsExpression,
+    free_identifiers, node_children
+)
+from mathpreter.errors import EvaluatorException
+from mathpreter.evaluator import Environment, Evaluator, Number
+
+
+def rebuild(node: Expression, children: tuple) -> Expression:
+    """ 하위 표현식만 children으로 바꾼 새 node
+    """
+    if isinstance(node, InfixExpression):
+        return InfixExpression(node.token, *children)
+    if isinstance(node, PrefixExpression):
+        return PrefixExpression(node.token, *children)
+    if isinstance(node, MathReducerExpression):
+        return MathReducerExpression(node.token, node.identifier, *children)
+    if isinstance(node, CombinatoricsExpression):
+        return CombinatoricsExpression(node.token, node.identifier, *children)
+    raise EvaluatorException(f"unsupported expression. (as-is : {type(node).__name__})")
+
+
+class Interner:
+    """ 구조가 같은 Expression -> 대표 node
+    intern한 node는 공유되므로 수정하면 안 됨
+    """
+    nodes: Dict[tuple, Expression]  # key -> 대표 node
+    hits: int  # 이미 있던 node로 바꾼 횟수
+    misses: int  # 새로 등록한 node 수
+
+    def __init__(self):
+        self.nodes = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @staticmethod
+    def key(node: Expression) -> tuple:
+        """ 하위 표현식이 모두 대표 node인 node의 key
+        대표 node는 Interner가 보관하므로 하위 표현식은 id로 비교 (key가 한 단계만 담아 재귀하지 않음)
+        """
+        return (type(node), *(id(part) if isinstance(part, Expression) else part for part in node.structural_key()))
+
+    def intern(self, root: Expression) -> Expression:
+        """ 구조가 같은 하위 표현식을 대표 node로 바꾼 표현식. 원래 AST는 바꾸지 않음
+        깊은 AST에서도 재귀 한도에 걸리지 않도록 stack으로 아래에서부터 처리
+        """
+        canonical: Dict[int, Expression] = {}  # id(원래 node) -> 대표 node
+        stack = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in canonical:
+                continue
+            children = node_children(node)
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((child, False) for child in children if id(child) not in canonical)
+                continue
+
+            interned = tuple(canonical[id(child)] for child in children)
+            candidate = node
+            if any(new is not old for new, old in zip(interned, children)):
+                candidate = rebuild(node, interned)
+            key = self.key(candidate)
+            if (representative := self.nodes.get(key)) is None:
+                representative = self.nodes[key] = candidate
+                self.misses += 1
+            else:
+                self.hits += 1
+            canonical[id(node)] = representative
+        return canonical[id(root)]
+
+    def intern_program(self, program: Program) -> Program:
+        """ 각 구문의 표현식을 intern한 새 Program
+        """
+        statements = []
+        for stmt in program.statements:
+            if isinstance(stmt, LetStatement):
+                statements.append(LetStatement(stmt.token, stmt.name, self.intern(stmt.value)))
+            elif isinstance(stmt, ExpressionStatement):
+                statements.append(ExpressionStatement(stmt.token, self.intern(stmt.expression)))
+            else:
+                raise EvaluatorException(f"unsupported statement. (as-is : {type(stmt).__name__})")
+        return Program(statements)
+
+
+class SharedSubexpressions:
+    """ intern한 Program에서 두 번 이상 참조되는 부분식 (리터럴, 식별자 제외)
+    """
+    program: Program  # intern한 Program
+    shared: Dict[int, Expression]  # id -> 부분식
+    dependents: Dict[str, List[int]]  # 변수 이름 -> 그 변수를 참조하는 부분식의 id
+
+    def __init__(self, program: Program, interner: Optional[Interner] = None):
+        self.program = (Interner() if interner is None else interner).intern_program(program)
+
+        # DAG의 node를 한번씩 방문하며 부모 -> 자식 참조 수를 셈
+        references: Dict[int, int] = {}
+        nodes: Dict[int, Expression] = {}
+        stack = list(node_children(self.program))
+        visited = set()
+        while stack:
+            node = stack.pop()
+            if id(node) in visited:
+                continue
+            visited.add(id(node))
+            for child in node_children(node):
+                if isinstance(child, Expression):
+                    references[id(child)] = references.get(id(child), 0) + 1
+                    nodes[id(child)] = child
+                stack.append(child)
+
+        self.shared = {
+            key: node for key, node in nodes.items()
+            if references[key] > 1 and not isinstance(node, (NumberLiteral, Identifier))
+        }
+        self.dependents = {}
+        for key, node in self.shared.items():
+            for name in free_identifiers(node):
+                self.dependents.setdefault(name, []).append(key)
+
+
+class TrackedEnvironment(dict):
+    """ 변수 값이 바뀌면 on_change(이름)을 호출하는 environment
+    """
+    __slots__ = ("on_change", "watched")
+
+    def __init__(self, on_change: Callable[[str], Any], watched, values: Environment):
+        super().__init__(values)
+        self.on_change = on_change
+        self.watched = watched  # on_change를 호출할 변수 이름
+
+    def __setitem__(self, name: str, value: Number):
+        super().__setitem__(name, value)
+        if name in self.watched:
+            self.on_change(name)
+
+    def pop(self, name: str, *default):
+        if name in self.watched:
+            self.on_change(name)
+        return super().pop(name, *default)
+
+
+class CSEEvaluator(Evaluator):
+    """ 공통 부분식을 evaluate 1회에 한번만 계산하는 Evaluator
+    같은 Program을 반복해서 계산하면 intern / 분석 결과를 재사용
+    """
+    interner: Interner
+    subexpressions: Optional[SharedSubexpressions]
+    shared: Dict[int, Expression]  # subexpressions.shared
+    memo: Dict[int, Number]  # 공통 부분식의 id -> 계산한 값
+
+    def __init__(self, *args, interner: Optional[Interner] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.interner = Interner() if interner is None else interner
+        self.source: Optional[Node] = None  # 마지막으로 분석한 원래 node
+        self.subexpressions = None
+        self.shared = {}
+        self.memo = {}
+
+    def prepare(self, node: Node) -> SharedSubexpressions:
+        if node is not self.source:
+            if isinstance(node, Program):
+                program = node
+            elif isinstance(node, Statement):
+                program = Program([node])
+            else:
+                program = Program([ExpressionStatement(node.token, node)])
+            self.subexpressions = SharedSubexpressions(program, self.interner)
+            self.shared = self.subexpressions.shared
+            self.source = node
+        return self.subexpressions
+
+    def evaluate(self, node: Node, bindings: Optional[Dict[str, Any]] = None) -> Optional[Number]:
+        subexpressions = self.prepare(node)
+        self.memo = {}
+        return super().evaluate(subexpressions.program, bindings)
+
+    def environment(self, bindings: Optional[Dict[str, Any]]) -> Environment:
+        return TrackedEnvironment(self.invalidate, self.subexpressions.dependents, super().environment(bindings))
+
+    def invalidate(self, name: str):
+        memo = self.memo
+        for key in self.subexpressions.dependents[name]:
+            memo.pop(key, None)
+
+    def eval_expression(self, expr: Expression, env: Environment) -> Number:
+        key = id(expr)
+        if key not in self.shared:
+            return Evaluator.eval_expression(self, expr, env)
+        if (value := self.memo.get(key)) is None:
+            value = self.memo[key] = Evaluator.eval_expression(self, expr, env)
+        return value
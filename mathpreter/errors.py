@@ -18,3 +18,36 @@ class ParserException(Exception):
 
     def __str__(self):
         return self.message
+
+
+class EvaluatorException(Exception):
+    """ Evaluator 동작에서 발생한 에러
+    """
+
+    def __init__(self, message: str):
+        self.message = message
+
+    def __str__(self):
+        return self.message
+
+
+class CancelledException(Exception):
+    """ 계산 도중 취소됨 (e.g. 시간 초과)
+    """
+
+    def __init__(self, message: str):
+        self.message = message
+
+    def __str__(self):
+        return self.message
+
+
+class LimitExceededException(Exception):
+    """ 계산이 EvaluationLimits를 넘음 (반복 횟수, 자릿수, AST 깊이, 시간)
+    """
+
+    def __init__(self, message: str):
+        self.message = message
+
+    def __str__(self):
+        return self.message
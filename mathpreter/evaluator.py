@@ -0,0 +1,533 @@
+import operator
+import threading
+from concurrent.futures import Executor
+from decimal import Decimal
+from fractions import Fraction
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from mathpreter.ast import (
+    Node, Expression, Program, Statement,
+    LetStatement, ExpressionStatement, Identifier,
+    PrefixExpression, NumberLiteral, InfixExpression, MathReducerExpression, CombinatoricsExpression,
+    free_identifiers
+)
+from mathpreter.combinatorics import evaluate_combinatorics
+from mathpreter.errors import EvaluatorException
+from mathpreter.limits import CHECK_INTERVAL, NO_LIMITS, EvaluationLimits, LimitGuard
+from mathpreter.numeric import NumericBackend, get_backend
+from mathpreter.reducer import (
+    PARALLEL_THRESHOLD, compile_terms, closed_form_sum, compile_closed_form_product, vectorize_body, vectorized_reduce
+)
+from mathpreter.resolver import Resolver
+
+Number = Union[float, Decimal, Fraction]
+
+# 변수 이름 -> 값
+Environment = Dict[str, Number]
+
+# slot -> 값. 값이 없으면 None
+Frame = List[Optional[Number]]
+
+# 컴파일된 표현식 : frame을 받아 값을 반환
+compiled_ftype = Callable[[Frame], Number]
+
+# `%`, `^` 는 backend의 modulo, power를 사용
+INFIX_OPERATORS: Dict[str, Callable[[Number, Number], Number]] = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+}
+
+PREFIX_OPERATORS: Dict[str, Callable[[Number], Number]] = {
+    "-": operator.neg,
+}
+
+REDUCERS = ("\\sum", "\\prod")
+
+
+def reducer_identity(reducer: str, backend: NumericBackend) -> Number:
+    """ 합기호 / 곱기호의 항등원
+    """
+    return backend.zero if reducer == "\\sum" else backend.one
+
+
+def literal_value(expr: NumberLiteral, backend: NumericBackend) -> Number:
+    """ 파싱할 때 다른 backend로 변환된 리터럴은 token literal에서 다시 변환
+    """
+    if isinstance(expr.value, backend.number_type):
+        return expr.value
+    return backend.from_literal(expr.token.literal)
+
+
+def to_integer(value: Number, name: str) -> int:
+    """ 정수값이어야 하는 피연산자(합기호 범위, 조합론 인자)를 int로 변환
+    """
+    integer = int(value)
+    if integer != value:
+        raise EvaluatorException(f"{name} should be an integer. (as-is : {value})")
+    return integer
+
+
+def guarded_power(backend: NumericBackend, limits: Optional[EvaluationLimits]) -> Callable[[Number, Number], Number]:
+    """ 계산하기 전에 결과의 자릿수를 확인하는 거듭제곱. 자릿수 제한이 없으면 backend.power
+    """
+    if limits is None or limits.max_digits is None:
+        return backend.power
+    power = backend.power
+
+    def checked_power(base: Number, exponent: Number) -> Number:
+        limits.check_power(base, exponent)
+        return power(base, exponent)
+
+    return checked_power
+
+
+class Evaluator:
+    """ AST를 순회하며 값을 계산하는 tree-walking evaluator
+    """
+    backend: NumericBackend  # 수 표현 (float, Decimal, Fraction)
+    closed_form: bool  # 합기호 / 곱기호를 closed form으로 계산
+    vectorize_reducers: bool  # closed form이 없는 합기호 / 곱기호를 NumPy reduction(float)으로 계산
+    cancel_event: Optional[threading.Event]  # set 되면 반복 중인 합기호 / 곱기호를 멈춤
+    limits: Optional[EvaluationLimits]  # 계산 1회의 자원 제한
+    parallel_threshold: Optional[int]  # 반복 횟수가 이보다 많은 합기호 / 곱기호를 여러 process로 나누어 계산. None이면 나누지 않음
+    workers: Optional[int]  # 나누어 계산할 process 개수. 기본값은 CPU 개수
+    executor: Optional[Executor]  # 나누어 계산할 때 사용할 executor
+
+    power: Callable[[Number, Number], Number]  # 자릿수 제한을 확인하는 거듭제곱
+    infix_operators: Dict[str, Callable[[Number, Number], Number]]
+    guard: Optional[LimitGuard]  # 계산 중인 evaluate 호출의 반복 횟수 / 마감 시각
+
+    def __init__(
+            self,
+            backend: Union[str, NumericBackend, None] = None,
+            closed_form: bool = True,
+            vectorize_reducers: bool = False,
+            cancel_event: Optional[threading.Event] = None,
+            limits: Optional[EvaluationLimits] = None,
+            parallel_threshold: Optional[int] = PARALLEL_THRESHOLD,
+            workers: Optional[int] = None,
+            executor: Optional[Executor] = None
+    ):
+        global INFIX_OPERATORS
+        self.backend = get_backend(backend)
+        self.closed_form = closed_form
+        self.vectorize_reducers = vectorize_reducers
+        self.cancel_event = cancel_event
+        self.limits = limits
+        self.parallel_threshold = parallel_threshold
+        self.workers = workers
+        self.executor = executor
+        self.power = guarded_power(self.backend, limits)
+        self.infix_operators = {**INFIX_OPERATORS, "%": self.backend.modulo, "^": self.power}
+        self.guard = None
+
+    def evaluate(self, node: Node, bindings: Optional[Dict[str, Any]] = None) -> Optional[Number]:
+        """ Program / Statement / Expression을 계산
+
+        :param node: 계산할 AST node
+        :param bindings: 자유 변수의 값
+        :return: 마지막 표현식의 값 (Program, Statement) 혹은 표현식의 값
+        """
+        if self.limits is not None:
+            self.limits.check_depth(node)
+        if self.limits is not None or self.cancel_event is not None:
+            self.guard = LimitGuard(self.limits or NO_LIMITS, self.cancel_event)
+
+        env = self.environment(bindings)
+        with self.backend.context():
+            if isinstance(node, Program):
+                return self.eval_program(node, env)
+            if isinstance(node, Statement):
+                return self.eval_statement(node, env)
+            return self.eval_expression(node, env)
+
+    def environment(self, bindings: Optional[Dict[str, Any]]) -> Environment:
+        """ evaluate 1회의 environment. bindings의 값은 backend의 수 표현으로 변환
+        """
+        convert = self.backend.convert
+        return {name: convert(value) for name, value in bindings.items()} if bindings else {}
+
+    def eval_program(self, program: Program, env: Environment) -> Optional[Number]:
+        result = None
+        for stmt in program.statements:
+            result = self.eval_statement(stmt, env)
+        return result
+
+    def eval_statement(self, stmt: Statement, env: Environment) -> Optional[Number]:
+        if isinstance(stmt, LetStatement):
+            env[stmt.name.value] = self.eval_expression(stmt.value, env)
+            return None
+        if isinstance(stmt, ExpressionStatement):
+            return self.eval_expression(stmt.expression, env)
+        raise EvaluatorException(f"unsupported statement. (as-is : {type(stmt).__name__})")
+
+    def eval_expression(self, expr: Expression, env: Environment) -> Number:
+        if isinstance(expr, NumberLiteral):
+            return literal_value(expr, self.backend)
+        elif isinstance(expr, Identifier):
+            return self.eval_identifier(expr, env)
+        elif isinstance(expr, InfixExpression):
+            return self.eval_infix_expression(expr, env)
+        elif isinstance(expr, PrefixExpression):
+            return self.eval_prefix_expression(expr, env)
+        elif isinstance(expr, MathReducerExpression):
+            return self.eval_reducer_expression(expr, env)
+        elif isinstance(expr, CombinatoricsExpression):
+            return self.eval_combinatorics_expression(expr, env)
+        raise EvaluatorException(f"unsupported expression. (as-is : {type(expr).__name__})")
+
+    def eval_identifier(self, expr: Identifier, env: Environment) -> Number:
+        if expr.value not in env:
+            raise EvaluatorException(f"identifier is not defined. (as-is : {expr.value})")
+        return env[expr.value]
+
+    def eval_infix_expression(self, expr: InfixExpression, env: Environment) -> Number:
+        if (func := self.infix_operators.get(expr.operator)) is None:
+            raise EvaluatorException(f"unsupported infix operator. (as-is : {expr.operator})")
+        return func(self.eval_expression(expr.left, env), self.eval_expression(expr.right, env))
+
+    def eval_prefix_expression(self, expr: PrefixExpression, env: Environment) -> Number:
+        global PREFIX_OPERATORS
+        if (func := PREFIX_OPERATORS.get(expr.operator)) is None:
+            raise EvaluatorException(f"unsupported prefix operator. (as-is : {expr.operator})")
+        return func(self.eval_expression(expr.right, env))
+
+    def eval_reducer_expression(self, expr: MathReducerExpression, env: Environment) -> Number:
+        global REDUCERS, INFIX_OPERATORS
+        reducer = expr.token.literal
+        if reducer not in REDUCERS:
+            raise EvaluatorException(f"unsupported reducer. (as-is : {reducer})")
+
+        start = to_integer(self.eval_expression(expr.start, env), "start of reducer")
+        end = to_integer(self.eval_expression(expr.end, env), "end of reducer")
+
+        name = expr.identifier.value
+        if self.closed_form:
+            result = self.reduce_by_closed_form(expr, env, start, end)
+            if result is not None:
+                return result
+        guard = self.guard
+        if guard is not None:
+            guard.enter_loop(max(end - start + 1, 0))
+        if self.vectorize_reducers and (body_fn := vectorize_body(expr.body)) is not None:
+            return self.backend.convert(vectorized_reduce(reducer, body_fn, name, env, start, end))
+        if guard is None and self.parallel_threshold is not None and end - start + 1 > self.parallel_threshold:
+            return self.reduce_in_parallel(expr, env, start, end)
+
+        func = INFIX_OPERATORS["+"] if reducer == "\\sum" else INFIX_OPERATORS["*"]
+        from_int = self.backend.from_int
+        outer = env.get(name)
+        result = reducer_identity(reducer, self.backend)
+        try:
+            for k in range(start, end + 1):
+                if guard is not None and (k - start) % CHECK_INTERVAL == 0:
+                    guard.checkpoint(result)
+                env[name] = from_int(k)
+                result = func(result, self.eval_expression(expr.body, env))
+        finally:
+            if outer is None:
+                env.pop(name, None)
+            else:
+                env[name] = outer
+        return result
+
+    def reduce_by_closed_form(self, expr: MathReducerExpression, env: Environment, start: int, end: int):
+        """ closed form으로 계산할 수 없으면 None
+        """
+        reducer = expr.token.literal
+        name = expr.identifier.value
+        identity = reducer_identity(reducer, self.backend)
+
+        def compile_fn(node: Expression) -> compiled_ftype:
+            return lambda scope: self.eval_expression(node, scope)
+
+        if reducer == "\\sum":
+            if (terms_fn := compile_terms(expr.body, name, compile_fn, self.power)) is not None:
+                return closed_form_sum(terms_fn, env, start, end, identity, self.power)
+        elif (product_fn := compile_closed_form_product(expr.body, name, compile_fn, self.power)) is not None:
+            return product_fn(env, start, end, identity)
+        return None
+
+    def reduce_in_parallel(self, expr: MathReducerExpression, env: Environment, start: int, end: int) -> Number:
+        """ 범위를 나누어 worker process에서 계산 (mathpreter.parallel 참고)
+        취소와 자원 제한은 worker에서 확인할 수 없으므로, guard가 없을 때만 사용
+        """
+        # parallel은 batch를 통해 evaluator를 import하므로 사용할 때 import
+        from mathpreter.parallel import parallel_reduce
+        return parallel_reduce(
+            expr.token.literal, expr.body, expr.identifier.value, env, start, end, self.backend,
+            self.closed_form, self.vectorize_reducers, self.workers, self.executor, self.parallel_threshold
+        )
+
+    def eval_combinatorics_expression(self, expr: CombinatoricsExpression, env: Environment) -> Number:
+        n = to_integer(self.eval_expression(expr.left, env), "left operand of combinatorics")
+        k = to_integer(self.eval_expression(expr.right, env), "right operand of combinatorics")
+        if self.limits is not None:
+            self.limits.check_combinatorics(expr.identifier.literal(), n, k)
+        return self.backend.from_int(evaluate_combinatorics(expr.identifier.literal(), n, k))
+
+
+class ClosureCompiler:
+    """ AST를 중첩된 closure로 한번만 변환.
+    변수는 compile할 때 slot으로 결정되며, 반환된 함수는 node 유형 판별 없이 frame만 받아 값을 계산
+    """
+    backend: NumericBackend
+    closed_form: bool
+    vectorize_reducers: bool
+    limits: Optional[EvaluationLimits]
+    parallel_threshold: Optional[int]  # Evaluator 참고
+    workers: Optional[int]
+    executor: Optional[Executor]
+    power: Callable[[Number, Number], Number]
+    resolver: Resolver
+    guard_slot: Optional[int]  # 실행 1회의 LimitGuard를 담는 slot (limits가 있을 때)
+
+    def __init__(
+            self,
+            backend: Union[str, NumericBackend, None] = None,
+            closed_form: bool = True,
+            vectorize_reducers: bool = False,
+            limits: Optional[EvaluationLimits] = None,
+            parallel_threshold: Optional[int] = PARALLEL_THRESHOLD,
+            workers: Optional[int] = None,
+            executor: Optional[Executor] = None
+    ):
+        self.backend = get_backend(backend)
+        self.closed_form = closed_form
+        self.vectorize_reducers = vectorize_reducers
+        self.limits = limits
+        self.parallel_threshold = parallel_threshold
+        self.workers = workers
+        self.executor = executor
+        self.power = guarded_power(self.backend, limits)
+        self.reset()
+
+    def reset(self):
+        self.resolver = Resolver()
+        self.guard_slot = None if self.limits is None else self.resolver.new_slot("<guard>")
+
+    def compile_expression(self, expr: Expression) -> compiled_ftype:
+        if isinstance(expr, NumberLiteral):
+            # 리터럴은 compile할 때 한번만 변환
+            value = literal_value(expr, self.backend)
+            return lambda frame: value
+
+        elif isinstance(expr, Identifier):
+            name = expr.value
+            slot = self.resolver.resolve(name)
+
+            def identifier(frame: Frame) -> Number:
+                if (value := frame[slot]) is None:
+                    raise EvaluatorException(f"identifier is not defined. (as-is : {name})")
+                return value
+
+            return identifier
+
+        elif isinstance(expr, InfixExpression):
+            return self.compile_infix_expression(expr)
+
+        elif isinstance(expr, PrefixExpression):
+            if expr.operator != "-":
+                raise EvaluatorException(f"unsupported prefix operator. (as-is : {expr.operator})")
+            right = self.compile_expression(expr.right)
+            return lambda frame: -right(frame)
+
+        elif isinstance(expr, MathReducerExpression):
+            return self.compile_reducer_expression(expr)
+
+        elif isinstance(expr, CombinatoricsExpression):
+            kind = expr.identifier.literal()
+            from_int = self.backend.from_int
+            limits = self.limits
+            left = self.compile_expression(expr.left)
+            right = self.compile_expression(expr.right)
+
+            def combinatorics_expression(frame: Frame) -> Number:
+                n = to_integer(left(frame), "left operand of combinatorics")
+                k = to_integer(right(frame), "right operand of combinatorics")
+                if limits is not None:
+                    limits.check_combinatorics(kind, n, k)
+                return from_int(evaluate_combinatorics(kind, n, k))
+
+            return combinatorics_expression
+
+        raise EvaluatorException(f"unsupported expression. (as-is : {type(expr).__name__})")
+
+    def compile_infix_expression(self, expr: InfixExpression) -> compiled_ftype:
+        left = self.compile_expression(expr.left)
+        right = self.compile_expression(expr.right)
+
+        # 연산자마다 closure를 따로 만들어 operator 함수 호출을 생략
+        if expr.operator == "+":
+            return lambda frame: left(frame) + right(frame)
+        elif expr.operator == "-":
+            return lambda frame: left(frame) - right(frame)
+        elif expr.operator == "*":
+            return lambda frame: left(frame) * right(frame)
+        elif expr.operator == "/":
+            return lambda frame: left(frame) / right(frame)
+        elif expr.operator == "%":
+            modulo = self.backend.modulo
+            return lambda frame: modulo(left(frame), right(frame))
+        elif expr.operator == "^":
+            power = self.power
+            return lambda frame: power(left(frame), right(frame))
+        raise EvaluatorException(f"unsupported infix operator. (as-is : {expr.operator})")
+
+    def compile_reducer_expression(self, expr: MathReducerExpression) -> compiled_ftype:
+        global REDUCERS
+        reducer = expr.token.literal
+        if reducer not in REDUCERS:
+            raise EvaluatorException(f"unsupported reducer. (as-is : {reducer})")
+
+        is_sum = reducer == "\\sum"
+        identity = reducer_identity(reducer, self.backend)
+        from_int = self.backend.from_int
+        convert = self.backend.convert
+        power = self.power
+        guard_slot = self.guard_slot
+        name = expr.identifier.value
+
+        # 범위는 바깥 scope에서 계산
+        start = self.compile_expression(expr.start)
+        end = self.compile_expression(expr.end)
+
+        # 반복 변수는 자신의 slot을 가지므로 바깥의 같은 이름을 저장 / 복원할 필요가 없음
+        variable = self.resolver.enter(name)
+        body = self.compile_expression(expr.body)
+
+        terms_fn = product_fn = vector_fn = None
+        if self.closed_form and is_sum:
+            terms_fn = compile_terms(expr.body, name, self.compile_expression, power)
+        elif self.closed_form:
+            product_fn = compile_closed_form_product(expr.body, name, self.compile_expression, power)
+        if self.vectorize_reducers:
+            vector_fn = vectorize_body(expr.body)
+        # NumPy body와 worker process에는 이름 -> 값 environment를 넘김
+        free = free_identifiers(expr.body)
+        body_names = [(key, slot) for key, slot in self.resolver.visible().items() if key in free and key != name]
+        self.resolver.leave()
+        threshold = self.parallel_threshold
+        if threshold is not None:
+            # parallel은 batch를 통해 evaluator를 import하므로 사용할 때 import
+            from mathpreter.parallel import parallel_reduce
+            parallel_fn = partial(
+                parallel_reduce, reducer, expr.body, name,
+                backend=self.backend, closed_form=self.closed_form, vectorize_reducers=self.vectorize_reducers,
+                workers=self.workers, executor=self.executor, threshold=threshold
+            )
+
+        def reducer_expression(frame: Frame) -> Number:
+            first = to_integer(start(frame), "start of reducer")
+            last = to_integer(end(frame), "end of reducer")
+
+            if terms_fn is not None and (
+                    result := closed_form_sum(terms_fn, frame, first, last, identity, power)
+            ) is not None:
+                return result
+            if product_fn is not None and (result := product_fn(frame, first, last, identity)) is not None:
+                return result
+
+            guard = None if guard_slot is None else frame[guard_slot]
+            if guard is not None:
+                guard.enter_loop(max(last - first + 1, 0))
+            if vector_fn is not None:
+                env = {key: frame[slot] for key, slot in body_names if frame[slot] is not None}
+                return convert(vectorized_reduce(reducer, vector_fn, name, env, first, last))
+            if guard is None and threshold is not None and last - first + 1 > threshold:
+                env = {key: frame[slot] for key, slot in body_names if frame[slot] is not None}
+                return parallel_fn(env, first, last)
+
+            result = identity
+            if guard is not None:
+                for k in range(first, last + 1):
+                    if (k - first) % CHECK_INTERVAL == 0:
+                        guard.checkpoint(result)
+                    frame[variable] = from_int(k)
+                    result = result + body(frame) if is_sum else result * body(frame)
+            elif is_sum:
+                for k in range(first, last + 1):
+                    frame[variable] = from_int(k)
+                    result += body(frame)
+            else:
+                for k in range(first, last + 1):
+                    frame[variable] = from_int(k)
+                    result *= body(frame)
+            return result
+
+        return reducer_expression
+
+    def compile_program(self, program: Program) -> Callable[[Optional[Dict[str, Any]]], Optional[Number]]:
+        if self.limits is not None:
+            self.limits.check_depth(program)
+        self.reset()
+        steps = []
+        for stmt in program.statements:
+            if isinstance(stmt, LetStatement):
+                func = self.compile_expression(stmt.value)
+                steps.append((self.resolver.resolve(stmt.name.value), func))
+            elif isinstance(stmt, ExpressionStatement):
+                steps.append((None, self.compile_expression(stmt.expression)))
+            else:
+                raise EvaluatorException(f"unsupported statement. (as-is : {type(stmt).__name__})")
+
+        backend = self.backend
+        limits, guard_slot = self.limits, self.guard_slot
+        frame_size = self.resolver.frame_size
+        inputs = self.resolver.inputs
+
+        def run(bindings: Optional[Dict[str, Any]] = None) -> Optional[Number]:
+            frame = [None] * frame_size
+            if guard_slot is not None:
+                frame[guard_slot] = limits.guard()
+            if bindings:
+                convert = backend.convert
+                for name, value in bindings.items():
+                    if (slot := inputs.get(name)) is not None:
+                        frame[slot] = convert(value)
+            result = None
+            with backend.context():
+                for slot, func in steps:
+                    if slot is None:
+                        result = func(frame)
+                    else:
+                        frame[slot] = func(frame)
+            return result
+
+        return run
+
+
+def compile_expression(expr: Expression, **options) -> Callable[[Environment], Number]:
+    """ 표현식을 closure로 변환 (options : ClosureCompiler 참고)
+    반환된 함수는 이름 -> 값 environment를 받아 frame으로 옮긴 뒤 계산
+    """
+    compiler = ClosureCompiler(**options)
+    if compiler.limits is not None:
+        compiler.limits.check_depth(expr)
+    func = compiler.compile_expression(expr)
+    limits, guard_slot = compiler.limits, compiler.guard_slot
+    frame_size = compiler.resolver.frame_size
+    inputs = compiler.resolver.inputs
+
+    def expression(env: Environment) -> Number:
+        frame = [None] * frame_size
+        if guard_slot is not None:
+            frame[guard_slot] = limits.guard()
+        for name, slot in inputs.items():
+            frame[slot] = env.get(name)
+        return func(frame)
+
+    return expression
+
+
+def compile_program(program: Program, **options) -> Callable[[Optional[Dict[str, Any]]], Optional[Number]]:
+    """ Program을 한번만 closure로 변환하고, bindings만 바꿔가며 반복 계산
+
+    :param program: 파싱된 Program
+    :param options: ClosureCompiler 참고
+    :return: bindings를 받아 마지막 표현식의 값을 반환하는 함수
+    """
+    return ClosureCompiler(**options).compile_program(program)
@@ -0,0 +1,340 @@
+""" 편집기를 위한 증분 파싱
+
+수식 텍스트를 편집(위치, 지운 길이, 넣은 텍스트)할 때마다 전체를 다시 lexing / 파싱하지 않고,
+편집한 구문부터 다시 읽다가 편집 뒤에서 이전 파싱 결과와 구문 경계가 맞으면 나머지 구문은 그대로 재사용
+
+* 문서는 구문(segment) 단위로 토큰과 AST를 보관. 토큰 span은 segment 시작 위치 기준이므로, 편집 뒤의 segment는 시작 위치만 옮김
+* 다시 파싱하는 구문 안에서도 편집 범위 밖의 괄호 `( )`, `{ }` (합기호 / 곱기호의 끝 범위와 body, 조합론의 인자)는
+  lexing / 파싱하지 않고 이전 AST와 토큰을 재사용. 괄호 안은 앞뒤 문맥과 상관없이 같은 AST로 파싱되기 때문
+* 파싱에 실패해도 실패한 구문 앞뒤의 segment는 보관하고, 이후 편집에서 실패한 구문부터 다시 파싱
+
+    document = IncrementalDocument("let a = \\sum_{k=1}^{n}{k^2}; a + 1")
+    document.edit(33, 1, "2")  # "let a = \\sum_{k=1}^{n}{k^2}; a + 2"
+    document.program
+"""
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from mathpreter.ast import Expression, Program, Statement
+from mathpreter.errors import LexerException, ParserException
+from mathpreter.lexer import SpanLexer
+from mathpreter.numeric import NumericBackend, get_backend
+from mathpreter.parser import Parser
+from mathpreter.token import SpanToken, TokenType
+
+# 괄호 1개 : (여는 괄호 index, 닫는 괄호 index, 괄호 안 표현식). index는 토큰 list 기준
+Group = Tuple[int, int, Expression]
+
+# 재사용할 괄호 : (괄호 안 표현식, 여는 괄호 다음부터 닫는 괄호까지의 토큰, 괄호 안의 괄호들(여는 괄호 index 0 기준))
+ReusableGroup = Tuple[Expression, List[SpanToken], List[Group]]
+
+
+class Segment:
+    """ 구문 1개와 그 토큰. 토큰 span과 괄호 위치는 segment 시작 위치(이전 구문의 마지막 토큰 끝) 기준
+    """
+    __slots__ = ("statement", "tokens", "groups", "terminated")
+
+    statement: Statement
+    tokens: List[SpanToken]  # 구문의 첫 토큰부터 마지막 토큰(`;` 포함)까지
+    groups: Dict[int, Group]  # 여는 괄호 위치 -> 괄호
+    terminated: bool  # 구문이 `;` 로 끝남. 아니면 다음 구문의 첫 토큰에 따라 이어질 수 있음 (e.g. `1 2` -> `1 +2`)
+
+    def __init__(self, statement: Statement, tokens: List[SpanToken], groups: Dict[int, Group], terminated: bool):
+        self.statement = statement
+        self.tokens = tokens
+        self.groups = groups
+        self.terminated = terminated
+
+    @property
+    def length(self) -> int:
+        return self.tokens[-1].end
+
+
+class ReusingParser(Parser):
+    """ 괄호를 파싱하기 전에, 재사용할 수 있는 이전 AST가 있는지 find_group으로 확인하는 parser
+    파싱한 괄호는 groups에 기록
+    """
+    lexer: SpanLexer
+    groups: List[Group]  # index는 lexer.tokens 기준
+    terminated: bool  # 마지막으로 파싱한 구문이 `;` 로 끝남 (`;`만 있는 빈 구문의 `;` 는 제외)
+
+    def __init__(
+            self,
+            lexer: SpanLexer,
+            backend: Union[str, NumericBackend, None] = None,
+            find_group: Optional[Callable[[int, int], Optional[ReusableGroup]]] = None
+    ):
+        super().__init__(lexer, backend)
+        self.find_group = find_group
+        self.groups = []
+        self.terminated = False
+
+    def skip_if_semicolon_exists(self):
+        self.terminated = self.next_token_type_is(TokenType.SEMICOLON)
+        super().skip_if_semicolon_exists()
+
+    def parse_grouped_expression(self) -> Optional[Expression]:
+        return self.parse_group(Parser.parse_grouped_expression)
+
+    def parse_bracket(self) -> Expression:
+        return self.parse_group(Parser.parse_bracket)
+
+    def parse_group(self, parse: Callable[[Parser], Expression]) -> Expression:
+        # curr_token(여는 괄호)은 lexer.tokens[-2], next_token은 lexer.tokens[-1]
+        lexer = self.lexer
+        opening = len(lexer.tokens) - 2
+        if self.find_group is not None:
+            group = self.find_group(lexer.base + self.curr_token.start, lexer.base)
+            if group is not None:
+                return self.reuse_group(opening, group)
+
+        expr = parse(self)
+        self.groups.append((opening, len(lexer.tokens) - 2, expr))
+        return expr
+
+    def reuse_group(self, opening: int, group: ReusableGroup) -> Expression:
+        """ 괄호 안을 읽지 않고, 닫는 괄호를 읽은 상태로 이동
+        """
+        expr, tokens, nested = group
+        lexer = self.lexer
+        del lexer.tokens[opening + 1:]
+        lexer.tokens.extend(tokens)
+        lexer.c_pos = lexer.base + tokens[-1].end
+        self.groups.extend((opening + start, opening + end, inner) for start, end, inner in nested)
+
+        self.curr_token = tokens[-1]
+        self.next_token = lexer.next_token()
+        return expr
+
+
+class TextEdit:
+    """ 편집 1회 : 이전 텍스트의 [offset, offset + deleted) 를 길이 inserted인 텍스트로 바꿈
+    편집 전의 segment에서 다시 파싱을 시작할 위치와, 재사용할 수 있는 괄호 / 구문을 찾음
+    """
+    offset: int
+    deleted: int
+    inserted: int
+    segments: List[Segment]  # 편집 전의 segment
+    starts: List[int]  # 편집 전의 segment 시작 위치
+    gap: Optional[int]  # 편집 전의 파싱하지 못한 구간 뒤 첫 segment index (IncrementalDocument.gap)
+    first: int  # 다시 파싱을 시작하는 segment index
+
+    def __init__(
+            self,
+            offset: int,
+            deleted: int,
+            inserted: int,
+            segments: List[Segment],
+            starts: List[int],
+            gap: Optional[int] = None
+    ):
+        self.offset = offset
+        self.deleted = deleted
+        self.inserted = inserted
+        self.segments = segments
+        self.starts = starts
+        self.gap = gap
+
+        first = max(bisect_right(starts, offset) - 1, 0)
+        # 구문 뒤(마지막 구문 뒤의 공백, 파싱하지 못한 구간)를 편집하면 그 구문 다음부터 파싱
+        if first < len(segments) and offset >= self.end(first):
+            first += segments[first].terminated
+        # 파싱하지 못한 구간은 항상 다시 파싱
+        if gap is not None:
+            first = min(first, gap)
+        # `;` 로 끝나지 않은 구문은 다음 구문의 첫 토큰에 따라 이어질 수 있음 (e.g. `1 2` -> `1 +2`)
+        if first > 0 and not segments[first - 1].terminated:
+            first -= 1
+        self.first = first
+
+    def end(self, index: int) -> int:
+        """ 편집 전 segment의 끝 위치
+        """
+        return self.starts[index] + self.segments[index].length
+
+    def start_position(self) -> int:
+        """ 다시 파싱을 시작하는 위치 (편집 앞이므로 새 텍스트에서도 같은 위치)
+        """
+        first = self.first
+        if first < len(self.segments) and first != self.gap:
+            return self.starts[first]
+        return self.end(first - 1) if first > 0 else 0
+
+    def resume_index(self, position: int) -> Optional[int]:
+        """ 새 텍스트의 position(구문 경계)부터 편집 전의 segment를 그대로 쓸 수 있으면 그 index
+        position이 편집 뒤에 있고, 편집 전에도 파싱하지 못한 구간 뒤의 구문 경계였어야 함
+        """
+        if position < self.offset + self.inserted:
+            return None
+        old = position - self.delta
+        index = bisect_left(self.starts, old)
+        if index < len(self.starts) and self.starts[index] == old:
+            return index if self.gap is None or index >= self.gap else None
+        if self.gap is None and self.segments and old == self.end(len(self.segments) - 1):
+            return len(self.segments)
+        return None
+
+    def kept_index(self, position: int) -> int:
+        """ 새 텍스트의 position까지 파싱하고 실패했을 때, 그 뒤에 남겨 둘 편집 전 segment의 시작 index
+        편집 뒤에서 시작하고 position 이후인 segment는, 앞 구문이 고쳐져서 그 경계에서 끝나면 그대로 쓸 수 있음
+        """
+        if position > self.offset + self.inserted:
+            bound = position - self.delta
+        else:
+            bound = self.offset + self.deleted
+        index = bisect_left(self.starts, bound)
+        return index if self.gap is None else max(index, self.gap)
+
+    @property
+    def delta(self) -> int:
+        return self.inserted - self.deleted
+
+    def old_position(self, position: int) -> Optional[int]:
+        """ 새 텍스트의 위치 -> 같은 문자의 이전 텍스트 위치. 넣은 텍스트 안이면 None
+        """
+        if position < self.offset:
+            return position
+        if position >= self.offset + self.inserted:
+            return position - self.delta
+        return None
+
+    def find_group(self, position: int, base: int) -> Optional[ReusableGroup]:
+        """ 새 텍스트의 position에서 시작하는 괄호가 편집 전에도 같은 텍스트였으면, 토큰을 base 기준으로 옮겨 반환
+        """
+        if (old := self.old_position(position)) is None:
+            return None
+        index = bisect_right(self.starts, old) - 1
+        if index < self.first or index >= len(self.segments):
+            return None
+        segment, start = self.segments[index], self.starts[index]
+        if (group := segment.groups.get(old - start)) is None:
+            return None
+
+        opening, closing, expr = group
+        tokens = segment.tokens
+        if old < self.offset:
+            # 편집 앞에서 시작한 괄호는 편집 앞에서 끝나야 함
+            if start + tokens[closing].end > self.offset:
+                return None
+            shift = start - base
+        else:
+            shift = start + self.delta - base
+
+        inner = tokens[opening + 1: closing + 1]
+        if shift:
+            inner = [token.shifted(shift) for token in inner]
+        nested = [
+            (inner_opening - opening, inner_closing - opening, inner_expr)
+            for inner_opening, inner_closing, inner_expr in segment.groups.values()
+            if opening <= inner_opening and inner_closing <= closing
+        ]
+        return expr, inner, nested
+
+
+class IncrementalDocument:
+    """ 편집할 때마다 다시 파싱하는 수식 문서
+
+    파싱에 실패하면 실패한 구문 앞까지의 segment와, 편집 뒤의 이전 segment를 남기고 그 사이를 파싱하지 못한 구간(gap)으로 둠
+    이후 편집에서는 그 구간부터 다시 파싱하며, 구문 경계가 맞으면 남겨 둔 segment를 재사용
+    """
+    text: str
+    backend: NumericBackend  # NumberLiteral의 수 표현
+    segments: List[Segment]
+    starts: List[int]  # segment 시작 위치
+    gap: Optional[int]  # 파싱하지 못한 구간 뒤 첫 segment index. 구간은 segments[gap - 1]의 끝부터 starts[gap]까지
+    program: Optional[Program]  # 파싱에 실패했으면 None
+    reparsed: int  # 마지막 편집에서 다시 파싱한 구문 수
+
+    def __init__(self, text: str = "", backend: Union[str, NumericBackend, None] = None):
+        self.text = ""
+        self.backend = get_backend(backend)
+        self.segments = []
+        self.starts = []
+        self.gap = None
+        self.program = Program()
+        self.reparsed = 0
+        self.edit(0, 0, text)
+
+    @property
+    def complete(self) -> bool:
+        """ 텍스트 전체를 파싱했는지
+        """
+        return self.gap is None
+
+    @property
+    def tokens(self) -> List[SpanToken]:
+        """ 텍스트 전체의 토큰 (span은 텍스트 시작 기준, EOF 포함). 파싱하지 못한 구간의 토큰은 없음
+        연산자로 끝나는 구문(e.g. `1 *`)은 EOF까지 구문의 토큰이므로 제외하고 마지막에 하나만 추가
+        """
+        tokens = [
+            token.shifted(start)
+            for segment, start in zip(self.segments, self.starts)
+            for token in segment.tokens
+            if token.type is not TokenType.EOF
+        ]
+        tokens.append(SpanToken("", len(self.text), len(self.text)))
+        return tokens
+
+    def edit(self, offset: int, deleted: int, inserted: str) -> Program:
+        """ 텍스트의 [offset, offset + deleted) 를 inserted로 바꾸고 다시 파싱
+
+        :return: 편집한 텍스트의 Program. 파싱에 실패하면 텍스트는 바꾼 뒤 LexerException / ParserException
+        """
+        if not (0 <= offset and 0 <= deleted and offset + deleted <= len(self.text)):
+            raise ValueError(f"edit is out of range. (as-is : offset={offset}, deleted={deleted}, size={len(self.text)})")
+        text = self.text[:offset] + inserted + self.text[offset + deleted:]
+        edit = TextEdit(offset, deleted, len(inserted), self.segments, self.starts, self.gap)
+        self.text = text
+
+        first = edit.first
+        position = edit.start_position()
+        lexer = SpanLexer(text, position, position)
+        segments, starts = [], []
+        rest = None  # 재사용하는 편집 전 segment의 시작 index
+        try:
+            parser = ReusingParser(lexer, self.backend, edit.find_group)
+            while parser.curr_token.type is not TokenType.EOF:
+                base = lexer.base
+                stmt = parser.parse_statement()
+
+                # 구문의 토큰 : lexer.tokens[:-1] (마지막은 다음 구문의 첫 토큰)
+                tokens = lexer.tokens
+                groups = {tokens[opening].start: (opening, closing, expr) for opening, closing, expr in parser.groups}
+                segments.append(Segment(stmt, tokens[:-1], groups, parser.terminated))
+                starts.append(base)
+
+                # 다음 구문은 이 구문의 마지막 토큰 끝에서 시작
+                shift = tokens[-2].end
+                lexer.base = base + shift
+                lookahead = tokens[-1]
+                lookahead.start -= shift
+                lookahead.end -= shift
+                lexer.tokens = [lookahead]
+                parser.groups = []
+
+                if (rest := edit.resume_index(lexer.base)) is not None:
+                    break
+                parser.shift_token()
+        except (LexerException, ParserException):
+            rest = edit.kept_index(lexer.base)
+            self.update(edit, segments, starts, rest)
+            self.gap = first + len(segments)
+            self.program = None
+            raise
+
+        self.update(edit, segments, starts, rest)
+        self.gap = None
+        self.program = Program([segment.statement for segment in self.segments])
+        return self.program
+
+    def update(self, edit: TextEdit, segments: List[Segment], starts: List[int], rest: Optional[int]):
+        """ 다시 파싱한 segment와, 그 뒤에 재사용하는 편집 전 segment(rest부터)로 바꿈
+        """
+        first = edit.first
+        self.segments = edit.segments[:first] + segments
+        self.starts = edit.starts[:first] + starts
+        if rest is not None:
+            delta = edit.delta
+            self.segments += edit.segments[rest:]
+            self.starts += [start + delta for start in edit.starts[rest:]]
+        self.reparsed = len(segments)
@@ -1,5 +1,11 @@
+import mmap
+import os
+import re
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, List, Union
+
 from mathpreter.errors import LexerException
-from mathpreter.token import Token, TokenType
+from mathpreter.token import Token, BufferToken, SpanToken, TokenType, SYMBOL_CHARS
 
 WHITESPACE_CHARS = {" ", "\n", "\t", "\r"}
 
@@ -23,9 +29,11 @@ class Lexer:
     c_pos: int  # current position of equation
     n_pos: int  # next position of equation
     char: str  # current character
+    offset: int  # absolute position of equation_text[0] (stream 일부를 읽을 때)
 
     def __init__(self, equation_text: str):
         self.equation_text = equation_text
+        self.offset = 0
         self.c_pos = 0
         self.n_pos = 0
         self.char = ""
@@ -51,7 +59,7 @@ class Lexer:
             return self.read_identifier()
         elif self.char.isnumeric():
             return self.read_number()
-        elif self.char in TokenType.symbols():
+        elif self.char in SYMBOL_CHARS:
             token = Token(self.char)
             self.next_char()
             return token
@@ -60,7 +68,17 @@ class Lexer:
             return Token("")
 
         # lexing is failed...
-        raise LexerException(f"lexing is failed. position: {self.c_pos}")
+        raise LexerException(f"lexing is failed. position: {self.offset + self.c_pos}")
+
+    def tokenize(self) -> List[Token]:
+        """ EOF 토큰까지 모든 토큰을 한번에 반환
+        """
+        tokens = []
+        while True:
+            token = self.next_token()
+            tokens.append(token)
+            if token.type == TokenType.EOF:
+                return tokens
 
     def read_identifier(self) -> Token:
         start = self.c_pos
@@ -81,7 +99,9 @@ class Lexer:
                 pass
             elif char == ".":
                 if exist_stop:
-                    raise LexerException(f"lexing is failed. '.' appears twice in number. position: {self.c_pos}")
+                    raise LexerException(
+                        f"lexing is failed. '.' appears twice in number. position: {self.offset + self.c_pos}"
+                    )
                 exist_stop = True
             else:
                 break
@@ -93,3 +113,325 @@ class Lexer:
         global WHITESPACE_CHARS
         while self.char in WHITESPACE_CHARS:
             self.next_char()
+
+
+# 공백을 건너뛴 뒤, ASCII 식별자 / 숫자 / 기호 중 하나를 읽는 master pattern
+# 토큰 뒤에 이어지는 문자가 있으면(e.g. `1.2.`, `abcé`) 매칭하지 않고 문자 단위 로직으로 넘김
+TOKEN_PATTERN = re.compile(
+    r"[ \n\t\r]*(?:"
+    r"(?P<identifier>[a-zA-Z\\][a-zA-Z0-9]*(?![^\W_]))"
+    r"|(?P<number>[0-9]+(?:\.[0-9]*)?(?![.\d]))"
+    r"|(?P<symbol>[-+*/%^=_;(){}])"
+    r")?"
+)
+
+
+class RegexLexer:
+    """
+    single-pass lexer. `Lexer`와 동일한 토큰 열과 LexerException을 반환하지만,
+    문자 단위가 아니라 compiled master pattern으로 토큰 단위로 읽음
+
+    ASCII가 아닌 문자처럼 master pattern으로 판단할 수 없는 경우에는 `Lexer`의 문자 단위 로직으로 처리
+    """
+
+    equation_text: str
+    c_pos: int  # start position of the next scan
+
+    def __init__(self, equation_text: str):
+        self.equation_text = equation_text
+        self.c_pos = 0
+
+    def next_token(self) -> Token:
+        global TOKEN_PATTERN
+        text = self.equation_text
+        match = TOKEN_PATTERN.match(text, self.c_pos)
+        kind = match.lastgroup
+        end = match.end()
+
+        if kind is None:
+            if end >= len(text):
+                self.c_pos = end
+                return Token("")
+            return self.read_by_char(end)
+        if end < len(text) and text[end] >= "\x80":
+            return self.read_by_char(match.start(kind))
+
+        self.c_pos = end
+        return Token(match.group(kind))
+
+    def tokenize(self) -> List[Token]:
+        """ EOF 토큰까지 모든 토큰을 한번에 반환
+        """
+        global TOKEN_PATTERN
+        text = self.equation_text
+        size = len(text)
+        match_token = TOKEN_PATTERN.match
+
+        tokens = []
+        pos = self.c_pos
+        while True:
+            match = match_token(text, pos)
+            kind = match.lastgroup
+            end = match.end()
+            if kind is None or (end < size and text[end] >= "\x80"):
+                self.c_pos = pos
+                token = self.next_token()
+                tokens.append(token)
+                if token.type == TokenType.EOF:
+                    return tokens
+                pos = self.c_pos
+                continue
+            pos = end
+            tokens.append(Token(match.group(kind)))
+
+    def read_by_char(self, start: int) -> Token:
+        """ start 위치부터 한 토큰을 `Lexer`의 문자 단위 로직으로 읽음
+        """
+        lexer = Lexer(self.equation_text)
+        lexer.n_pos = start
+        lexer.next_char()
+
+        token = lexer.next_token()
+        self.c_pos = lexer.c_pos
+        return token
+
+
+class SpanLexer(RegexLexer):
+    """
+    `RegexLexer`와 같은 토큰 열을 텍스트 구간과 함께 `SpanToken`으로 반환
+    c_pos부터 읽으므로 텍스트 중간(토큰 경계)에서부터 다시 읽을 수 있음
+
+    span은 base를 0으로 하는 위치. 읽은 토큰은 tokens에 차례로 쌓임
+    """
+
+    base: int  # span의 기준 위치
+    tokens: List[SpanToken]  # 읽은 토큰
+
+    def __init__(self, equation_text: str, c_pos: int = 0, base: int = 0):
+        super().__init__(equation_text)
+        self.c_pos = c_pos
+        self.base = base
+        self.tokens = []
+
+    def next_token(self) -> SpanToken:
+        global TOKEN_PATTERN
+        text = self.equation_text
+        match = TOKEN_PATTERN.match(text, self.c_pos)
+        kind = match.lastgroup
+        end = match.end()
+
+        if kind is not None and (end >= len(text) or text[end] < "\x80"):
+            self.c_pos = end
+            token = SpanToken(match.group(kind), match.start(kind) - self.base, end - self.base)
+        else:
+            # 공백 뒤에서 시작하는 EOF 혹은 문자 단위로 읽는 토큰
+            start = end if kind is None else match.start(kind)
+            token = RegexLexer.next_token(self)
+            token = SpanToken.spanned(token, start - self.base, self.c_pos - self.base)
+        self.tokens.append(token)
+        return token
+
+    def tokenize(self) -> List[SpanToken]:
+        """ EOF 토큰까지 모든 토큰을 한번에 반환
+        """
+        tokens = []
+        while True:
+            token = self.next_token()
+            tokens.append(token)
+            if token.type == TokenType.EOF:
+                return tokens
+
+
+# 토큰은 공백을 넘지 않으므로, 공백이 나오면 그 앞에서 토큰이 끝남
+TOKEN_BOUNDARY_PATTERN = re.compile("[" + re.escape("".join(sorted(WHITESPACE_CHARS))) + "]")
+
+
+class StreamLexer:
+    """
+    문자열 chunk의 iterator를 읽는 lexer. `RegexLexer`와 동일한 토큰 열을 반환
+    아직 읽지 않은 chunk는 필요할 때 하나씩 가져오고, 이미 읽은 부분은 버리므로
+    메모리에는 chunk 하나와 그 경계에 걸친 토큰 정도만 남음
+
+    LexerException의 position은 stream 전체에서의 위치
+    """
+
+    chunks: Iterator[str]
+    buffer: str  # 아직 토큰으로 읽지 않은 부분을 포함하는 문자열
+    pos: int  # start position of the next scan (buffer 기준)
+    offset: int  # absolute position of buffer[0]
+    exhausted: bool  # 모든 chunk를 읽었는지 여부
+
+    def __init__(self, chunks: Iterable[str]):
+        self.chunks = iter(chunks)
+        self.buffer = ""
+        self.pos = 0
+        self.offset = 0
+        self.exhausted = False
+
+    @property
+    def c_pos(self) -> int:
+        return self.offset + self.pos
+
+    def fill(self) -> bool:
+        """ 다음 chunk를 buffer에 추가. 더 읽을 chunk가 없으면 False
+        """
+        if self.exhausted:
+            return False
+        for chunk in self.chunks:
+            if not chunk:
+                continue
+            # 이미 읽은 부분은 버림
+            self.offset += self.pos
+            self.buffer = self.buffer[self.pos:] + chunk
+            self.pos = 0
+            return True
+        self.exhausted = True
+        return False
+
+    def next_token(self) -> Token:
+        global TOKEN_PATTERN
+        while True:
+            buffer = self.buffer
+            match = TOKEN_PATTERN.match(buffer, self.pos)
+            end = match.end()
+            # 토큰(혹은 공백)이 buffer 끝까지 이어지면 다음 chunk에서 계속될 수 있음
+            if end < len(buffer) or not self.fill():
+                break
+
+        kind = match.lastgroup
+        if kind is None:
+            if end >= len(buffer):
+                self.pos = end
+                return Token("")
+            return self.read_by_char(end)
+        if end < len(buffer) and buffer[end] >= "\x80":
+            return self.read_by_char(match.start(kind))
+
+        self.pos = end
+        return Token(match.group(kind))
+
+    def tokenize(self) -> List[Token]:
+        """ EOF 토큰까지 모든 토큰을 한번에 반환
+        """
+        tokens = []
+        while True:
+            token = self.next_token()
+            tokens.append(token)
+            if token.type == TokenType.EOF:
+                return tokens
+
+    def read_by_char(self, start: int) -> Token:
+        """ start 위치부터 한 토큰을 `Lexer`의 문자 단위 로직으로 읽음
+        토큰 전체가 buffer에 들어오도록, start 이후에 공백이 나올 때까지 chunk를 더 읽음
+        """
+        global TOKEN_BOUNDARY_PATTERN
+        self.pos = start
+        while TOKEN_BOUNDARY_PATTERN.search(self.buffer, self.pos) is None and self.fill():
+            pass
+
+        lexer = Lexer(self.buffer)
+        lexer.offset = self.offset
+        lexer.n_pos = self.pos
+        lexer.next_char()
+
+        token = lexer.next_token()
+        self.pos = lexer.c_pos
+        return token
+
+
+# `TOKEN_PATTERN`의 bytes 버전. 유형별로 group을 나누어 literal을 만들지 않고 토큰 유형을 결정
+# ASCII가 아닌 byte가 이어지면 매칭하지 않고 decode 후 문자 단위 로직으로 넘김
+BUFFER_TOKEN_PATTERN = re.compile(
+    rb"[ \n\t\r]*(?:"
+    rb"(?P<reduce>\\(?:sum|prod)(?![a-zA-Z0-9\x80-\xff]))"
+    rb"|(?P<constant>\\(?:pi|exp)(?![a-zA-Z0-9\x80-\xff]))"
+    rb"|(?P<tex>\\[a-zA-Z]+(?![a-zA-Z0-9\x80-\xff]))"
+    rb"|(?P<let>let(?![a-zA-Z0-9\x80-\xff]))"
+    rb"|(?P<ident>[a-zA-Z][a-zA-Z0-9]*(?![a-zA-Z0-9\x80-\xff]))"
+    rb"|(?P<number>[0-9]+(?:\.[0-9]+)?(?![.0-9\x80-\xff]))"
+    rb"|(?P<symbol>[-+*/%^=_;(){}])"
+    rb")?"
+)
+
+BUFFER_TOKEN_TYPES = {
+    "reduce": TokenType.TEX_REDUCE_OP,
+    "tex": TokenType.TEX_SYMBOL,
+    "let": TokenType.LET,
+    "ident": TokenType.IDENT,
+    "number": TokenType.NUMBER,
+}
+
+BUFFER_BOUNDARY_PATTERN = re.compile(rb"[ \n\t\r]")
+
+
+class BufferLexer:
+    """
+    bytes-like buffer(bytes, mmap, memoryview)를 읽는 lexer. `Lexer`와 동일한 토큰 열을 반환
+    식별자 / 숫자 토큰은 buffer의 구간만 가리키는 `BufferToken`이며, literal을 읽을 때 decode
+
+    buffer는 UTF-8이어야 하며, c_pos와 LexerException의 position은 byte 단위
+    mmap을 닫으면 아직 decode하지 않은 토큰의 literal을 읽을 수 없음
+    """
+
+    buffer: Any
+    c_pos: int  # start position of the next scan (byte)
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.c_pos = 0
+
+    def next_token(self) -> Token:
+        global BUFFER_TOKEN_PATTERN, BUFFER_TOKEN_TYPES
+        buffer = self.buffer
+        match = BUFFER_TOKEN_PATTERN.match(buffer, self.c_pos)
+        kind = match.lastgroup
+        end = match.end()
+
+        if kind is None:
+            if end >= len(buffer):
+                self.c_pos = end
+                return Token("")
+            return self.read_by_char(end)
+
+        start = match.start(kind)
+        self.c_pos = end
+        if kind == "symbol" or kind == "constant":
+            # 기호와 상수는 TOKEN_TABLE의 literal을 공유
+            return Token(str(buffer[start: end], "ascii"))
+        return BufferToken(BUFFER_TOKEN_TYPES[kind], buffer, start, end)
+
+    def tokenize(self) -> List[Token]:
+        """ EOF 토큰까지 모든 토큰을 한번에 반환
+        """
+        tokens = []
+        while True:
+            token = self.next_token()
+            tokens.append(token)
+            if token.type == TokenType.EOF:
+                return tokens
+
+    def read_by_char(self, start: int) -> Token:
+        """ start 위치부터 공백 전까지를 decode 한 뒤, 한 토큰을 `Lexer`의 문자 단위 로직으로 읽음
+        """
+        global BUFFER_BOUNDARY_PATTERN
+        boundary = BUFFER_BOUNDARY_PATTERN.search(self.buffer, start)
+        stop = boundary.start() if boundary else len(self.buffer)
+        text = str(self.buffer[start: stop], "utf-8")
+
+        lexer = Lexer(text)
+        lexer.offset = start
+        token = lexer.next_token()
+        self.c_pos = start + len(text[: lexer.c_pos].encode("utf-8"))
+        return token
+
+
+@contextmanager
+def map_file(path: Union[str, os.PathLike]) -> Iterator[Any]:
+    """ 파일을 읽기 전용 mmap으로 열어 BufferLexer에 넘길 buffer를 반환 (빈 파일은 b"")
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
@@ -0,0 +1,158 @@
+""" 계산 자원 제한
+
+잘못된 수식 하나(e.g. `\\sum_{k=1}^{10^12}`, `2^(10^9)`)가 core를 계속 점유하지 않도록 계산 1회에 대해 제한
+* 합기호 / 곱기호의 전체 반복 횟수 : 반복을 시작하기 전에 반복할 횟수를 한번에 더해서 확인
+* 수의 자릿수 : 거듭제곱과 조합론은 계산하기 전에 결과의 자릿수를 추정해서 확인
+* AST 깊이 : 계산을 시작하기 전에 확인
+* 시간 : 반복 중 CHECK_INTERVAL번마다 확인
+
+넘으면 LimitExceededException
+"""
+import math
+import threading
+import time
+from decimal import Decimal
+from fractions import Fraction
+from typing import Optional
+
+from mathpreter.ast import Node, node_children
+from mathpreter.errors import CancelledException, LimitExceededException
+
+LOG10_E = math.log10(math.e)
+LOG10_2 = math.log10(2)
+
+# 합기호 / 곱기호를 이 횟수만큼 반복할 때마다 취소, 시간, 누적 값의 자릿수를 확인
+CHECK_INTERVAL = 1024
+
+
+def ast_depth(node: Node) -> int:
+    """ AST 깊이 (leaf는 1). 깊은 AST에서도 재귀 한도에 걸리지 않도록 stack으로 순회
+    """
+    depth = 0
+    stack = [(node, 1)]
+    while stack:
+        node, level = stack.pop()
+        depth = max(depth, level)
+        stack.extend((child, level + 1) for child in node_children(node) if child is not None)
+    return depth
+
+
+def magnitude(value) -> float:
+    """ 수를 표현하는 데 필요한 대략적인 10진 자릿수
+    """
+    global LOG10_2
+    if isinstance(value, int):
+        return abs(value).bit_length() * LOG10_2
+    if isinstance(value, Fraction):
+        return max(magnitude(value.numerator), magnitude(value.denominator))
+    if isinstance(value, Decimal):
+        return abs(value.adjusted()) + 1 if value.is_finite() and value else 0
+    return 0  # float은 크기가 제한됨
+
+
+class EvaluationLimits:
+    """ 계산 1회의 자원 제한. None인 항목은 제한하지 않음
+    """
+    max_iterations: Optional[int]  # 합기호 / 곱기호 반복 횟수의 합
+    max_digits: Optional[int]  # 계산 중 수의 최대 10진 자릿수
+    max_depth: Optional[int]  # AST 최대 깊이
+    timeout: Optional[float]  # 계산 1회의 최대 시간 (초)
+
+    def __init__(
+            self,
+            max_iterations: Optional[int] = None,
+            max_digits: Optional[int] = None,
+            max_depth: Optional[int] = None,
+            timeout: Optional[float] = None
+    ):
+        self.max_iterations = max_iterations
+        self.max_digits = max_digits
+        self.max_depth = max_depth
+        self.timeout = timeout
+
+    def __repr__(self):
+        return (
+            f"EvaluationLimits(max_iterations={self.max_iterations}, max_digits={self.max_digits}, "
+            f"max_depth={self.max_depth}, timeout={self.timeout})"
+        )
+
+    def check_depth(self, node: Node):
+        if self.max_depth is not None and (depth := ast_depth(node)) > self.max_depth:
+            raise LimitExceededException(f"AST is too deep. (as-is : {depth} > {self.max_depth})")
+
+    def check_digits(self, digits: float, name: str):
+        if self.max_digits is not None and digits > self.max_digits:
+            raise LimitExceededException(
+                f"{name} exceeds the digit limit. (as-is : about {int(digits)} > {self.max_digits})"
+            )
+
+    def check_value(self, value):
+        self.check_digits(magnitude(value), "value")
+
+    def check_power(self, base, exponent):
+        """ base^exponent 를 계산하기 전에 결과의 자릿수를 추정
+        """
+        if self.max_digits is None or base in (0, 1, -1) or isinstance(base, float):
+            return
+        if isinstance(base, Decimal):
+            # 유효숫자는 context precision으로 제한되므로 지수의 크기만 확인
+            digits = abs(float(abs(base).log10()))
+        else:
+            digits = magnitude(base)
+        self.check_digits(digits * abs(float(exponent)), "result of power")
+
+    def check_combinatorics(self, kind: str, n: int, k: int):
+        """ nPk, nCk, nΠk, nHk 를 계산하기 전에 결과의 자릿수를 추정
+        """
+        if self.max_digits is None or n < 2:
+            return
+        global LOG10_E
+        if kind == "H":
+            # nHk = (n+k-1)Ck
+            n, kind = n + k - 1, "C"
+        if kind == "C":
+            # nCk <= (e * n / k)^k
+            k = min(k, n - k)
+            if k <= 0:
+                return
+            self.check_digits(k * (math.log10(n / k) + LOG10_E), "result of combinatorics")
+        else:
+            self.check_digits(max(k, 0) * math.log10(n), "result of combinatorics")
+
+    def guard(self, cancel_event: Optional[threading.Event] = None) -> "LimitGuard":
+        return LimitGuard(self, cancel_event)
+
+
+class LimitGuard:
+    """ 계산 1회 동안의 반복 횟수와 마감 시각
+    """
+    __slots__ = ("limits", "cancel_event", "iterations", "deadline")
+
+    def __init__(self, limits: EvaluationLimits, cancel_event: Optional[threading.Event] = None):
+        self.limits = limits
+        self.cancel_event = cancel_event
+        self.iterations = 0
+        self.deadline = None if limits.timeout is None else time.monotonic() + limits.timeout
+
+    def enter_loop(self, count: int):
+        """ count번 반복하기 전에 호출
+        """
+        self.iterations += count
+        if self.limits.max_iterations is not None and self.iterations > self.limits.max_iterations:
+            raise LimitExceededException(
+                f"too many iterations. (as-is : {self.iterations} > {self.limits.max_iterations})"
+            )
+
+    def checkpoint(self, value=None):
+        """ 반복 중 CHECK_INTERVAL번마다 호출
+        """
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise CancelledException("evaluation is cancelled.")
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise LimitExceededException(f"evaluation timed out. (as-is : {self.limits.timeout}s)")
+        if value is not None and self.limits.max_digits is not None:
+            self.limits.check_value(value)
+
+
+# 제한이 없는 guard (취소만 확인)
+NO_LIMITS = EvaluationLimits()
@@ -0,0 +1,157 @@
+""" 수치 연산 backend
+
+같은 수식을 용도에 따라 다른 수 표현으로 계산
+* float : native float. 가장 빠름
+* decimal : decimal.Decimal. context precision 설정 가능 (기본값)
+* fraction : fractions.Fraction. 정확한 유리수 연산
+"""
+import math
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from decimal import Context, Decimal, localcontext
+from fractions import Fraction
+from typing import Any, ContextManager, Union
+
+from mathpreter.errors import EvaluatorException
+
+
+class NumericBackend(ABC):
+    """ 리터럴 변환과 backend마다 의미가 다른 연산(^, %)을 정의
+    `+ - * /` 와 비교 연산은 수 자료형의 연산을 그대로 사용
+    """
+    name: str
+    number_type: type
+    zero: Any
+    one: Any
+
+    @abstractmethod
+    def from_literal(self, literal: str):
+        """ NumberLiteral의 token literal을 변환 """
+        pass
+
+    def from_int(self, value: int):
+        return self.number_type(value)
+
+    def convert(self, value: Union[int, float, str, Decimal, Fraction]):
+        """ binding으로 전달된 값을 변환 """
+        if isinstance(value, self.number_type):
+            return value
+        return self.from_literal(str(value))
+
+    @abstractmethod
+    def power(self, base, exponent):
+        pass
+
+    @abstractmethod
+    def modulo(self, left, right):
+        """ 나머지. 부호는 피제수를 따름 (Decimal과 동일) """
+        pass
+
+    def context(self) -> ContextManager:
+        """ 계산하는 동안 적용할 context """
+        return nullcontext()
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+
+class FloatBackend(NumericBackend):
+    name = "float"
+    number_type = float
+    zero = 0.0
+    one = 1.0
+
+    def from_literal(self, literal: str) -> float:
+        return float(literal)
+
+    def convert(self, value) -> float:
+        return value if type(value) is float else float(value)
+
+    def power(self, base: float, exponent: float) -> float:
+        try:
+            return math.pow(base, exponent)
+        except ValueError:
+            # math.pow는 정의역을 벗어나면 complex 대신 ValueError
+            raise EvaluatorException(f"power is out of domain in float backend. (as-is : {base}^{exponent})") from None
+
+    def modulo(self, left: float, right: float) -> float:
+        if right == 0:
+            raise ZeroDivisionError("float modulo by zero")
+        try:
+            return math.fmod(left, right)
+        except ValueError:
+            raise EvaluatorException(f"modulo is out of domain in float backend. (as-is : {left} % {right})") from None
+
+
+class DecimalBackend(NumericBackend):
+    name = "decimal"
+    number_type = Decimal
+    zero = Decimal(0)
+    one = Decimal(1)
+
+    precision: int
+
+    def __init__(self, precision: int = 28):
+        self.precision = precision
+
+    def from_literal(self, literal: str) -> Decimal:
+        return Decimal(literal)
+
+    def convert(self, value) -> Decimal:
+        if isinstance(value, Decimal):
+            return value
+        if isinstance(value, Fraction):
+            return Decimal(value.numerator) / Decimal(value.denominator)
+        return Decimal(str(value))
+
+    def power(self, base: Decimal, exponent: Decimal) -> Decimal:
+        return base ** exponent
+
+    def modulo(self, left: Decimal, right: Decimal) -> Decimal:
+        return left % right
+
+    def context(self) -> ContextManager:
+        return localcontext(Context(prec=self.precision))
+
+    def __repr__(self):
+        return f"DecimalBackend(precision={self.precision})"
+
+
+class FractionBackend(NumericBackend):
+    name = "fraction"
+    number_type = Fraction
+    zero = Fraction(0)
+    one = Fraction(1)
+
+    def from_literal(self, literal: str) -> Fraction:
+        return Fraction(literal)
+
+    def power(self, base: Fraction, exponent: Fraction) -> Fraction:
+        if exponent.denominator != 1:
+            raise EvaluatorException(f"exponent should be an integer in fraction backend. (as-is : {exponent})")
+        return base ** exponent.numerator
+
+    def modulo(self, left: Fraction, right: Fraction) -> Fraction:
+        return left - right * math.trunc(left / right)
+
+
+FLOAT = FloatBackend()
+DECIMAL = DecimalBackend()
+FRACTION = FractionBackend()
+
+BACKENDS = {backend.name: backend for backend in (FLOAT, DECIMAL, FRACTION)}
+
+DEFAULT_BACKEND = DECIMAL
+
+
+def get_backend(backend: Union[str, NumericBackend, None] = None) -> NumericBackend:
+    """ 이름("float", "decimal", "fraction") 혹은 backend 객체로 backend를 반환. None이면 DEFAULT_BACKEND
+    """
+    global BACKENDS, DEFAULT_BACKEND
+    if backend is None:
+        return DEFAULT_BACKEND
+    if isinstance(backend, NumericBackend):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown numeric backend. (as-is : {backend})")
+    return BACKENDS[backend]
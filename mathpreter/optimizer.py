@@ -0,0 +1,229 @@
+""" Program 최적화
+
+같은 값을 계산하는 더 작은 AST를 만듦. 입력 AST는 수정하지 않음 (cache에서 공유되는 AST도 최적화 가능)
+1. constant folding : 피연산자가 모두 NumberLiteral인 연산을 미리 계산
+2. 대수적 단순화 : x*1, 1*x, x+0, 0+x, x-0, x/1, x^1, --x, 곱셈 연쇄의 리터럴 모으기
+3. loop-invariant hoisting : 범위가 비어 있지 않은 리터럴인 합기호 / 곱기호의 body에서 반복 변수와 무관한 인수를 밖으로 꺼냄
+    * \\sum_{k}{c * f(k)} => c * \\sum_{k}{f(k)}
+    * \\sum_{k}{f(k) / c} => \\sum_{k}{f(k)} / c
+    * \\prod_{k=a}^{b}{c * f(k)} => c^(b-a+1) * \\prod_{k=a}^{b}{f(k)}
+    * \\sum_{k=a}^{b}{c} => (b-a+1) * c, \\prod_{k=a}^{b}{c} => c^(b-a+1)
+    * 범위가 변수이면 비어 있을 수 있으므로 꺼내지 않음 (빈 범위에서는 c를 계산하지 않음)
+    * 리터럴 범위가 비어 있으면 항등원 (\\sum => 0, \\prod => 1)
+"""
+import operator
+from typing import List, Optional, Union
+
+from mathpreter.ast import (
+    Expression, Program, Statement,
+    LetStatement, ExpressionStatement,
+    PrefixExpression, NumberLiteral, InfixExpression, MathReducerExpression, CombinatoricsExpression,
+    free_identifiers
+)
+from mathpreter.combinatorics import evaluate_combinatorics
+from mathpreter.errors import EvaluatorException
+from mathpreter.evaluator import literal_value, reducer_identity, to_integer
+from mathpreter.numeric import NumericBackend, get_backend
+from mathpreter.token import Token
+
+
+class Optimizer:
+    """ constant folding, 대수적 단순화, loop-invariant hoisting
+    """
+    backend: NumericBackend  # 미리 계산할 때 사용할 수 표현
+
+    def __init__(self, backend: Union[str, NumericBackend, None] = None):
+        self.backend = get_backend(backend)
+        self.operators = {
+            "+": operator.add,
+            "-": operator.sub,
+            "*": operator.mul,
+            "/": operator.truediv,
+            "%": self.backend.modulo,
+            "^": self.backend.power,
+        }
+
+    def optimize(self, program: Program) -> Program:
+        with self.backend.context():
+            return Program([self.optimize_statement(stmt) for stmt in program.statements])
+
+    def optimize_statement(self, stmt: Statement) -> Statement:
+        if isinstance(stmt, LetStatement):
+            return LetStatement(stmt.token, stmt.name, self.optimize_expression(stmt.value))
+        if isinstance(stmt, ExpressionStatement):
+            return ExpressionStatement(stmt.token, self.optimize_expression(stmt.expression))
+        return stmt
+
+    def optimize_expression(self, expr: Expression) -> Expression:
+        if isinstance(expr, InfixExpression):
+            return self.optimize_infix_expression(expr)
+        elif isinstance(expr, PrefixExpression):
+            return self.optimize_prefix_expression(expr)
+        elif isinstance(expr, MathReducerExpression):
+            return self.optimize_reducer_expression(expr)
+        elif isinstance(expr, CombinatoricsExpression):
+            return self.optimize_combinatorics_expression(expr)
+        return expr
+
+    def optimize_infix_expression(self, expr: InfixExpression) -> Expression:
+        left = self.optimize_expression(expr.left)
+        right = self.optimize_expression(expr.right)
+        return self.simplify_infix(expr.token, left, right)
+
+    def simplify_infix(self, token: Token, left: Expression, right: Expression) -> Expression:
+        operator_ = token.literal
+        if isinstance(left, NumberLiteral) and isinstance(right, NumberLiteral):
+            if (folded := self.fold(operator_, left, right)) is not None:
+                return folded
+
+        if operator_ == "*" and (folded := self.fold_constant_factors(left, right)) is not None:
+            return folded
+        if operator_ in ("*", "/", "^") and self.is_constant(right, 1):
+            return left
+        if operator_ == "*" and self.is_constant(left, 1):
+            return right
+        if operator_ in ("+", "-") and self.is_constant(right, 0):
+            return left
+        if operator_ == "+" and self.is_constant(left, 0):
+            return right
+        if operator_ == "-" and self.is_constant(left, 0):
+            return self.simplify_negation(Token("-"), right)
+        return InfixExpression(token, left, right)
+
+    def optimize_prefix_expression(self, expr: PrefixExpression) -> Expression:
+        return self.simplify_negation(expr.token, self.optimize_expression(expr.right))
+
+    def simplify_negation(self, token: Token, right: Expression) -> Expression:
+        if token.literal != "-":
+            return PrefixExpression(token, right)
+        if isinstance(right, PrefixExpression) and right.operator == "-":
+            return right.right
+        if isinstance(right, NumberLiteral):
+            return self.number(-literal_value(right, self.backend))
+        return PrefixExpression(token, right)
+
+    def optimize_combinatorics_expression(self, expr: CombinatoricsExpression) -> Expression:
+        left = self.optimize_expression(expr.left)
+        right = self.optimize_expression(expr.right)
+        if isinstance(left, NumberLiteral) and isinstance(right, NumberLiteral):
+            try:
+                n = to_integer(literal_value(left, self.backend), "left operand of combinatorics")
+                k = to_integer(literal_value(right, self.backend), "right operand of combinatorics")
+                return self.number(self.backend.from_int(evaluate_combinatorics(expr.identifier.literal(), n, k)))
+            except EvaluatorException:
+                pass
+        return CombinatoricsExpression(expr.token, expr.identifier, left, right)
+
+    def optimize_reducer_expression(self, expr: MathReducerExpression) -> Expression:
+        start = self.optimize_expression(expr.start)
+        end = self.optimize_expression(expr.end)
+        body = self.optimize_expression(expr.body)
+        name = expr.identifier.value
+        is_sum = expr.token.literal == "\\sum"
+        count = self.iteration_count(start, end)
+
+        if count == 0:
+            # 빈 범위는 body를 계산하지 않음 (c^0, 0 * c 로 바꾸면 c = 0 이거나 계산할 수 없을 때 실패)
+            return self.number(reducer_identity(expr.token.literal, self.backend))
+
+        if name not in free_identifiers(body):
+            if count is not None:
+                times = self.number(self.backend.from_int(count))
+                if is_sum:
+                    return self.simplify_infix(Token("*"), times, body)
+                return self.simplify_infix(Token("^"), body, times)
+            return MathReducerExpression(expr.token, expr.identifier, start, end, body)
+
+        # 범위가 비어 있을 수 있으면 꺼내지 않음 (빈 합은 c를 계산하지 않으므로 c가 없거나 0이어도 0)
+        if count is None:
+            return MathReducerExpression(expr.token, expr.identifier, start, end, body)
+
+        # \sum_{k}{f(k) / c} => \sum_{k}{f(k)} / c
+        if (
+                is_sum
+                and isinstance(body, InfixExpression)
+                and body.operator == "/"
+                and name not in free_identifiers(body.right)
+        ):
+            reduced = self.optimize_reducer_expression(
+                MathReducerExpression(expr.token, expr.identifier, start, end, body.left)
+            )
+            return self.simplify_infix(body.token, reduced, body.right)
+
+        # c * f(k) => c * \sum_{k}{f(k)}
+        invariants, variants = [], []
+        for factor in self.factors(body):
+            (variants if name in free_identifiers(factor) else invariants).append(factor)
+        if invariants:
+            reduced = MathReducerExpression(expr.token, expr.identifier, start, end, self.product(variants))
+            invariant = self.product(invariants)
+            if not is_sum:
+                invariant = self.simplify_infix(Token("^"), invariant, self.number(self.backend.from_int(count)))
+            return self.simplify_infix(Token("*"), invariant, reduced)
+
+        return MathReducerExpression(expr.token, expr.identifier, start, end, body)
+
+    def fold(self, operator_: str, left: NumberLiteral, right: NumberLiteral) -> Optional[NumberLiteral]:
+        """ 미리 계산. 계산 중 에러(0으로 나누기 등)가 나면 실행 시점에 발생하도록 그대로 둠
+        """
+        if (func := self.operators.get(operator_)) is None:
+            return None
+        try:
+            return self.number(func(literal_value(left, self.backend), literal_value(right, self.backend)))
+        except (ArithmeticError, ValueError, EvaluatorException):
+            return None
+
+    def fold_constant_factors(self, left: Expression, right: Expression) -> Optional[Expression]:
+        """ 곱셈 연쇄에 리터럴이 두 개 이상이면 하나로 모음. e.g. 10 * (x * 2) => 20 * x
+        """
+        factors = self.factors(left) + self.factors(right)
+        constants = [factor for factor in factors if isinstance(factor, NumberLiteral)]
+        if len(constants) < 2:
+            return None
+
+        constant = constants[0]
+        for factor in constants[1:]:
+            if (constant := self.fold("*", constant, factor)) is None:
+                return None
+        rest = [factor for factor in factors if not isinstance(factor, NumberLiteral)]
+        return self.product([constant] + rest)
+
+    def iteration_count(self, start: Expression, end: Expression) -> Optional[int]:
+        """ 범위가 정수 리터럴이면 반복 횟수
+        """
+        if not (isinstance(start, NumberLiteral) and isinstance(end, NumberLiteral)):
+            return None
+        first, last = literal_value(start, self.backend), literal_value(end, self.backend)
+        if int(first) != first or int(last) != last:
+            return None
+        return max(0, int(last) - int(first) + 1)
+
+    def is_constant(self, expr: Expression, value: int) -> bool:
+        return isinstance(expr, NumberLiteral) and literal_value(expr, self.backend) == value
+
+    def number(self, value) -> NumberLiteral:
+        return NumberLiteral(Token.number(str(value)), value)
+
+    @staticmethod
+    def factors(expr: Expression) -> List[Expression]:
+        """ a * b * c 의 인수들
+        """
+        if isinstance(expr, InfixExpression) and expr.operator == "*":
+            return Optimizer.factors(expr.left) + Optimizer.factors(expr.right)
+        return [expr]
+
+    def product(self, factors: List[Expression]) -> Expression:
+        result = factors[0]
+        for factor in factors[1:]:
+            result = self.simplify_infix(Token("*"), result, factor)
+        return result
+
+
+def optimize(program: Program, backend: Union[str, NumericBackend, None] = None) -> Program:
+    """ Program과 같은 값을 계산하는 더 작은 Program을 반환
+
+    :param program: 파싱된 Program (수정하지 않음)
+    :param backend: 미리 계산할 때 사용할 수 표현. 파싱할 때와 같은 backend를 사용
+    :return: 최적화된 Program
+    """
+    return Optimizer(backend).optimize(program)
@@ -0,0 +1,184 @@
+""" 합기호 / 곱기호의 범위 분할 계산
+
+closed form도 없고 배열 연산도 할 수 없는 body(중첩된 조합론, 큰 정수 연산 등)는 반복해서 계산해야 하므로,
+[start, end]를 구간으로 나누어 구간마다 worker process에서 계산한 뒤 부분 결과를 합침
+* \\sum : 부분합을 더함
+* \\prod : 부분곱을 balanced tree로 곱함
+
+큰 정수는 크기가 비슷한 수끼리 곱해야 빠르므로, 구간 안의 곱도 같은 tree로 계산
+
+구간은 CPU 개수 / workers와 무관하게 threshold로만 정하므로, 부분합을 더하는 순서가 바뀌는 float / Decimal의 결과도
+계산하는 machine에 따라 달라지지 않음 (나누지 않고 계산한 결과와는 반올림 오차만큼 다를 수 있음)
+worker process pool은 처음 나누어 계산할 때 만들고 이후 계산에서 재사용
+"""
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from mathpreter.ast import Expression, free_identifiers
+from mathpreter.batch import run_chunks
+from mathpreter.evaluator import ClosureCompiler, Frame, compiled_ftype
+from mathpreter.numeric import NumericBackend
+from mathpreter.reducer import PARALLEL_THRESHOLD
+
+# 구간 하나의 반복 횟수는 threshold / CHUNKS_PER_THRESHOLD 이하
+CHUNKS_PER_THRESHOLD = 4
+
+_pools: Dict[int, ProcessPoolExecutor] = {}  # process 개수 -> 공유 pool
+_pools_lock = threading.Lock()
+
+
+def split_range(start: int, end: int, count: int) -> List[Tuple[int, int]]:
+    """ [start, end]를 크기가 비슷한 count개 이하의 구간 [first, last]로 나눔
+    """
+    total = end - start + 1
+    if total <= 0:
+        return []
+    count = max(min(count, total), 1)
+    size, extra = divmod(total, count)
+    ranges = []
+    first = start
+    for i in range(count):
+        last = first + size - (i >= extra)
+        ranges.append((first, last))
+        first = last + 1
+    return ranges
+
+
+def chunk_ranges(start: int, end: int, size: int) -> List[Tuple[int, int]]:
+    """ [start, end]를 반복 횟수가 size 이하이고 크기가 비슷한 구간으로 나눔
+    """
+    return split_range(start, end, -(-(end - start + 1) // size))
+
+
+def shared_pool(workers: int) -> ProcessPoolExecutor:
+    """ workers개 process의 pool. 처음 사용할 때 만들고, 중첩된 합기호처럼 여러 번 나누어 계산해도 재사용
+    """
+    with _pools_lock:
+        if (pool := _pools.get(workers)) is None:
+            pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return pool
+
+
+def discard_pool(workers: int, pool: Executor):
+    """ worker process가 죽어 더 사용할 수 없는 pool을 버림 (다음 계산에서 새로 만듦)
+    """
+    with _pools_lock:
+        if _pools.get(workers) is pool:
+            del _pools[workers]
+    pool.shutdown(wait=False)
+
+
+def balanced_product(values: Sequence, identity):
+    """ 이웃한 두 수끼리 곱하는 것을 반복하는 tree 곱
+    순서대로 곱하면 매번 (큰 누적값 * 작은 수)가 되지만, tree는 크기가 비슷한 수끼리 곱함
+    """
+    values = list(values)
+    if not values:
+        return identity
+    while len(values) > 1:
+        paired = [values[i] * values[i + 1] for i in range(0, len(values) - 1, 2)]
+        if len(values) % 2:
+            paired.append(values[-1])
+        values = paired
+    return identity * values[0]
+
+
+def reduce_range(
+        reducer: str, body: compiled_ftype, frame: Frame, variable: int, backend: NumericBackend, first: int, last: int
+):
+    """ compile된 body를 [first, last]에서 반복 계산해서 더하거나(\\sum) 곱함(\\prod)
+    """
+    from_int = backend.from_int
+    if reducer == "\\sum":
+        result = backend.zero
+        for k in range(first, last + 1):
+            frame[variable] = from_int(k)
+            result += body(frame)
+        return result
+
+    values = []
+    for k in range(first, last + 1):
+        frame[variable] = from_int(k)
+        values.append(body(frame))
+    return balanced_product(values, backend.one)
+
+
+def _reduce_ranges(
+        reducer: str,
+        body: Expression,
+        name: str,
+        env: Dict[str, Any],
+        backend: NumericBackend,
+        closed_form: bool,
+        vectorize_reducers: bool,
+        ranges: Sequence[Tuple[int, int]]
+) -> list:
+    """ worker : body를 한번만 compile 한 뒤 구간마다 부분합 / 부분곱을 계산
+    """
+    # worker 안에서는 다시 나누지 않음
+    compiler = ClosureCompiler(
+        backend=backend, closed_form=closed_form, vectorize_reducers=vectorize_reducers, parallel_threshold=None
+    )
+    # 반복 변수를 최상위 slot으로 두고 body를 compile
+    variable = compiler.resolver.resolve(name)
+    body_fn = compiler.compile_expression(body)
+    frame = compiler.resolver.new_frame()
+    for key, slot in compiler.resolver.inputs.items():
+        frame[slot] = env.get(key)
+    with backend.context():
+        return [reduce_range(reducer, body_fn, frame, variable, backend, first, last) for first, last in ranges]
+
+
+def parallel_reduce(
+        reducer: str,
+        body: Expression,
+        name: str,
+        env: Dict[str, Any],
+        start: int,
+        end: int,
+        backend: NumericBackend,
+        closed_form: bool = True,
+        vectorize_reducers: bool = False,
+        workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        threshold: int = PARALLEL_THRESHOLD
+):
+    """ \\sum / \\prod 를 구간으로 나누어 worker process에서 계산한 뒤 합침
+
+    :param reducer: "\\sum" 혹은 "\\prod"
+    :param body: 합기호 / 곱기호의 body. worker로 pickle해서 전달
+    :param name: 반복 변수 이름
+    :param env: body의 자유 변수 값 (필요한 이름만 worker로 전달)
+    :param backend: 수 표현
+    :param closed_form: worker에서 body 안의 합기호 / 곱기호를 closed form으로 계산
+    :param vectorize_reducers: worker에서 body 안의 합기호 / 곱기호를 NumPy reduction으로 계산
+    :param workers: process 개수. 기본값은 CPU 개수, 1이면 현재 process에서 실행
+    :param executor: 이미 만들어 둔 executor. 없으면 공유 pool을 사용
+    :param threshold: 구간 하나의 반복 횟수는 threshold / CHUNKS_PER_THRESHOLD 이하
+    :return: 합 혹은 곱
+    """
+    workers = workers or os.cpu_count() or 1
+    free = free_identifiers(body)
+    env = {key: value for key, value in env.items() if key in free and key != name}
+
+    ranges = chunk_ranges(start, end, max(threshold // CHUNKS_PER_THRESHOLD, 1))
+    task = partial(_reduce_ranges, reducer, body, name, env, backend, closed_form, vectorize_reducers)
+    if executor is not None or workers == 1 or len(ranges) <= 1:
+        partials = run_chunks(task, ranges, workers, 1, executor)
+    else:
+        pool = shared_pool(workers)
+        try:
+            partials = run_chunks(task, ranges, workers, 1, pool)
+        except BrokenProcessPool:
+            discard_pool(workers, pool)
+            raise
+    if reducer == "\\sum":
+        result = backend.zero
+        for value in partials:
+            result += value
+        return result
+    return balanced_product(partials, backend.one)
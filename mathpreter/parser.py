@@ -1,5 +1,5 @@
 from enum import IntEnum
-from typing import List, Dict, Callable, Optional
+from typing import List, Dict, Callable, Iterator, Optional, Union
 
 from mathpreter.ast import (
     Expression, Program, Statement,
@@ -8,13 +8,14 @@ from mathpreter.ast import (
 )
 from mathpreter.errors import ParserException
 from mathpreter.lexer import Lexer
+from mathpreter.numeric import NumericBackend, get_backend
 from mathpreter.token import Token, TokenType
 
-# 전위함수 파싱 로직
-prefix_parse_ftype = Callable[[], Expression]
+# 전위함수 파싱 로직 (parser를 인자로 받는 method)
+prefix_parse_ftype = Callable[["Parser"], Expression]
 
-# 중위함수 파싱 로직
-infix_parse_ftype = Callable[[Expression], Expression]
+# 중위함수 파싱 로직 (parser, 왼쪽 식)
+infix_parse_ftype = Callable[["Parser", Expression], Expression]
 
 
 class OperatorPriority(IntEnum):
@@ -32,50 +33,66 @@ PRECEDENCE_RELATION = {
     TokenType.MINUS: OperatorPriority.SUM,
     TokenType.DIVIDE: OperatorPriority.PRODUCT,
     TokenType.MULTIPLY: OperatorPriority.PRODUCT,
+    TokenType.MODULO: OperatorPriority.PRODUCT,
     TokenType.HAT: OperatorPriority.EXPONENTIONAL
 }
 
 
 class Parser:
     lexer: Lexer
+    backend: NumericBackend  # NumberLiteral의 수 표현
 
     curr_token: Token
     next_token: Token
 
     errors: List[str]
 
+    # token 유형 -> 파싱 method 이름. 상속한 class에서 method를 바꾸면 그 class의 table에 반영
+    prefix_parse_fn_names: Dict[TokenType, str] = {
+        TokenType.IDENT: "parse_identifier",
+        TokenType.NUMBER: "parse_number",
+        TokenType.MINUS: "parse_prefix_single_expression",
+        TokenType.LPAREN: "parse_grouped_expression",
+        TokenType.TEX_REDUCE_OP: "parse_prefix_reducer_expression",
+        TokenType.UNDERSCORE: "parse_prefix_combinatorics_expression",
+    }
+    infix_parse_fn_names: Dict[TokenType, str] = {
+        TokenType.PLUS: "parse_infix_arithmetic_expression",
+        TokenType.MINUS: "parse_infix_arithmetic_expression",
+        TokenType.MULTIPLY: "parse_infix_arithmetic_expression",
+        TokenType.DIVIDE: "parse_infix_arithmetic_expression",
+        TokenType.MODULO: "parse_infix_arithmetic_expression",
+        TokenType.HAT: "parse_infix_arithmetic_expression",
+    }
+
+    # class마다 한번만 만드는 dispatch table (register_parse_fns 참고)
     prefix_parse_fns: Dict[TokenType, prefix_parse_ftype]
     infix_parse_fns: Dict[TokenType, infix_parse_ftype]
 
-    def __init__(self, lexer: Lexer):
+    def __init__(self, lexer: Lexer, backend: Union[str, NumericBackend, None] = None):
         self.lexer = lexer
+        self.backend = get_backend(backend)
 
         # initialize current token & next token
         self.curr_token = self.lexer.next_token()
         self.next_token = self.lexer.next_token()
 
         self.errors = []
-        self.register_prefix_parse_fns()
-        self.register_infix_parse_fns()
-
-    def register_prefix_parse_fns(self):
-        self.prefix_parse_fns = {}
-
-        self.prefix_parse_fns[TokenType.IDENT] = self.parse_identifier
-        self.prefix_parse_fns[TokenType.NUMBER] = self.parse_number
-        self.prefix_parse_fns[TokenType.MINUS] = self.parse_prefix_single_expression
-        self.prefix_parse_fns[TokenType.LPAREN] = self.parse_grouped_expression
-        self.prefix_parse_fns[TokenType.TEX_REDUCE_OP] = self.parse_prefix_reducer_expression
-        self.prefix_parse_fns[TokenType.UNDERSCORE] = self.parse_prefix_combinatorics_expression
-
-    def register_infix_parse_fns(self):
-        self.infix_parse_fns = {}
-        self.infix_parse_fns[TokenType.PLUS] = self.parse_infix_arithmetic_expression
-        self.infix_parse_fns[TokenType.MINUS] = self.parse_infix_arithmetic_expression
-        self.infix_parse_fns[TokenType.MULTIPLY] = self.parse_infix_arithmetic_expression
-        self.infix_parse_fns[TokenType.DIVIDE] = self.parse_infix_arithmetic_expression
-        self.infix_parse_fns[TokenType.MODULO] = self.parse_infix_arithmetic_expression
-        self.infix_parse_fns[TokenType.HAT] = self.parse_infix_arithmetic_expression
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.register_parse_fns()
+
+    @classmethod
+    def register_parse_fns(cls):
+        """ 파싱 method 이름으로 class의 dispatch table을 만듦. table의 값은 bound method가 아닌 함수
+        """
+        cls.prefix_parse_fns = {
+            token_type: getattr(cls, name) for token_type, name in cls.prefix_parse_fn_names.items()
+        }
+        cls.infix_parse_fns = {
+            token_type: getattr(cls, name) for token_type, name in cls.infix_parse_fn_names.items()
+        }
 
     def peek_priority(self) -> OperatorPriority:
         global PRECEDENCE_RELATION
@@ -99,16 +116,21 @@ class Parser:
 
     def parse_program(self):
         program = Program()
+        for stmt in self.iter_statements():
+            program.append(stmt)
+        return program
 
+    def iter_statements(self) -> Iterator[Statement]:
+        """ 구문이 끝날 때마다(`;` 혹은 EOF) 하나씩 반환
+        이미 반환한 구문은 parser가 보관하지 않음
+        """
         while self.curr_token.type != TokenType.EOF:
             # `curr_token` should be located at the `end token` of statement
             stmt = self.parse_statement()
             if stmt:
-                program.append(stmt)
+                yield stmt
             self.shift_token()
 
-        return program
-
     def parse_statement(self) -> Statement:
         curr_token = self.curr_token
 
@@ -144,7 +166,7 @@ class Parser:
     def parse_expression(self, priority: OperatorPriority) -> Expression:
         left = None
         if prefix_func := self.prefix_parse_fns.get(self.curr_token.type):
-            left = prefix_func()
+            left = prefix_func(self)
 
         while (
                 not self.next_token_type_is(TokenType.EOF)
@@ -155,8 +177,7 @@ class Parser:
             if not infix_func:
                 raise ParserException("infix func is not found")
             self.shift_token()
-            left = infix_func(left)
-            break
+            left = infix_func(self, left)
 
         return left
 
@@ -174,7 +195,7 @@ class Parser:
         return Identifier(self.curr_token)
 
     def parse_number(self) -> NumberLiteral:
-        return NumberLiteral(self.curr_token)
+        return NumberLiteral(self.curr_token, self.backend.from_literal(self.curr_token.literal))
 
     def parse_prefix_single_expression(self) -> PrefixExpression:
         token = self.curr_token
@@ -261,3 +282,73 @@ class Parser:
         self.shift_token_if_type_is(TokenType.LBRACE)
         right = self.parse_bracket()
         return CombinatoricsExpression(token, identifier, left, right)
+
+
+Parser.register_parse_fns()
+
+
+class IterativeParser(Parser):
+    """ 재귀 대신 명시적인 stack으로 식을 파싱하는 Parser
+
+    Parser와 같은 InfixExpression / PrefixExpression 트리를 만들지만,
+    괄호 중첩이나 연산자 연쇄가 아무리 길어도 재귀 한도에 걸리지 않음 (합기호 / 조합론의 `{...}` 안쪽은 중첩된 만큼 재귀)
+
+    stack의 각 항목은 Parser.parse_expression의 재귀 호출 한 단계에 대응
+        (INFIX, 연산자 token, 연산자 우선순위, 왼쪽 식)
+        (PREFIX, `-` token, PREFIX, None)
+        (GROUP, `(` token, LOWEST, None)
+    """
+    INFIX = 0
+    PREFIX = 1
+    GROUP = 2
+
+    def parse_expression(self, priority: OperatorPriority) -> Expression:
+        global PRECEDENCE_RELATION
+        INFIX, PREFIX, GROUP = self.INFIX, self.PREFIX, self.GROUP
+        MINUS, LPAREN, RPAREN, EOF = TokenType.MINUS, TokenType.LPAREN, TokenType.RPAREN, TokenType.EOF
+        LOWEST = OperatorPriority.LOWEST
+        next_token = self.lexer.next_token
+        prefix_parse_fns = self.prefix_parse_fns
+        stack = []
+
+        while True:
+            # 피연산자 위치 : `-`와 `(`는 stack에 쌓고, 나머지 전위 식은 그대로 파싱
+            token = self.curr_token
+            token_type = token.type
+            if token_type is MINUS or token_type is LPAREN:
+                if token_type is MINUS:
+                    stack.append((PREFIX, token, OperatorPriority.PREFIX, None))
+                else:
+                    stack.append((GROUP, token, LOWEST, None))
+                self.curr_token = self.next_token
+                self.next_token = next_token()
+                continue
+            operand = None
+            if prefix_func := prefix_parse_fns.get(token_type):
+                operand = prefix_func(self)
+
+            # 연산자 위치 : 우선순위가 더 높은 연산자가 오면 쌓고, 아니면 stack을 줄임
+            while True:
+                binding = stack[-1][2] if stack else priority
+                next_type = self.next_token.type
+                next_priority = PRECEDENCE_RELATION.get(next_type, LOWEST)
+                if next_type is not EOF and binding < next_priority:
+                    if next_type not in self.infix_parse_fns:
+                        raise ParserException("infix func is not found")
+                    stack.append((INFIX, self.next_token, next_priority, operand))
+                    self.curr_token = next_token()
+                    self.next_token = next_token()
+                    break
+
+                if not stack:
+                    return operand
+                kind, token, _, left = stack.pop()
+                if kind == INFIX:
+                    operand = InfixExpression(token, left, operand)
+                elif kind == PREFIX:
+                    operand = PrefixExpression(token, operand)
+                else:
+                    if self.next_token.type is not RPAREN:
+                        raise ParserException("Parsing Failed. `)` is missing.")
+                    self.curr_token = self.next_token
+                    self.next_token = next_token()
@@ -0,0 +1,354 @@
+""" lexer / parser / 계산 profiling
+
+    with profile() as report:
+        program = Parser(RegexLexer(text)).parse_program()
+        Evaluator().evaluate(program)
+    print(report)  # 혹은 report.as_dict()
+
+profile 중에만 Lexer / Parser / Evaluator / ClosureCompiler의 method를 측정하는 wrapper로 바꾸므로,
+profile 밖에서는 비용이 없음. 측정은 profile을 시작한 context(thread)의 호출만 기록
+* lexer.next_token : 토큰 수와 시간 (tokenize로 만든 토큰 포함)
+* parser.<method> : parse_program과 각 parse_* method의 호출 수 / 시간 (재귀 호출은 바깥 호출의 시간에도 포함)
+* ast.<class> : parse_program이 만든 AST node 수
+* evaluator.evaluate, compiler.compile_program, compiled.run : 계산 / compile 시간
+* reducer.<\\sum|\\prod> : 합기호 / 곱기호 1회의 시간, reducer.<\\sum|\\prod>.iteration : body 계산 1회의 시간
+  (closed form으로 계산하면 반복 없이 끝나므로 iteration이 거의 기록되지 않음)
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from mathpreter.ast import node_children
+from mathpreter.evaluator import Evaluator, ClosureCompiler
+from mathpreter.lexer import Lexer, RegexLexer, StreamLexer, BufferLexer
+from mathpreter.parser import Parser
+
+LEXER_CLASSES = (Lexer, RegexLexer, StreamLexer, BufferLexer)
+
+# 현재 context에서 기록 중인 Profile
+ACTIVE_PROFILE: ContextVar[Optional["Profile"]] = ContextVar("mathpreter_profile", default=None)
+
+
+class Timing:
+    """ 호출 수와 시간 (초)
+    """
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, elapsed: float):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max
+        }
+
+
+class Profile:
+    """ profile 1회의 counter와 timing
+    """
+    counters: Dict[str, int]
+    timings: Dict[str, Timing]
+
+    def __init__(self):
+        self.counters = {}
+        self.timings = {}
+        self.lexing = 0  # 측정 중인 lexer 호출 깊이 (read_by_char, tokenize 안쪽의 next_token은 중복 기록하지 않음)
+        self.parsing = 0  # 측정 중인 parse_program 깊이
+        self.lexing_in_parse = 0.0  # parse_program 안에서 lexer가 쓴 시간
+        self.reducer_bodies: Dict[int, str] = {}  # 계산 / compile 중인 합기호 body의 id -> 기록할 이름
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def record(self, name: str, elapsed: float):
+        if (timing := self.timings.get(name)) is None:
+            timing = self.timings[name] = Timing()
+        timing.add(elapsed)
+
+    def total(self, name: str) -> float:
+        return timing.total if (timing := self.timings.get(name)) is not None else 0.0
+
+    def phases(self) -> Dict[str, float]:
+        """ 단계별 시간 (초). parsing은 parse_program 안에서 lexer가 쓴 시간을 뺀 값
+        """
+        return {
+            "lexing": self.total("lexer.next_token"),
+            "parsing": self.total("parser.parse_program") - self.lexing_in_parse,
+            "compiling": self.total("compiler.compile_program"),
+            "evaluating": self.total("evaluator.evaluate") + self.total("compiled.run"),
+        }
+
+    def as_dict(self) -> dict:
+        return {
+            "phases": self.phases(),
+            "counters": dict(self.counters),
+            "timings": {name: timing.as_dict() for name, timing in self.timings.items()},
+        }
+
+    def __str__(self):
+        lines = [f"{'phase':<40}{'total(ms)':>12}"]
+        lines += [f"{name:<40}{elapsed * 1000:>12.3f}" for name, elapsed in self.phases().items()]
+        lines.append(f"{'timing':<40}{'count':>12}{'total(ms)':>12}{'mean(us)':>12}{'max(us)':>12}")
+        for name, timing in sorted(self.timings.items(), key=lambda item: -item[1].total):
+            lines.append(
+                f"{name:<40}{timing.count:>12}{timing.total * 1000:>12.3f}"
+                f"{timing.total / timing.count * 1e6:>12.2f}{timing.max * 1e6:>12.2f}"
+            )
+        lines.append(f"{'counter':<40}{'count':>12}")
+        lines += [f"{name:<40}{count:>12}" for name, count in sorted(self.counters.items())]
+        return "\n".join(lines)
+
+
+def count_nodes(profile: Profile, node):
+    """ AST node 수를 class별로 기록. 깊은 AST에서도 재귀 한도에 걸리지 않도록 stack으로 순회
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        profile.count(f"ast.{type(node).__name__}")
+        stack.extend(child for child in node_children(node) if child is not None)
+
+
+def timed(name: str, func: Callable) -> Callable:
+    """ 현재 context의 Profile에 func의 호출 시간을 기록하는 wrapper
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        global ACTIVE_PROFILE
+        if (profile := ACTIVE_PROFILE.get()) is None:
+            return func(*args, **kwargs)
+        begin = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.record(name, time.perf_counter() - begin)
+
+    return wrapper
+
+
+def instrument_lexer(func: Callable) -> Callable:
+    """ next_token / tokenize : 가장 바깥 호출만 토큰 수와 시간을 기록
+    """
+    @wraps(func)
+    def wrapper(self, *args):
+        global ACTIVE_PROFILE
+        if (profile := ACTIVE_PROFILE.get()) is None or profile.lexing:
+            return func(self, *args)
+        profile.lexing += 1
+        begin = time.perf_counter()
+        try:
+            result = func(self, *args)
+        finally:
+            elapsed = time.perf_counter() - begin
+            profile.lexing -= 1
+        profile.count("lexer.tokens", len(result) if isinstance(result, list) else 1)
+        profile.record("lexer.next_token", elapsed)
+        if profile.parsing:
+            profile.lexing_in_parse += elapsed
+        return result
+
+    return wrapper
+
+
+def instrument_parse_program(func: Callable) -> Callable:
+    @wraps(func)
+    def wrapper(self):
+        global ACTIVE_PROFILE
+        if (profile := ACTIVE_PROFILE.get()) is None:
+            return func(self)
+        profile.parsing += 1
+        begin = time.perf_counter()
+        try:
+            program = func(self)
+        finally:
+            profile.record("parser.parse_program", time.perf_counter() - begin)
+            profile.parsing -= 1
+        count_nodes(profile, program)
+        return program
+
+    return wrapper
+
+
+def instrument_eval_reducer(func: Callable) -> Callable:
+    """ Evaluator.eval_reducer_expression : 이 합기호의 body를 계산할 때마다 iteration으로 기록
+    """
+    @wraps(func)
+    def wrapper(self, expr, env):
+        global ACTIVE_PROFILE
+        if (profile := ACTIVE_PROFILE.get()) is None:
+            return func(self, expr, env)
+        name = f"reducer.{expr.token.literal}"
+        outer = profile.reducer_bodies.get(id(expr.body))
+        profile.reducer_bodies[id(expr.body)] = f"{name}.iteration"
+        begin = time.perf_counter()
+        try:
+            return func(self, expr, env)
+        finally:
+            profile.record(name, time.perf_counter() - begin)
+            if outer is None:
+                profile.reducer_bodies.pop(id(expr.body), None)
+            else:
+                profile.reducer_bodies[id(expr.body)] = outer
+
+    return wrapper
+
+
+def instrument_eval_expression(func: Callable) -> Callable:
+    @wraps(func)
+    def wrapper(self, expr, env):
+        global ACTIVE_PROFILE
+        if (profile := ACTIVE_PROFILE.get()) is None or (name := profile.reducer_bodies.get(id(expr))) is None:
+            return func(self, expr, env)
+        begin = time.perf_counter()
+        try:
+            return func(self, expr, env)
+        finally:
+            profile.record(name, time.perf_counter() - begin)
+
+    return wrapper
+
+
+def instrument_compile_reducer(func: Callable) -> Callable:
+    """ ClosureCompiler.compile_reducer_expression : 반환된 closure와 body closure가 실행될 때 기록
+    (profile 중에 compile한 함수는 profile이 끝난 뒤에도 현재 Profile을 확인하는 비용이 남음)
+    """
+    @wraps(func)
+    def wrapper(self, expr):
+        global ACTIVE_PROFILE
+        if (profile := ACTIVE_PROFILE.get()) is None:
+            return func(self, expr)
+        name = f"reducer.{expr.token.literal}"
+        profile.reducer_bodies[id(expr.body)] = f"{name}.iteration"
+        try:
+            return timed(name, func(self, expr))
+        finally:
+            profile.reducer_bodies.pop(id(expr.body), None)
+
+    return wrapper
+
+
+def instrument_compile_expression(func: Callable) -> Callable:
+    @wraps(func)
+    def wrapper(self, expr):
+        global ACTIVE_PROFILE
+        if (profile := ACTIVE_PROFILE.get()) is None or (name := profile.reducer_bodies.get(id(expr))) is None:
+            return func(self, expr)
+        return timed(name, func(self, expr))
+
+    return wrapper
+
+
+def instrument_compile_program(func: Callable) -> Callable:
+    @wraps(func)
+    def wrapper(self, program):
+        global ACTIVE_PROFILE
+        if (profile := ACTIVE_PROFILE.get()) is None:
+            return func(self, program)
+        begin = time.perf_counter()
+        try:
+            return timed("compiled.run", func(self, program))
+        finally:
+            profile.record("compiler.compile_program", time.perf_counter() - begin)
+
+    return wrapper
+
+
+def parser_classes() -> List[type]:
+    classes, stack = [], [Parser]
+    while stack:
+        cls = stack.pop()
+        classes.append(cls)
+        stack.extend(cls.__subclasses__())
+    return classes
+
+
+def instrumented_methods() -> Iterator[Tuple[type, str, Callable]]:
+    """ (class, method 이름, wrapper). class가 직접 정의한 method만 바꿈
+    """
+    global LEXER_CLASSES
+    for cls in LEXER_CLASSES:
+        for name in ("next_token", "tokenize"):
+            if name in vars(cls):
+                yield cls, name, instrument_lexer(vars(cls)[name])
+    for cls in parser_classes():
+        for name, func in list(vars(cls).items()):
+            if name == "parse_program":
+                yield cls, name, instrument_parse_program(func)
+            elif name.startswith("parse_") and callable(func):
+                yield cls, name, timed(f"parser.{name}", func)
+    yield Evaluator, "evaluate", timed("evaluator.evaluate", Evaluator.evaluate)
+    yield Evaluator, "eval_reducer_expression", instrument_eval_reducer(Evaluator.eval_reducer_expression)
+    yield Evaluator, "eval_expression", instrument_eval_expression(Evaluator.eval_expression)
+    yield ClosureCompiler, "compile_program", instrument_compile_program(ClosureCompiler.compile_program)
+    yield ClosureCompiler, "compile_reducer_expression", instrument_compile_reducer(
+        ClosureCompiler.compile_reducer_expression
+    )
+    yield ClosureCompiler, "compile_expression", instrument_compile_expression(ClosureCompiler.compile_expression)
+
+
+class Instrumentation:
+    """ 측정 wrapper 설치 / 제거. 여러 profile이 동시에 열려 있으면 마지막 profile이 끝날 때 제거
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = 0
+        self.originals: List[Tuple[type, str, Callable]] = []
+
+    def install(self):
+        with self.lock:
+            self.users += 1
+            if self.users > 1:
+                return
+            for cls, name, wrapper in list(instrumented_methods()):
+                self.originals.append((cls, name, vars(cls)[name]))
+                setattr(cls, name, wrapper)
+            self.register_parsers()
+
+    def uninstall(self):
+        with self.lock:
+            self.users -= 1
+            if self.users > 0:
+                return
+            for cls, name, original in reversed(self.originals):
+                setattr(cls, name, original)
+            self.originals = []
+            self.register_parsers()
+
+    @staticmethod
+    def register_parsers():
+        # class마다 만든 dispatch table을 바뀐 method로 다시 만듦
+        for cls in parser_classes():
+            cls.register_parse_fns()
+
+
+INSTRUMENTATION = Instrumentation()
+
+
+@contextmanager
+def profile() -> Iterator[Profile]:
+    """ with 블록 안에서 현재 context의 lexer / parser / 계산을 측정
+    """
+    global INSTRUMENTATION, ACTIVE_PROFILE
+    report = Profile()
+    INSTRUMENTATION.install()
+    token = ACTIVE_PROFILE.set(report)
+    try:
+        yield report
+    finally:
+        ACTIVE_PROFILE.reset(token)
+        INSTRUMENTATION.uninstall()
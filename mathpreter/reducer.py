@@ -0,0 +1,285 @@
+""" 합기호 / 곱기호의 빠른 계산 경로
+
+1. closed form
+    body가 반복 변수 k에 대한 다항식과 기하급수 항(c * r^k)의 합이면 반복 없이 계산
+    * \\sum k^p : Faulhaber 공식
+    * \\sum r^k : 등비급수 공식
+    * \\prod c, \\prod b^{p(k)} : c^n, b^{\\sum p(k)}
+
+2. vectorized
+    closed form이 없지만 배열 연산이 가능한 body는 `arange(start, end+1)`에 대한 NumPy reduction으로 계산
+"""
+import operator
+from fractions import Fraction
+from functools import lru_cache
+from math import comb
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from mathpreter.ast import (
+    Expression, Identifier, PrefixExpression, InfixExpression, free_identifiers
+)
+from mathpreter.errors import EvaluatorException
+
+# (k의 차수 p, 등비 r) -> 계수.  항 하나는 계수 * k^p * r^k 이며, p == 0 혹은 r == 1 만 허용
+Terms = Dict[Tuple[int, Any], Any]
+
+# environment를 받아 Terms를 계산. 값 때문에 closed form이 불가능하면 None
+terms_ftype = Callable[[Dict[str, Any]], Optional[Terms]]
+
+# 거듭제곱으로 전개할 다항식의 최대 차수
+MAX_POLYNOMIAL_DEGREE = 32
+
+# vectorized reduction에서 한번에 계산하는 구간 크기
+VECTORIZE_CHUNK_SIZE = 1 << 20
+
+# 반복 횟수가 이보다 많은 합기호 / 곱기호는 범위를 나누어 여러 process에서 계산 (mathpreter.parallel 참고)
+PARALLEL_THRESHOLD = 100_000
+
+
+@lru_cache(maxsize=None)
+def bernoulli(n: int) -> Fraction:
+    """ Bernoulli 수 B_n (B_1 = -1/2)
+    """
+    if n == 0:
+        return Fraction(1)
+    return -sum(comb(n + 1, j) * bernoulli(j) for j in range(n)) / (n + 1)
+
+
+@lru_cache(maxsize=None)
+def faulhaber_coefficients(p: int) -> Tuple[Fraction, ...]:
+    """ F_p(n) = 1^p + 2^p + ... + n^p 다항식의 계수 (n^0 부터 n^(p+1) 까지)
+    """
+    coefficients = [Fraction(0)] * (p + 2)
+    for j in range(p + 1):
+        coefficients[p + 1 - j] = (-1) ** j * comb(p + 1, j) * bernoulli(j) / (p + 1)
+    return tuple(coefficients)
+
+
+def faulhaber(p: int, n: int) -> int:
+    """ F_p(n) 을 정수로 정확하게 계산. 다항식 항등식 F_p(n) - F_p(n-1) = n^p 는 음수 n 에서도 성립
+    """
+    total = Fraction(0)
+    for coefficient in reversed(faulhaber_coefficients(p)):
+        total = total * n + coefficient
+    return int(total)
+
+
+def compile_terms(
+        body: Expression, name: str, compile_fn: Callable, power: Callable = operator.pow
+) -> Optional[terms_ftype]:
+    """ body를 k(name)에 대한 Terms로 전개하는 함수를 만듦
+
+    :param body: 합기호 / 곱기호의 body
+    :param name: 반복 변수 이름
+    :param compile_fn: k와 무관한 부분식을 environment -> 값 함수로 변환
+    :param power: numeric backend의 거듭제곱
+    :return: 구조상 전개가 불가능하면 None
+    """
+    if name not in free_identifiers(body):
+        invariant = compile_fn(body)
+        return lambda env: {(0, 1): invariant(env)}
+
+    if isinstance(body, Identifier):
+        return lambda env: {(1, 1): 1}
+
+    if isinstance(body, PrefixExpression):
+        if body.operator != "-" or (right := compile_terms(body.right, name, compile_fn, power)) is None:
+            return None
+        return lambda env: _scale(right(env), -1)
+
+    if not isinstance(body, InfixExpression):
+        return None
+
+    operator = body.operator
+    if operator in ("+", "-", "*"):
+        left = compile_terms(body.left, name, compile_fn, power)
+        right = compile_terms(body.right, name, compile_fn, power)
+        if left is None or right is None:
+            return None
+        if operator == "+":
+            return lambda env: _add(left(env), right(env))
+        elif operator == "-":
+            return lambda env: _add(left(env), right(env), -1)
+        return lambda env: _multiply(left(env), right(env))
+
+    if operator == "/" and name not in free_identifiers(body.right):
+        left = compile_terms(body.left, name, compile_fn, power)
+        divisor = compile_fn(body.right)
+        if left is None:
+            return None
+        return lambda env: _divide(left(env), divisor(env))
+
+    if operator == "^":
+        if name not in free_identifiers(body.left):
+            # b^(a1*k + a0) = b^a0 * (b^a1)^k
+            base = compile_fn(body.left)
+            exponent = compile_terms(body.right, name, compile_fn, power)
+            if exponent is None:
+                return None
+            return lambda env: _geometric(base(env), exponent(env), power)
+
+        if name not in free_identifiers(body.right):
+            left = compile_terms(body.left, name, compile_fn, power)
+            exponent = compile_fn(body.right)
+            if left is None:
+                return None
+            return lambda env: _power(left(env), exponent(env))
+
+    return None
+
+
+def _add(left: Optional[Terms], right: Optional[Terms], sign: int = 1) -> Optional[Terms]:
+    if left is None or right is None:
+        return None
+    terms = dict(left)
+    for key, coefficient in right.items():
+        terms[key] = terms[key] + sign * coefficient if key in terms else sign * coefficient
+    return terms
+
+
+def _scale(terms: Optional[Terms], factor) -> Optional[Terms]:
+    if terms is None:
+        return None
+    return {key: coefficient * factor for key, coefficient in terms.items()}
+
+
+def _multiply(left: Optional[Terms], right: Optional[Terms]) -> Optional[Terms]:
+    if left is None or right is None:
+        return None
+    terms = {}
+    for (p1, r1), c1 in left.items():
+        for (p2, r2), c2 in right.items():
+            p, r = p1 + p2, r1 * r2
+            if p and r != 1:
+                # k^p * r^k 꼴은 closed form을 지원하지 않음
+                return None
+            terms[(p, r)] = terms[(p, r)] + c1 * c2 if (p, r) in terms else c1 * c2
+    return terms
+
+
+def _divide(terms: Optional[Terms], divisor) -> Optional[Terms]:
+    if terms is None or divisor == 0:
+        return None
+    return {key: coefficient / divisor for key, coefficient in terms.items()}
+
+
+def _power(terms: Optional[Terms], exponent) -> Optional[Terms]:
+    global MAX_POLYNOMIAL_DEGREE
+    if terms is None or exponent != int(exponent) or not 0 <= exponent <= MAX_POLYNOMIAL_DEGREE:
+        return None
+    result = {(0, 1): 1}
+    for _ in range(int(exponent)):
+        if (result := _multiply(result, terms)) is None:
+            return None
+    return result
+
+
+def _geometric(base, exponent: Optional[Terms], power: Callable) -> Optional[Terms]:
+    if exponent is None or base == 0 or not set(exponent) <= {(0, 1), (1, 1)}:
+        return None
+    scale, ratio = exponent.get((0, 1), 0), exponent.get((1, 1), 0)
+    if ratio != int(ratio):
+        return None
+    return {(0, base ** int(ratio)): power(base, scale) if scale else 1}
+
+
+def sum_terms(terms: Terms, start: int, end: int, identity, power: Callable = operator.pow):
+    """ \\sum_{k=start}^{end} terms(k) 를 closed form으로 계산
+    """
+    result = identity
+    if end < start:
+        return result
+    for (p, r), coefficient in terms.items():
+        if r == 1:
+            result += coefficient * (faulhaber(p, end) - faulhaber(p, start - 1))
+        else:
+            result += coefficient * (power(r, end + 1) - power(r, start)) / (r - 1)
+    return result
+
+
+def closed_form_sum(
+        terms_fn: terms_ftype, env: Dict[str, Any], start: int, end: int, identity, power: Callable = operator.pow
+):
+    """ closed form 합. 값 때문에 불가능하면 None
+    범위가 비어 있으면 body를 계산하지 않음 (반복해서 계산할 때와 같이 정의되지 않은 변수, 0으로 나누기도 항등원)
+    """
+    if end < start:
+        return identity
+    if (terms := terms_fn(env)) is None:
+        return None
+    return sum_terms(terms, start, end, identity, power)
+
+
+def compile_closed_form_product(
+        body: Expression, name: str, compile_fn: Callable, power: Callable = operator.pow
+) -> Optional[Callable]:
+    """ \\prod_{k=start}^{end} body 의 closed form 함수를 만듦
+
+    * body가 k와 무관한 c 이면 c^n
+    * body가 b^{p(k)} 이고 b가 k와 무관하면 b^{\\sum p(k)}
+
+    :return: (env, start, end, identity) -> 값 혹은 None
+    """
+    if name not in free_identifiers(body):
+        invariant = compile_fn(body)
+
+        def constant_product(env, start, end, identity):
+            if end < start:
+                return identity
+            return identity * power(invariant(env), end - start + 1)
+
+        return constant_product
+
+    if (
+            isinstance(body, InfixExpression)
+            and body.operator == "^"
+            and name not in free_identifiers(body.left)
+            and (exponent := compile_terms(body.right, name, compile_fn, power)) is not None
+    ):
+        base = compile_fn(body.left)
+
+        def power_product(env, start, end, identity):
+            if end < start:
+                return identity
+            terms = exponent(env)
+            if terms is None or any(r != 1 for _, r in terms):
+                return None
+            value = base(env)
+            if value == 0:
+                # 0^p(k) 는 p(k) <= 0 인 항에서 실패하므로 반복해서 계산
+                return None
+            return identity * power(value, sum_terms(terms, start, end, 0))
+
+        return power_product
+
+    return None
+
+
+def vectorized_reduce(reducer: str, body_fn: Callable, name: str, env: Dict[str, Any], start: int, end: int) -> Optional[float]:
+    """ body를 arange(start, end+1)에 대해 NumPy 배열 연산으로 계산한 뒤 reduction
+
+    :param body_fn: vectorize_expression으로 변환된 body
+    :return: float 결과
+    """
+    global VECTORIZE_CHUNK_SIZE
+    import numpy as np
+
+    arrays = {key: np.float64(value) for key, value in env.items()}
+    is_sum = reducer == "\\sum"
+    result = 0.0 if is_sum else 1.0
+    for first in range(start, end + 1, VECTORIZE_CHUNK_SIZE):
+        last = min(first + VECTORIZE_CHUNK_SIZE, end + 1)
+        arrays[name] = np.arange(first, last, dtype=np.float64)
+        values = np.broadcast_to(body_fn(arrays), (last - first,))
+        result = result + float(np.sum(values)) if is_sum else result * float(np.prod(values))
+    return result
+
+
+def vectorize_body(body: Expression) -> Optional[Callable]:
+    """ body를 배열 연산 closure로 변환. numpy가 없거나 변환할 수 없으면 None
+    """
+    try:
+        from mathpreter.vectorize import vectorize_expression
+        return vectorize_expression(body)
+    except EvaluatorException:
+        return None
@@ -0,0 +1,65 @@
+""" 변수 이름 -> slot 결정
+
+compile할 때 `let` 이름, 자유 변수, 합기호 / 곱기호의 반복 변수마다 고정된 정수 slot을 할당
+실행할 때는 dict 대신 slot 개수만큼 미리 할당한 리스트(frame)에서 값을 읽음
+"""
+from typing import Dict, List
+
+
+class Resolver:
+    """ scope 단위로 이름을 slot에 대응
+    * 최상위 scope : `let` 이름과 자유 변수. bindings로 값을 받음
+    * 합기호 / 곱기호마다 반복 변수 하나짜리 scope를 추가. 바깥의 같은 이름을 가림
+    """
+    slot_names: List[str]  # slot -> 이름 (에러 메시지 용)
+    scopes: List[Dict[str, int]]  # 이름 -> slot
+
+    def __init__(self):
+        self.slot_names = []
+        self.scopes = [{}]
+
+    @property
+    def frame_size(self) -> int:
+        return len(self.slot_names)
+
+    @property
+    def inputs(self) -> Dict[str, int]:
+        """ bindings로 값을 받을 수 있는 이름 -> slot
+        """
+        return dict(self.scopes[0])
+
+    def new_slot(self, name: str) -> int:
+        """ 이름으로 찾을 수 없는 slot (합기호의 counter 등)
+        """
+        self.slot_names.append(name)
+        return len(self.slot_names) - 1
+
+    def resolve(self, name: str) -> int:
+        """ 안쪽 scope부터 이름을 찾음. 없으면 최상위 scope의 slot을 새로 만듦 (자유 변수 혹은 let)
+        """
+        for scope in reversed(self.scopes):
+            if (slot := scope.get(name)) is not None:
+                return slot
+        slot = self.scopes[0][name] = self.new_slot(name)
+        return slot
+
+    def visible(self) -> Dict[str, int]:
+        """ 현재 위치에서 보이는 이름 -> slot
+        """
+        names = {}
+        for scope in self.scopes:
+            names.update(scope)
+        return names
+
+    def enter(self, name: str) -> int:
+        """ 반복 변수의 scope를 추가하고 그 slot을 반환
+        """
+        slot = self.new_slot(name)
+        self.scopes.append({name: slot})
+        return slot
+
+    def leave(self):
+        self.scopes.pop()
+
+    def new_frame(self) -> list:
+        return [None] * len(self.slot_names)
@@ -0,0 +1,244 @@
+""" asyncio 기반 수식 계산 server
+
+TCP 혹은 Unix socket으로 JSON lines 요청을 받아 수식을 파싱 / 계산한 결과를 반환
+
+    요청 : {"id": 1, "formula": "let y = x^2; y + 1", "bindings": {"x": 3}, "backend": "decimal"}
+    응답 : {"id": 1, "result": "10"}
+           {"id": 1, "error": {"type": "EvaluatorException", "message": "..."}}
+
+* 계산은 크기가 제한된 thread pool에서 수행하며, 처리 중인 요청이 queue_depth개이면 socket을 더 읽지 않음 (backpressure)
+* 요청마다 timeout이 지나거나 연결이 끊기면, 반복 중인 합기호 / 곱기호를 취소
+* limits를 주면 요청마다 반복 횟수 / 자릿수 / AST 깊이를 제한 (mathpreter.limits 참고)
+* 응답은 완료된 순서로 보내므로, 한 연결에서 여러 요청을 보낼 때는 id로 구분
+* 잘못된 요청은 RequestError, 예상하지 못한 에러(RecursionError 등)는 InternalError로 응답. id를 읽을 수 있으면 유지
+
+    python -m mathpreter.server --port 8765
+    python -m mathpreter.server --unix /tmp/mathpreter.sock
+"""
+import argparse
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set, Union
+
+from mathpreter.cache import parse
+from mathpreter.errors import (
+    LexerException, ParserException, EvaluatorException, CancelledException, LimitExceededException
+)
+from mathpreter.evaluator import Evaluator
+from mathpreter.limits import EvaluationLimits
+from mathpreter.numeric import NumericBackend, get_backend
+
+# 동시에 계산하는 요청 수
+DEFAULT_WORKERS = 4
+
+# 계산 중이거나 계산을 기다리는 요청의 최대 개수
+DEFAULT_QUEUE_DEPTH = 64
+
+# 요청 하나의 최대 계산 시간 (초)
+DEFAULT_TIMEOUT = 10.0
+
+# 요청 한 줄의 최대 크기 (byte)
+MAX_REQUEST_SIZE = 1 << 20
+
+
+class EvaluationServer:
+    """ JSON lines 수식 계산 server
+    """
+    backend: NumericBackend  # 요청에 backend가 없을 때의 수 표현
+    timeout: Optional[float]
+    limits: Optional[EvaluationLimits]  # 요청 하나의 자원 제한
+    queue_depth: int
+
+    def __init__(
+            self,
+            workers: int = DEFAULT_WORKERS,
+            queue_depth: int = DEFAULT_QUEUE_DEPTH,
+            timeout: Optional[float] = DEFAULT_TIMEOUT,
+            backend: Union[str, NumericBackend, None] = None,
+            limits: Optional[EvaluationLimits] = None
+    ):
+        if queue_depth < workers:
+            raise ValueError(f"queue_depth should be at least workers. (as-is : {queue_depth} < {workers})")
+        self.backend = get_backend(backend)
+        self.timeout = timeout
+        self.limits = limits
+        self.queue_depth = queue_depth
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mathpreter")
+        self.slots: Optional[asyncio.Semaphore] = None
+        self.servers = []
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+        """ port가 0이면 비어 있는 port를 사용 (server.sockets[0].getsockname() 참고)
+        """
+        global MAX_REQUEST_SIZE
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_REQUEST_SIZE)
+        self.servers.append(server)
+        return server
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        global MAX_REQUEST_SIZE
+        server = await asyncio.start_unix_server(self.handle_connection, path, limit=MAX_REQUEST_SIZE)
+        self.servers.append(server)
+        return server
+
+    async def close(self):
+        for server in self.servers:
+            server.close()
+            await server.wait_closed()
+        self.servers = []
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if self.slots is None:
+            self.slots = asyncio.Semaphore(self.queue_depth)
+        write_lock = asyncio.Lock()
+        pending: Set[asyncio.Task] = set()
+        cancel_events: Set[threading.Event] = set()
+
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                # 처리 중인 요청이 가득 차면 다음 요청을 읽지 않고 기다림
+                await self.slots.acquire()
+                cancel_event = threading.Event()
+                cancel_events.add(cancel_event)
+                task = asyncio.create_task(self.respond(line, cancel_event, writer, write_lock))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+                task.add_done_callback(lambda _, event=cancel_event: cancel_events.discard(event))
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            # 연결이 끊기면 남은 계산을 취소
+            for event in cancel_events:
+                event.set()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def respond(
+            self, line: bytes, cancel_event: threading.Event, writer: asyncio.StreamWriter, write_lock: asyncio.Lock
+    ):
+        """ 요청 한 줄을 계산하고 응답을 보냄. slot은 worker의 계산이 실제로 끝날 때 반환
+        어떤 에러가 나도 요청마다 응답 한 줄을 보냄
+        """
+        released = False
+        response = {"id": None}
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict) or not isinstance(request.get("formula"), str):
+                raise ValueError("request should be an object with `formula`.")
+            response["id"] = request.get("id")
+            bindings, backend = request.get("bindings"), request.get("backend")
+            if bindings is not None and not isinstance(bindings, dict):
+                raise ValueError("`bindings` should be an object.")
+            if backend is not None and not isinstance(backend, str):
+                raise ValueError("`backend` should be a string.")
+            backend = self.backend if backend is None else get_backend(backend)
+
+            loop = asyncio.get_running_loop()
+            started = asyncio.Event()
+            future = loop.run_in_executor(
+                self.executor, self.evaluate, request["formula"], bindings, backend,
+                cancel_event, lambda: loop.call_soon_threadsafe(started.set)
+            )
+            future.add_done_callback(lambda _: self.slots.release())
+            released = True
+            try:
+                # timeout은 worker가 계산을 시작한 시점부터
+                waiter = asyncio.ensure_future(started.wait())
+                await asyncio.wait({waiter, future}, return_when=asyncio.FIRST_COMPLETED)
+                waiter.cancel()
+                value = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+                response["result"] = None if value is None else str(value)
+            except asyncio.TimeoutError:
+                cancel_event.set()
+                response["error"] = {"type": "TimeoutError", "message": f"evaluation timed out after {self.timeout}s"}
+            except (
+                    LexerException, ParserException, EvaluatorException, CancelledException, LimitExceededException,
+                    ArithmeticError
+            ) as e:
+                response["error"] = {"type": type(e).__name__, "message": str(e)}
+        except ValueError as e:
+            # 계산 전에 요청을 검사하다 발생
+            response["error"] = {"type": "RequestError", "message": str(e)}
+        except Exception as e:
+            # 예상하지 못한 에러(RecursionError 등)도 응답하지 않으면 client가 계속 기다림
+            response["error"] = {"type": "InternalError", "message": f"{type(e).__name__}: {e}"}
+        finally:
+            if not released:
+                self.slots.release()
+
+        async with write_lock:
+            writer.write(json.dumps(response).encode("utf-8") + b"\n")
+            await writer.drain()
+
+    def evaluate(
+            self,
+            formula: str,
+            bindings: Optional[Dict[str, Any]],
+            backend: NumericBackend,
+            cancel_event: threading.Event,
+            on_start: Callable[[], Any]
+    ):
+        """ worker thread에서 실행
+        """
+        on_start()
+        if cancel_event.is_set():
+            # 기다리는 동안 연결이 끊김
+            raise CancelledException("evaluation is cancelled.")
+        program = parse(formula, backend)
+        return Evaluator(backend=backend, cancel_event=cancel_event, limits=self.limits).evaluate(program, bindings)
+
+
+async def serve(
+        host: str = "127.0.0.1",
+        port: Optional[int] = None,
+        path: Optional[str] = None,
+        **options
+):
+    """ TCP(host, port) 혹은 Unix socket(path)으로 요청을 계속 받음
+
+    :param options: EvaluationServer 참고
+    """
+    server = EvaluationServer(**options)
+    listener = await (server.start_unix(path) if path is not None else server.start_tcp(host, port or 0))
+    try:
+        await listener.serve_forever()
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="mathpreter evaluation server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="Unix socket path (TCP 대신 사용)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--queue-depth", type=int, default=DEFAULT_QUEUE_DEPTH)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    parser.add_argument("--backend", default=None)
+    parser.add_argument("--max-iterations", type=int, default=None)
+    parser.add_argument("--max-digits", type=int, default=None)
+    parser.add_argument("--max-depth", type=int, default=None)
+    args = parser.parse_args()
+    limits = None
+    if args.max_iterations is not None or args.max_digits is not None or args.max_depth is not None:
+        limits = EvaluationLimits(args.max_iterations, args.max_digits, args.max_depth)
+
+    asyncio.run(serve(
+        args.host, args.port, args.unix,
+        workers=args.workers, queue_depth=args.queue_depth, timeout=args.timeout, backend=args.backend,
+        limits=limits
+    ))
+
+
+if __name__ == "__main__":
+    main()
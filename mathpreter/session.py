@@ -0,0 +1,107 @@
+""" bindings만 바뀌는 Program의 증분 계산
+
+같은 Program을 입력 값만 바꿔 반복해서 계산할 때(e.g. dashboard 갱신), 바뀐 변수에 의존하는 구문만 다시 계산하고 나머지 구문은 이전 값을 재사용
+let을 다시 계산했는데 값이 같으면 그 let에 의존하는 구문은 다시 계산하지 않음
+
+    session = EvaluationSession(Parser(Lexer("let a = x^2; let b = \\sum_{k=1}^{n}{k}; a + b")).parse_program())
+    session.evaluate({"x": 2, "n": 100})  # 모든 구문 계산
+    session.evaluate({"x": 3, "n": 100})  # `let a`, `a + b` 만 다시 계산
+"""
+from typing import Any, Dict, FrozenSet, List, Optional, Set
+
+from mathpreter.ast import Program, LetStatement, ExpressionStatement, free_identifiers
+from mathpreter.errors import EvaluatorException
+from mathpreter.evaluator import Environment, Evaluator, Number
+from mathpreter.limits import NO_LIMITS, LimitGuard
+
+
+def same_value(left: Number, right: Number) -> bool:
+    """ 다시 계산하지 않아도 되는 값인지. Decimal("1.0")과 Decimal("1"), 0.0과 -0.0은 다른 값으로 봄
+    """
+    return type(left) is type(right) and repr(left) == repr(right)
+
+
+class EvaluationSession:
+    """ Program 1개의 구문별 의존 관계와 마지막으로 계산한 값
+    """
+    program: Program
+    evaluator: Evaluator
+    reads: List[FrozenSet[str]]  # 구문 -> 구문이 읽는 변수 이름 (bindings 혹은 앞선 let)
+    values: List[Optional[Number]]  # 구문 -> 마지막으로 계산한 값 (let은 대입한 값)
+    bindings: Optional[Environment]  # 마지막 계산의 입력. None이면 다음 계산에서 모든 구문을 계산
+    variables: Environment  # 마지막 계산이 끝났을 때의 변수 (bindings와 let)
+    recomputed: List[int]  # 마지막 계산에서 다시 계산한 구문의 index
+
+    def __init__(self, program: Program, evaluator: Optional[Evaluator] = None):
+        for stmt in program.statements:
+            if not isinstance(stmt, (LetStatement, ExpressionStatement)):
+                raise EvaluatorException(f"unsupported statement. (as-is : {type(stmt).__name__})")
+        self.program = program
+        self.evaluator = Evaluator() if evaluator is None else evaluator
+        if self.evaluator.limits is not None:
+            self.evaluator.limits.check_depth(program)
+
+        self.reads = [frozenset(free_identifiers(stmt)) for stmt in program.statements]
+        self.values = [None] * len(program.statements)
+        self.bindings = None
+        self.variables = {}
+        self.recomputed = []
+
+    def changed_bindings(self, bindings: Environment) -> Optional[Set[str]]:
+        """ 마지막 계산과 값이 다른 입력 변수 이름. 처음 계산이면 None
+        """
+        if self.bindings is None:
+            return None
+        previous = self.bindings
+        return {
+            name for name in bindings.keys() | previous.keys()
+            if name not in bindings or name not in previous or not same_value(bindings[name], previous[name])
+        }
+
+    def evaluate(self, bindings: Optional[Dict[str, Any]] = None) -> Optional[Number]:
+        """ 바뀐 입력에 의존하는 구문만 다시 계산
+
+        :param bindings: 자유 변수의 값
+        :return: 마지막 구문이 표현식이면 그 값, 아니면 None (Evaluator.evaluate와 같음)
+        """
+        evaluator = self.evaluator
+        if evaluator.limits is not None or evaluator.cancel_event is not None:
+            evaluator.guard = LimitGuard(evaluator.limits or NO_LIMITS, evaluator.cancel_event)
+
+        inputs = evaluator.environment(bindings)
+        changed = self.changed_bindings(inputs)
+        env = dict(inputs)
+        values = self.values
+        recomputed = []
+        try:
+            with evaluator.backend.context():
+                for index, stmt in enumerate(self.program.statements):
+                    dirty = changed is None or not self.reads[index].isdisjoint(changed)
+                    expr = stmt.value if isinstance(stmt, LetStatement) else stmt.expression
+                    if dirty:
+                        value = evaluator.eval_expression(expr, env)
+                        recomputed.append(index)
+                    else:
+                        value = values[index]
+
+                    if isinstance(stmt, LetStatement):
+                        name = stmt.name.value
+                        if changed is not None:
+                            # 이후 구문이 읽는 name의 값이 이전 계산과 다른지
+                            if dirty and not same_value(value, values[index]):
+                                changed.add(name)
+                            else:
+                                changed.discard(name)
+                        env[name] = value
+                    values[index] = value
+        except BaseException:
+            # 일부 구문만 갱신되었으므로 다음 계산은 처음부터
+            self.bindings = None
+            raise
+
+        self.bindings = inputs
+        self.variables = env
+        self.recomputed = recomputed
+        if values and isinstance(self.program.statements[-1], ExpressionStatement):
+            return values[-1]
+        return None
@@ -0,0 +1,53 @@
+""" 파일 / iterator 단위의 streaming 파싱
+
+여러 수식이 `;` 로 이어진 큰 입력을 문자열 하나로 읽지 않고, chunk 단위로 읽으며 구문을 하나씩 반환
+"""
+import os
+from typing import IO, Iterable, Iterator, Union
+
+from mathpreter.ast import Statement
+from mathpreter.lexer import StreamLexer
+from mathpreter.numeric import NumericBackend
+from mathpreter.parser import Parser
+
+# 파일에서 한번에 읽는 문자 수
+STREAM_CHUNK_SIZE = 1 << 16
+
+# 파일 경로, 텍스트 파일 객체, 문자열(줄) iterator
+Source = Union[str, os.PathLike, IO[str], Iterable[str]]
+
+
+def iter_chunks(source: Source, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+    """ source를 문자열 chunk 단위로 읽음
+
+    :param source: 파일 경로(str, PathLike), `read()`가 있는 텍스트 파일 객체, 문자열 iterator(e.g. 줄 단위)
+    :param chunk_size: 파일에서 한번에 읽는 문자 수
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8") as file:
+            yield from iter_chunks(file, chunk_size)
+    elif hasattr(source, "read"):
+        while chunk := source.read(chunk_size):
+            yield chunk
+    else:
+        yield from source
+
+
+def parse_stream(
+        source: Source,
+        backend: Union[str, NumericBackend, None] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE
+) -> Iterator[Statement]:
+    """ source의 구문을 `;` 단위로 파싱하며 하나씩 반환
+
+    :param source: iter_chunks 참고
+    :param backend: NumberLiteral의 수 표현
+    :param chunk_size: 파일에서 한번에 읽는 문자 수
+    :return: Statement iterator
+    """
+    chunks = iter_chunks(source, chunk_size)
+    try:
+        yield from Parser(StreamLexer(chunks), backend=backend).iter_statements()
+    finally:
+        # 중간에 멈추면 열어 둔 파일을 닫음
+        chunks.close()
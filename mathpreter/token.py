@@ -1,6 +1,6 @@
 import math
 from enum import Enum
-from typing import Iterable, Union
+from typing import Dict, Iterable, Tuple
 
 from mathpreter.utils import is_numeric
 
@@ -83,17 +83,15 @@ class TokenType(Enum):
     def reserved_words(cls) -> Iterable["TokenType"]:
         return (TokenType.LET,)
 
-    def __hash__(self):
-        return hash(self.value)
-
-    def __eq__(self, other: Union["TokenType", str]):
-        if isinstance(other, str):
-            return self.value == other
-        return super().__eq__(other)
+    # 멤버는 하나씩만 존재하므로 identity로 비교하고 hash (dispatch table 조회 시 Python 함수를 호출하지 않음)
+    # 문자열과는 같지 않음 (`TokenType.PLUS != "+"`). 문자열은 TokenType("+")로 변환해서 비교
+    __hash__ = object.__hash__
 
 
 class Token:
     """Lexical Analysis를 통해, 수식 텍스트를 토큰 열로 변환"""
+    __slots__ = ("type", "literal")
+
     type: TokenType
     literal: str
 
@@ -103,39 +101,22 @@ class Token:
         token.type = TokenType.ILLEGAL
         return token
 
+    @staticmethod
+    def number(literal: str):
+        """ 계산된 값(음수, 지수 표기 포함)의 NUMBER 토큰 """
+        token = Token('')
+        token.type = TokenType.NUMBER
+        token.literal = literal
+        return token
+
     def __init__(self, word: str):
-        global CONSTANTS
+        global TOKEN_TABLE
         word = word.strip()
 
-        if not word:
-            self.type = TokenType.EOF
-            self.literal = ""
+        if entry := TOKEN_TABLE.get(word):
+            self.type, self.literal = entry
             return
 
-        for symbol in TokenType.symbols():
-            if word == symbol:
-                self.type = symbol
-                self.literal = word
-                return
-
-        for token in TokenType.latex_syntax():
-            if word == token:
-                self.type = TokenType.TEX_REDUCE_OP
-                self.literal = word
-                return
-
-        for k, v in CONSTANTS.items():
-            if word == k:
-                self.type = TokenType.NUMBER
-                self.literal = v
-                return
-
-        for token in TokenType.reserved_words():
-            if word == token:
-                self.type = token
-                self.literal = word
-                return
-
         if is_numeric(word):
             self.type = TokenType.NUMBER
             self.literal = word
@@ -148,3 +129,76 @@ class Token:
         else:
             self.type = TokenType.ILLEGAL
             self.literal = word
+
+
+def build_token_table() -> Dict[str, Tuple[TokenType, str]]:
+    """ literal -> (TokenType, literal) 조회 테이블
+
+    symbols, latex syntax, constants, reserved words, EOF를 한번에 조회하도록 미리 계산
+    :return:
+    """
+    table = {"": (TokenType.EOF, "")}
+    for symbol in TokenType.symbols():
+        table[symbol.value] = (symbol, symbol.value)
+    for word in TokenType.latex_syntax():
+        table[word] = (TokenType.TEX_REDUCE_OP, word)
+    for k, v in CONSTANTS.items():
+        table[k] = (TokenType.NUMBER, v)
+    for token in TokenType.reserved_words():
+        table[token.value] = (token, token.value)
+    return table
+
+
+TOKEN_TABLE = build_token_table()
+
+# 한 글자로 이루어진 기호들 (lexer에서 사용)
+SYMBOL_CHARS = frozenset(symbol.value for symbol in TokenType.symbols())
+
+
+class BufferToken(Token):
+    """ buffer(bytes, mmap, memoryview)의 [start, end) 구간을 가리키는 토큰
+    유형은 lexer가 결정하고, literal은 읽을 때 처음 한번만 str로 decode
+    """
+    __slots__ = ("buffer", "start", "end", "text")
+
+    def __init__(self, token_type: TokenType, buffer, start: int, end: int):
+        self.type = token_type
+        self.buffer = buffer
+        self.start = start
+        self.end = end
+        self.text = None
+
+    @property
+    def literal(self) -> str:
+        if self.text is None:
+            self.text = str(self.buffer[self.start: self.end], "utf-8")
+        return self.text
+
+
+class SpanToken(Token):
+    """ 수식 텍스트의 [start, end) 구간을 함께 가지는 토큰
+    EOF 토큰은 텍스트 끝의 빈 구간
+    """
+    __slots__ = ("start", "end")
+
+    start: int
+    end: int
+
+    def __init__(self, word: str, start: int, end: int):
+        super().__init__(word)
+        self.start = start
+        self.end = end
+
+    @staticmethod
+    def spanned(token: Token, start: int, end: int) -> "SpanToken":
+        span_token = SpanToken.__new__(SpanToken)
+        span_token.type = token.type
+        span_token.literal = token.literal
+        span_token.start = start
+        span_token.end = end
+        return span_token
+
+    def shifted(self, shift: int) -> "SpanToken":
+        """ 구간을 shift만큼 옮긴 토큰
+        """
+        return SpanToken.spanned(self, self.start + shift, self.end + shift)
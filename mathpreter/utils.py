@@ -1,8 +1,12 @@
+import re
+
+NUMERIC_PATTERN = re.compile(r'([0-9]*[.])?[0-9]+$')
+
+
 def is_numeric(text: str):
     """ whether text is numeric text (both integer and float)
 
     :param text:
     :return:
     """
-    import re
-    return bool(re.match(r'([0-9]*[.])?[0-9]+$', text))
+    return bool(NUMERIC_PATTERN.match(text))
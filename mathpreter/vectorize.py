@@ -0,0 +1,104 @@
+""" NumPy 배열 단위 계산
+
+자유 변수(Identifier)에 배열을 전달하면, 행 단위 반복 없이 전체 배열 연산으로 결과 배열을 계산
+numpy가 설치되어 있어야 함 (`pip install mathpreter[vectorize]`)
+"""
+from typing import Any, Callable, Dict, Optional
+
+from mathpreter.ast import (
+    Expression, Program,
+    LetStatement, ExpressionStatement, Identifier,
+    PrefixExpression, NumberLiteral, InfixExpression
+)
+from mathpreter.errors import EvaluatorException
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# 변수 이름 -> 배열
+ArrayEnvironment = Dict[str, Any]
+
+# 벡터화된 표현식 : 배열 environment를 받아 배열을 반환
+vectorized_ftype = Callable[[ArrayEnvironment], Any]
+
+
+def require_numpy():
+    if np is None:
+        raise EvaluatorException("numpy is required for vectorized evaluation. (`pip install numpy`)")
+
+
+def vectorize_expression(expr: Expression) -> vectorized_ftype:
+    """ 표현식을 배열 연산 closure로 변환
+    배열 연산으로 표현할 수 없는 node(합기호, 조합론 등)는 EvaluatorException
+    """
+    require_numpy()
+
+    if isinstance(expr, NumberLiteral):
+        value = np.float64(expr.value)
+        return lambda env: value
+
+    elif isinstance(expr, Identifier):
+        name = expr.value
+
+        def identifier(env: ArrayEnvironment):
+            try:
+                return env[name]
+            except KeyError:
+                raise EvaluatorException(f"identifier is not defined. (as-is : {name})") from None
+
+        return identifier
+
+    elif isinstance(expr, InfixExpression):
+        # `%`는 Decimal과 같이 피제수의 부호를 따름 (np.fmod)
+        ufuncs = {"+": np.add, "-": np.subtract, "*": np.multiply, "/": np.divide, "%": np.fmod, "^": np.power}
+        if (ufunc := ufuncs.get(expr.operator)) is None:
+            raise EvaluatorException(f"unsupported infix operator. (as-is : {expr.operator})")
+        left = vectorize_expression(expr.left)
+        right = vectorize_expression(expr.right)
+        return lambda env: ufunc(left(env), right(env))
+
+    elif isinstance(expr, PrefixExpression):
+        if expr.operator != "-":
+            raise EvaluatorException(f"unsupported prefix operator. (as-is : {expr.operator})")
+        right = vectorize_expression(expr.right)
+        return lambda env: np.negative(right(env))
+
+    raise EvaluatorException(f"{type(expr).__name__} cannot be vectorized. (as-is : {expr})")
+
+
+def vectorize_program(program: Program) -> Callable[[Optional[Dict[str, Any]]], Any]:
+    """ Program을 배열 연산 함수로 변환
+
+    :param program: 파싱된 Program
+    :return: 변수 이름 -> 배열(혹은 scalar) bindings를 받아 마지막 표현식의 결과 배열을 반환하는 함수
+    """
+    require_numpy()
+
+    steps = []
+    for stmt in program.statements:
+        if isinstance(stmt, LetStatement):
+            steps.append((stmt.name.value, vectorize_expression(stmt.value)))
+        elif isinstance(stmt, ExpressionStatement):
+            steps.append((None, vectorize_expression(stmt.expression)))
+        else:
+            raise EvaluatorException(f"{type(stmt).__name__} cannot be vectorized.")
+
+    def run(bindings: Optional[Dict[str, Any]] = None):
+        env = {name: np.asarray(value, dtype=np.float64) for name, value in bindings.items()} if bindings else {}
+        result = None
+        for name, func in steps:
+            if name is None:
+                result = func(env)
+            else:
+                env[name] = func(env)
+        return result
+
+    return run
+
+
+def evaluate_vectorized(program: Program, bindings: Optional[Dict[str, Any]] = None):
+    """ Program을 배열 bindings에 대해 한번에 계산
+    """
+    return vectorize_program(program)(bindings)
@@ -0,0 +1,155 @@
+""" stack 기반 virtual machine
+
+Bytecode의 평탄한 명령어 리스트를 하나의 루프에서 실행
+stack과 변수 frame은 미리 할당하며, opcode는 정수 비교로 분기
+"""
+from typing import Any, Dict, Optional
+
+from mathpreter.code import Opcode, COMBINATORICS_KINDS, INTEGER_OPERANDS
+from mathpreter.combinatorics import evaluate_combinatorics
+from mathpreter.compiler import Bytecode
+from mathpreter.errors import EvaluatorException
+from mathpreter.evaluator import to_integer
+
+CONSTANT = int(Opcode.CONSTANT)
+LOAD = int(Opcode.LOAD)
+STORE = int(Opcode.STORE)
+ADD = int(Opcode.ADD)
+SUB = int(Opcode.SUB)
+MUL = int(Opcode.MUL)
+DIV = int(Opcode.DIV)
+MOD = int(Opcode.MOD)
+POW = int(Opcode.POW)
+NEG = int(Opcode.NEG)
+COMBINATORICS = int(Opcode.COMBINATORICS)
+STORE_INT = int(Opcode.STORE_INT)
+LOOP = int(Opcode.LOOP)
+ACCUMULATE_ADD = int(Opcode.ACCUMULATE_ADD)
+ACCUMULATE_MUL = int(Opcode.ACCUMULATE_MUL)
+JUMP = int(Opcode.JUMP)
+RESULT = int(Opcode.RESULT)
+
+
+class VM:
+    """ Bytecode 실행기
+    stack을 재사용하므로 VM 하나를 여러 thread에서 동시에 실행하면 안 됨
+    """
+    bytecode: Bytecode
+    stack: list
+
+    def __init__(self, bytecode: Bytecode):
+        self.bytecode = bytecode
+        self.stack = [None] * max(bytecode.max_stack, 1)
+
+    def run(self, bindings: Optional[Dict[str, Any]] = None):
+        """ bindings로 자유 변수를 채우고 실행
+
+        :return: 마지막 ExpressionStatement의 값
+        """
+        bytecode = self.bytecode
+        backend = bytecode.backend
+        frame = [None] * len(bytecode.slot_names)
+        if bindings:
+            convert = backend.convert
+            for name, value in bindings.items():
+                if (slot := bytecode.inputs.get(name)) is not None:
+                    frame[slot] = convert(value)
+
+        with backend.context():
+            return self.execute(frame)
+
+    def execute(self, frame: list):
+        code = self.bytecode.instructions
+        constants = self.bytecode.constants
+        backend = self.bytecode.backend
+        power, modulo, from_int = backend.power, backend.modulo, backend.from_int
+        stack = self.stack
+        sp = 0
+        ip = 0
+        size = len(code)
+        result = None
+
+        while ip < size:
+            op = code[ip]
+            if op == LOAD:
+                value = frame[code[ip + 1]]
+                if value is None:
+                    raise EvaluatorException(
+                        f"identifier is not defined. (as-is : {self.bytecode.slot_names[code[ip + 1]]})"
+                    )
+                stack[sp] = value
+                sp += 1
+                ip += 2
+            elif op == CONSTANT:
+                stack[sp] = constants[code[ip + 1]]
+                sp += 1
+                ip += 2
+            elif op == ADD:
+                sp -= 1
+                stack[sp - 1] = stack[sp - 1] + stack[sp]
+                ip += 1
+            elif op == MUL:
+                sp -= 1
+                stack[sp - 1] = stack[sp - 1] * stack[sp]
+                ip += 1
+            elif op == SUB:
+                sp -= 1
+                stack[sp - 1] = stack[sp - 1] - stack[sp]
+                ip += 1
+            elif op == DIV:
+                sp -= 1
+                stack[sp - 1] = stack[sp - 1] / stack[sp]
+                ip += 1
+            elif op == POW:
+                sp -= 1
+                stack[sp - 1] = power(stack[sp - 1], stack[sp])
+                ip += 1
+            elif op == MOD:
+                sp -= 1
+                stack[sp - 1] = modulo(stack[sp - 1], stack[sp])
+                ip += 1
+            elif op == NEG:
+                stack[sp - 1] = -stack[sp - 1]
+                ip += 1
+            elif op == LOOP:
+                counter_slot = code[ip + 1]
+                counter = frame[counter_slot]
+                if counter > frame[code[ip + 2]]:
+                    ip = code[ip + 4]
+                else:
+                    frame[code[ip + 3]] = from_int(counter)
+                    frame[counter_slot] = counter + 1
+                    ip += 5
+            elif op == ACCUMULATE_ADD:
+                sp -= 1
+                slot = code[ip + 1]
+                frame[slot] = frame[slot] + stack[sp]
+                ip += 2
+            elif op == ACCUMULATE_MUL:
+                sp -= 1
+                slot = code[ip + 1]
+                frame[slot] = frame[slot] * stack[sp]
+                ip += 2
+            elif op == JUMP:
+                ip = code[ip + 1]
+            elif op == STORE:
+                sp -= 1
+                frame[code[ip + 1]] = stack[sp]
+                ip += 2
+            elif op == STORE_INT:
+                sp -= 1
+                frame[code[ip + 1]] = to_integer(stack[sp], INTEGER_OPERANDS[code[ip + 2]])
+                ip += 3
+            elif op == COMBINATORICS:
+                sp -= 1
+                n = to_integer(stack[sp - 1], "left operand of combinatorics")
+                k = to_integer(stack[sp], "right operand of combinatorics")
+                stack[sp - 1] = from_int(evaluate_combinatorics(COMBINATORICS_KINDS[code[ip + 1]], n, k))
+                ip += 2
+            elif op == RESULT:
+                sp -= 1
+                result = stack[sp]
+                ip += 1
+            else:
+                raise EvaluatorException(f"unknown opcode. (as-is : {op})")
+        return result
@@ -0,0 +1,90 @@
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from mathpreter.batch import evaluate_bindings, evaluate_formulas
+from mathpreter.errors import EvaluatorException, LimitExceededException, ParserException
+from mathpreter.evaluator import Evaluator
+from mathpreter.lexer import Lexer
+from mathpreter.limits import EvaluationLimits
+from mathpreter.parser import Parser
+
+FORMULAS = [
+    "1 + 3^3 * 5 + 2/5",
+    "\sum_{k=1}^{n}{k^2}",
+    "let a = n * 2; a % 7",
+    "_{n}\mathrm{C}_{2}",
+] * 5
+
+
+def expected(formula: str, bindings, backend=None):
+    return Evaluator(backend=backend).evaluate(Parser(Lexer(formula), backend=backend).parse_program(), bindings)
+
+
+@pytest.mark.parametrize("workers,chunk_size", [(1, None), (2, 3), (2, None), (3, 100)])
+def test_evaluate_formulas(workers, chunk_size):
+    results = evaluate_formulas(FORMULAS, {"n": 10}, workers=workers, chunk_size=chunk_size)
+
+    assert results == [expected(formula, {"n": 10}) for formula in FORMULAS]
+
+
+@pytest.mark.parametrize("workers,chunk_size", [(1, None), (2, 4)])
+def test_evaluate_bindings(workers, chunk_size):
+    formula = "let y = x^2; \sum_{k=1}^{x}{k} + y"
+    bindings_list = [{"x": x} for x in range(30)]
+
+    results = evaluate_bindings(formula, bindings_list, backend="fraction", workers=workers, chunk_size=chunk_size)
+
+    assert results == [expected(formula, bindings, "fraction") for bindings in bindings_list]
+    assert all(isinstance(result, Fraction) for result in results)
+
+
+def test_executor_is_reused():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = evaluate_formulas(["1 + 1", "2 * 3", "x"], {"x": 5}, executor=executor, chunk_size=1)
+
+    assert results == [Decimal(2), Decimal(6), Decimal(5)]
+
+
+def test_return_exceptions():
+    results = evaluate_formulas(["1 + 1", "y + 1", "1 / 0", "let = 3"], workers=2, chunk_size=1, return_exceptions=True)
+
+    assert results[0] == Decimal(2)
+    assert isinstance(results[1], EvaluatorException)
+    assert isinstance(results[2], ArithmeticError)
+    assert isinstance(results[3], ParserException)
+
+    results = evaluate_formulas(["1 % 0", "(0-8)^0.5", "2"], backend="float", workers=1, return_exceptions=True)
+    assert isinstance(results[0], ZeroDivisionError)
+    assert isinstance(results[1], EvaluatorException)
+    assert results[2] == 2.0
+
+    assert [type(e) for e in evaluate_bindings("let = 3", [{}, {}], workers=1, return_exceptions=True)] == [
+        ParserException, ParserException
+    ]
+
+
+def test_limits():
+    limits = EvaluationLimits(max_iterations=1000)
+    formula = "\sum_{k=1}^{x}{k % 7}"
+
+    results = evaluate_formulas([formula, "x * 2"], {"x": 10 ** 9}, workers=1, return_exceptions=True, limits=limits)
+    assert isinstance(results[0], LimitExceededException)
+    assert results[1] == Decimal(2 * 10 ** 9)
+
+    results = evaluate_bindings(formula, [{"x": 100}, {"x": 10 ** 9}], workers=2, chunk_size=1, return_exceptions=True,
+                                limits=limits)
+    assert results[0] == Decimal(297)
+    assert isinstance(results[1], LimitExceededException)
+
+
+def test_first_exception_is_raised():
+    with pytest.raises(EvaluatorException):
+        evaluate_bindings("x + 1", [{"x": 1}, {}], workers=2, chunk_size=1)
+
+
+def test_invalid_chunk_size():
+    with pytest.raises(ValueError):
+        evaluate_formulas(["1"], chunk_size=0)
@@ -0,0 +1,52 @@
+import pytest
+
+from mathpreter.cache import ParseCache, normalize_whitespace, parse
+from mathpreter.lexer import Lexer
+from mathpreter.parser import Parser
+
+
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        ("  let x =\t1 +\n\n 2 ; ", "let x = 1 + 2 ;"),
+        ("\r\n", ""),
+        ("1+2", "1+2"),
+    ],
+)
+def test_normalize_whitespace(test_input, expected):
+    assert normalize_whitespace(test_input) == expected
+
+
+def test_parse_cache_hit_and_miss():
+    cache = ParseCache(maxsize=8)
+    first = cache.parse("let x = 1 + 2;")
+    second = cache.parse("let   x = 1\n+ 2;  ")
+
+    assert first is second
+    assert str(first) == str(Parser(Lexer("let x = 1 + 2;")).parse_program())
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+
+def test_parse_cache_separates_backends():
+    cache = ParseCache(maxsize=8)
+    assert cache.parse("1.5", "float") is not cache.parse("1.5", "decimal")
+
+
+def test_parse_cache_eviction():
+    cache = ParseCache(maxsize=2)
+    a = cache.parse("1 + 1")
+    cache.parse("2 + 2")
+    cache.parse("1 + 1")
+    cache.parse("3 + 3")
+
+    info = cache.cache_info()
+    assert (info.evictions, info.currsize) == (1, 2)
+    assert cache.parse("1 + 1") is a
+    assert cache.cache_info().misses == 3
+
+
+def test_cached_program_is_frozen():
+    program = parse("x + 1")
+    with pytest.raises(AttributeError):
+        program.append(program.statements[0])
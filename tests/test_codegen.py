@@ -0,0 +1,96 @@
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from mathpreter.codegen import cache_clear, cache_info, compile_formula, compile_to_function
+from mathpreter.errors import EvaluatorException
+from mathpreter.evaluator import compile_program
+from mathpreter.lexer import Lexer
+from mathpreter.parser import Parser
+
+
+def parse(text: str, backend=None):
+    return Parser(Lexer(text), backend=backend).parse_program()
+
+
+@pytest.mark.parametrize("backend", ["float", "decimal", "fraction"])
+@pytest.mark.parametrize(
+    "test_input,bindings",
+    [
+        ("1 + 3^3 * 5 + 2/5", {}),
+        ("let y = x^2; y + 3*x - -x", {"x": 3}),
+        ("x % 3 + -x % 3 + x^-1 + x^y", {"x": 7, "y": 2}),
+        ("\\sum_{k=1}^{n}{k^2 * x}", {"n": 50, "x": 3}),
+        ("\\prod_{k=1}^{n}{k % 7 + 1} / \\sum_{k=1}^{4}{k}", {"n": 30}),
+        ("\\sum_{i=1}^{3}{\\sum_{j=i}^{n}{i * j + \\prod_{i=1}^{2}{i}}}", {"n": 6}),
+        ("_{n}\\mathrm{C}_{3} + _{n}\\mathrm{P}_{2} + _{n}\\mathrm{\\Pi}_{2}", {"n": 9}),
+        ("_{n}\\mathrm{H}_{3} + _{0}\\mathrm{H}_{0}", {"n": 9}),
+        ("let if = 3; let sum = if * 2; sum + if", {}),
+        ("\\sum_{k=1}^{range}{k * map} + math * sum", {"range": 4, "map": 2, "math": 3, "sum": 5}),
+        ("\\sum_{range=1}^{n}{\\prod_{map=1}^{range}{map}}", {"n": 5}),
+        ("1; let a = 2", {}),
+    ],
+)
+def test_same_as_compiled_program(backend, test_input, bindings):
+    program = parse(test_input, backend)
+    func = compile_to_function(program, backend)
+
+    expected = compile_program(program, backend=backend, closed_form=False)(bindings)
+    assert func(**bindings) == expected
+    assert type(func(**bindings)) is type(expected)
+
+
+@pytest.mark.parametrize(
+    "test_input,expected_source",
+    [
+        ("x^2 + y", "((x ** 2) + y)"),
+        ("\\sum_{k=1}^{n}{k * x}", "_sum(((k * x) for k in _map(_from_int, _range(_to_int(1.0, 'start of reducer'), "),
+        ("\\prod_{k=1}^{n}{k}", "_math.prod((k for k in _map(_from_int, _range("),
+        ("\\sum_{k=1}^{3}{k * x}", "(0.0 + (1.0 * x) + (2.0 * x) + (3.0 * x))"),
+        ("_{n}\\mathrm{C}_{2}", "_math.comb(*_operands(n, 2.0))"),
+        ("_{n}\\mathrm{P}_{2}", "_math.perm(*_operands(n, 2.0))"),
+        ("lambda + 1", "lambda_ = _convert(lambda_)"),
+    ],
+)
+def test_generated_source(test_input, expected_source):
+    func = compile_to_function(parse(test_input, "float"), "float")
+
+    assert expected_source in func.source
+
+
+def test_positional_arguments():
+    func = compile_to_function(parse("let z = a * 10; z + b"))
+
+    assert func.parameters == ["a", "b"]
+    assert func(1, 2) == func(b=2, a=1) == Decimal(12)
+
+
+def test_decimal_precision():
+    from mathpreter.numeric import DecimalBackend
+
+    func = compile_to_function(parse("1 / 3"), DecimalBackend(precision=5))
+    assert func() == Decimal("0.33333")
+
+
+def test_compile_formula_is_cached():
+    cache_clear()
+    first = compile_formula("x  +   1", backend="fraction")
+
+    assert compile_formula("x + 1", backend="fraction") is first
+    assert first(Fraction(1, 2)) == Fraction(3, 2)
+    assert compile_formula("x + 1", backend="float") is not first
+    assert cache_info().hits == 1 and cache_info().misses == 2
+
+
+@pytest.mark.parametrize(
+    "test_input,bindings",
+    [
+        ("\\sum_{k=1}^{n}{k}", {"n": 2.5}),
+        ("_{n}\\mathrm{C}_{2}", {"n": -3}),
+        ("_{n}\\mathrm{C}_{2}", {"n": 0.5}),
+    ],
+)
+def test_errors(test_input, bindings):
+    with pytest.raises(EvaluatorException):
+        compile_to_function(parse(test_input))(**bindings)
@@ -0,0 +1,78 @@
+import math
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mathpreter.combinatorics import (
+    FactorialCache, combination, combination_with_repetition, evaluate_combinatorics, permutation, range_product
+)
+from mathpreter.errors import EvaluatorException
+
+
+@pytest.mark.parametrize("low,high", [(1, 0), (1, 1), (3, 10), (1, 200), (150, 1000)])
+def test_range_product(low, high):
+    assert range_product(low, high) == math.prod(range(low, high + 1))
+
+
+@pytest.mark.parametrize("n", [0, 1, 5, 70, 300, 2000])
+def test_permutation_and_combination(n):
+    for k in sorted({0, 1, n // 3, n // 2, n - 1, n, n + 1} - {-1}):
+        assert permutation(n, k) == math.perm(n, k)
+        assert combination(n, k) == math.comb(n, k)
+
+
+@pytest.mark.parametrize(
+    "kind,n,k,expected",
+    [
+        ("P", 5, 2, 20),
+        ("C", 5, 2, 10),
+        ("\Pi", 3, 4, 81),
+        ("H", 3, 2, 6),
+        ("H", 0, 0, 1),
+        ("H", 0, 3, 0),
+    ],
+)
+def test_evaluate_combinatorics(kind, n, k, expected):
+    assert evaluate_combinatorics(kind, n, k) == expected
+
+
+@pytest.mark.parametrize("kind,n,k", [("Q", 3, 2), ("C", -1, 2), ("P", 3, -2)])
+def test_evaluate_combinatorics_failure(kind, n, k):
+    with pytest.raises(EvaluatorException):
+        evaluate_combinatorics(kind, n, k)
+
+
+def test_factorial_cache_is_bounded_and_reuses_neighbours():
+    cache = FactorialCache(maxsize=4)
+    for n in [10, 500, 499, 12, 600, 11, 498]:
+        assert cache.factorial(n) == math.factorial(n)
+    assert cache.cache_info().currsize == 4
+
+    assert cache.factorial(498) == math.factorial(498)
+    assert cache.cache_info().hits == 1
+
+
+def test_factorial_cache_is_thread_safe():
+    cache = FactorialCache(maxsize=16)
+
+    def work(seed: int) -> bool:
+        rng = random.Random(seed)
+        return all(cache.factorial(n) == math.factorial(n) for n in (rng.randint(2, 2000) for _ in range(2000)))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert all(executor.map(work, range(8)))
+    assert cache.keys == sorted(cache.values)
+    assert cache.cache_info().currsize <= 16
+
+
+def test_combination_with_repetition():
+    assert [combination_with_repetition(4, k) for k in range(5)] == [math.comb(3 + k, k) for k in range(5)]
+
+
+@pytest.mark.parametrize("n", [500, 3000])
+def test_row_cache_steps_between_neighbouring_k(n):
+    ks = list(range(100, n - 100, 37)) + list(range(n - 101, 99, -53))
+    for k in ks:
+        assert combination(n, k) == math.comb(n, k)
+        assert permutation(n, k) == math.perm(n, k)
@@ -0,0 +1,124 @@
+import pytest
+
+from mathpreter.ast import node_children
+from mathpreter.cse import CSEEvaluator, Interner, SharedSubexpressions
+from mathpreter.evaluator import Evaluator
+from mathpreter.lexer import Lexer
+from mathpreter.parser import IterativeParser, Parser
+
+
+def parse(text: str):
+    return Parser(Lexer(text)).parse_program()
+
+
+def expression(text: str):
+    return parse(text).statements[0].expression
+
+
+@pytest.mark.parametrize(
+    "left,right,expected",
+    [
+        ("(x+1)^2", "(x + 1) ^ 2", True),
+        ("(x+1)^2", "(x+1)^3", False),
+        ("(x+1)^2", "(1+x)^2", False),
+        ("-x", "-x", True),
+        ("-x", "x", False),
+        ("1", "1.0", False),
+        ("\\sum_{k=1}^{n}{k^2}", "\\sum_{k=1}^{n}{k^2}", True),
+        ("\\sum_{k=1}^{n}{k^2}", "\\prod_{k=1}^{n}{k^2}", False),
+        ("\\sum_{k=1}^{n}{k^2}", "\\sum_{j=1}^{n}{k^2}", False),
+        ("_{n}\\mathrm{C}_{2}", "_{n}\\mathrm{C}_{2}", True),
+        ("_{n}\\mathrm{C}_{2}", "_{n}\\mathrm{P}_{2}", False),
+    ],
+)
+def test_structural_equality(left, right, expected):
+    interner = Interner()
+    left, right = expression(left), expression(right)
+
+    assert (interner.intern(left) is interner.intern(right)) is expected
+    # node 자체는 identity로 비교
+    assert left != right
+
+
+def test_interner_shares_equal_subexpressions():
+    interner = Interner()
+    expr = interner.intern(expression("(x+1)^2 * k + (x+1)^2"))
+
+    assert expr.left.left is expr.right
+    assert str(expr) == "((((x+1)^2)*k)+((x+1)^2))"
+
+
+def test_interner_shares_across_programs():
+    interner = Interner()
+    first = interner.intern_program(parse("let y = (x+1)^2; y"))
+    second = interner.intern_program(parse("(x+1)^2 + 3"))
+
+    assert first.statements[0].value is second.statements[0].expression.left
+    assert interner.hits > 0
+
+
+def test_interner_keeps_original_tree():
+    expr = expression("(x+1)^2 + (x+1)^2")
+    Interner().intern(expr)
+
+    assert expr.left is not expr.right
+
+
+def test_interner_deep_tree():
+    expr = Interner().intern(expression("+".join(["(x+1)"] * 5000)))
+
+    children = node_children(expr)
+    assert len(children) == 2
+
+
+def test_interner_long_chain():
+    text = " + ".join(["x"] * 20000)
+    first, second = (IterativeParser(Lexer(text)).parse_program().statements[0].expression for _ in range(2))
+    interner = Interner()
+
+    assert first != second and len({first, second}) == 2
+    assert interner.intern(first) is interner.intern(second)
+    assert len(interner) == 20000  # x, (x+x), ((x+x)+x), ...
+
+
+def test_shared_subexpressions():
+    subexpressions = SharedSubexpressions(parse("\\sum_{k=1}^{n}{(x+1)^2 * k + (x+1)^2 + x}"))
+
+    assert [str(node) for node in subexpressions.shared.values()] == ["((x+1)^2)"]
+    assert list(subexpressions.dependents) == ["x"]
+
+
+@pytest.mark.parametrize("closed_form", [True, False])
+@pytest.mark.parametrize(
+    "test_input,bindings",
+    [
+        ("\\sum_{k=1}^{100}{(x+1)^2 * k + (x+1)^2}", {"x": 2}),
+        ("let a = (x+1)^2; let x = 5; a + (x+1)^2", {"x": 2}),
+        ("(x+1)^2 + \\sum_{x=1}^{3}{(x+1)^2} + (x+1)^2", {"x": 2}),
+        ("\\sum_{k=1}^{5}{\\sum_{j=1}^{k}{(k*j)^2 + (k*j)^2} + k*2} + k*2", {"k": 10}),
+        ("\\prod_{k=1}^{6}{_{k}\\mathrm{C}_{2} + _{k}\\mathrm{C}_{2} + 1} / (3 - 1) - (3 - 1)", {}),
+        ("\\sum_{k=1}^{3}{k}; \\sum_{k=1}^{3}{k}", {}),
+    ],
+)
+def test_same_as_evaluator(closed_form, test_input, bindings):
+    program = parse(test_input)
+
+    expected = Evaluator(closed_form=closed_form).evaluate(program, bindings)
+    evaluator = CSEEvaluator(closed_form=closed_form)
+    assert evaluator.evaluate(program, bindings) == expected
+    # 분석 결과를 재사용해도 같은 값
+    assert evaluator.evaluate(program, bindings) == expected
+
+
+def test_shared_subexpression_is_evaluated_once():
+    calls = []
+
+    class CountingEvaluator(CSEEvaluator):
+        def eval_infix_expression(self, expr, env):
+            if str(expr) == "((x+1)^2)":
+                calls.append(expr)
+            return super().eval_infix_expression(expr, env)
+
+    program = parse("\\sum_{k=1}^{10}{(x+1)^2 * k + (x+1)^2}")
+    assert CountingEvaluator(closed_form=False).evaluate(program, {"x": 2}) == 585
+    assert len(calls) == 1
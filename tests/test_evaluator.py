@@ -0,0 +1,75 @@
+import threading
+from decimal import Decimal
+
+import pytest
+
+from mathpreter.errors import EvaluatorException, CancelledException
+from mathpreter.evaluator import Evaluator, compile_program
+from mathpreter.lexer import Lexer
+from mathpreter.parser import Parser
+
+
+def parse(text: str):
+    return Parser(Lexer(text)).parse_program()
+
+
+@pytest.mark.parametrize(
+    "test_input,bindings,expected",
+    [
+        ("1 + 3^3 * 5 + 2/5", None, Decimal("136.4")),
+        ("7 % 4 * 2", None, Decimal("6")),
+        ("- (5 - 2) ^ 2", None, Decimal("-9")),
+        ("\sum_{k=1}^{5} {k+5}", None, Decimal("40")),
+        ("\prod_{k=1}^{3} {2*k}", None, Decimal("48")),
+        ("\sum_{k=3}^{2} {k}", None, Decimal("0")),
+        ("\sum_{i=1}^{3}{\prod_{j=1}^{i}{j}}", None, Decimal("9")),
+        ("_{5}\mathrm{P}_{2} + _{5}\mathrm{C}_{2}", None, Decimal("30")),
+        ("_{3}\mathrm{\Pi}_{2} + _{3}\mathrm{H}_{2}", None, Decimal("15")),
+        ("let a = 2; let b = a * x; b + a", {"x": 3}, Decimal("8")),
+        ("\sum_{x=1}^{3}{x} + x", {"x": 10}, Decimal("16")),
+        ("\sum_{k=1}^{k}{k}", {"k": 4}, Decimal("10")),
+        ("\sum_{k=1}^{3}{\sum_{k=1}^{k}{k}}", None, Decimal("10")),
+        ("let k = 2; \sum_{k=1}^{3}{k} * k", None, Decimal("12")),
+        ("let a = 1; let a = a + x; let b = a * a; b - a", {"x": 2}, Decimal("6")),
+    ],
+)
+def test_evaluate(test_input, bindings, expected):
+    program = parse(test_input)
+
+    assert Evaluator().evaluate(program, bindings) == expected
+    assert compile_program(program)(bindings) == expected
+
+
+def test_compiled_program_is_reusable():
+    run = compile_program(parse("let y = x^2; y + 3*x"))
+
+    assert [run({"x": x}) for x in range(4)] == [Decimal(v) for v in (0, 4, 10, 18)]
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    ["x + 1", "\sum_{k=1}^{2.5}{k}", "_{3}\mathrm{Q}_{2}", "_{3}\mathrm{C}_{-1}"],
+)
+def test_evaluate_failure(test_input):
+    program = parse(test_input)
+
+    with pytest.raises(EvaluatorException):
+        Evaluator().evaluate(program)
+    with pytest.raises(EvaluatorException):
+        compile_program(program)()
+
+
+def test_compiled_program_ignores_unused_bindings():
+    run = compile_program(parse("x + 1"))
+
+    assert run({"x": 1, "y": 2}) == Decimal("2")
+
+
+def test_cancel_event_stops_reducer_loop():
+    cancel_event = threading.Event()
+    cancel_event.set()
+    program = parse("\sum_{k=1}^{10^9}{k % 7}")
+
+    with pytest.raises(CancelledException):
+        Evaluator(cancel_event=cancel_event).evaluate(program)
+    assert Evaluator(cancel_event=threading.Event()).evaluate(parse("\sum_{k=1}^{10}{k % 7}")) == Decimal(27)
@@ -0,0 +1,131 @@
+import random
+
+import pytest
+
+from mathpreter.errors import LexerException, ParserException
+from mathpreter.incremental import IncrementalDocument
+from mathpreter.lexer import SpanLexer
+from mathpreter.parser import Parser
+
+DOCUMENT = "let a = \\sum_{k=1}^{n}{(k + x)^2}; let b = a * 2; _{n}\\mathrm{C}_{2} + b"
+
+
+def parse(text: str):
+    return [str(stmt) for stmt in Parser(SpanLexer(text)).parse_program().statements]
+
+
+def apply(text: str, offset: int, deleted: int, inserted: str) -> str:
+    return text[:offset] + inserted + text[offset + deleted:]
+
+
+@pytest.mark.parametrize(
+    "offset,deleted,inserted",
+    [
+        (len(DOCUMENT), 0, " + 1"),
+        (len(DOCUMENT), 0, "; let c = 3"),
+        (0, 0, "let z = 1; "),
+        (DOCUMENT.index("x"), 1, "y"),
+        (DOCUMENT.index("a * 2"), 0, "3 + "),
+        (DOCUMENT.index("; let b"), 1, " "),  # 두 구문이 이어짐 : `... {(k + x)^2} let b` 는 파싱 실패
+        (DOCUMENT.index("; let b"), len("; let b = a * 2"), ""),
+        (0, len(DOCUMENT), "1 2"),
+        (DOCUMENT.index("2;"), 1, "2 3"),
+    ],
+)
+def test_same_as_full_parse(offset, deleted, inserted):
+    document = IncrementalDocument(DOCUMENT)
+    text = apply(DOCUMENT, offset, deleted, inserted)
+
+    try:
+        expected = parse(text)
+    except (LexerException, ParserException):
+        with pytest.raises((LexerException, ParserException)):
+            document.edit(offset, deleted, inserted)
+        assert document.program is None and document.text == text
+        return
+
+    program = document.edit(offset, deleted, inserted)
+    assert [str(stmt) for stmt in program.statements] == expected
+    assert document.text == text
+    assert [(t.type, t.literal, t.start, t.end) for t in document.tokens] == [
+        (t.type, t.literal, t.start, t.end) for t in SpanLexer(text).tokenize()
+    ]
+
+
+def test_reuses_untouched_statements():
+    document = IncrementalDocument(DOCUMENT)
+    before = list(document.program.statements)
+
+    program = document.edit(DOCUMENT.index("a * 2"), 0, "3 + ")
+    assert document.reparsed == 1
+    assert program.statements[0] is before[0]
+    assert program.statements[1] is not before[1]
+    assert program.statements[2] is before[2]
+
+
+def test_reuses_untouched_groups_in_edited_statement():
+    document = IncrementalDocument(DOCUMENT)
+    reducer = document.program.statements[0].value
+
+    # 합기호 뒤를 바꾸면 끝 범위와 body는 파싱하지 않고 재사용
+    program = document.edit(DOCUMENT.index(";"), 0, " + 1")
+    edited = program.statements[0].value
+    assert str(edited) == f"({reducer}+1)"
+    assert edited.left.end is reducer.end
+    assert edited.left.body is reducer.body
+
+    # 합기호 앞을 바꾸면 옮겨진 괄호도 재사용
+    program = document.edit(DOCUMENT.index("\\sum"), 0, "-")
+    assert program.statements[0].value.left.right.body is reducer.body
+
+
+def test_recovers_after_failure():
+    document = IncrementalDocument(DOCUMENT)
+    first, _, last = document.program.statements
+
+    offset = DOCUMENT.index("a * 2")
+    with pytest.raises(ParserException):
+        document.edit(offset, 0, "\\sum_{")
+    assert document.program is None
+    assert not document.complete
+
+    # 실패한 구문만 다시 파싱하고 앞뒤 구문은 재사용
+    program = document.edit(offset, len("\\sum_{"), "")
+    assert document.complete
+    assert document.reparsed == 1
+    assert program.statements[0] is first
+    assert program.statements[2] is last
+    assert [str(stmt) for stmt in program.statements] == parse(DOCUMENT)
+
+
+def test_edit_out_of_range():
+    document = IncrementalDocument("1 + 2")
+    with pytest.raises(ValueError):
+        document.edit(3, 5, "")
+
+
+PIECES = [
+    "let a = ", "x", "1", "2.5", " + ", "-", "*", "^", ";", " ", "(", ")", "{", "}", "\\pi", "\n",
+    "\\sum_{k=1}^{n}{k^2}", "_{n}\\mathrm{C}_{2}", "\\prod_{j=1}^{3}{(j + x)}", "let b = a * 2; ",
+]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_edits(seed):
+    rng = random.Random(seed)
+    document = IncrementalDocument("; ".join(["let a = 1", DOCUMENT, "\\sum_{k=1}^{3}{(k * 2)}"]))
+    for _ in range(200):
+        offset = rng.randint(0, len(document.text))
+        deleted = rng.randint(0, min(4, len(document.text) - offset))
+        inserted = rng.choice(PIECES) if rng.random() < 0.8 else ""
+        text = apply(document.text, offset, deleted, inserted)
+        try:
+            expected = parse(text)
+        except (LexerException, ParserException):
+            expected = None
+
+        try:
+            actual = [str(stmt) for stmt in document.edit(offset, deleted, inserted).statements]
+        except (LexerException, ParserException):
+            actual = None
+        assert actual == expected
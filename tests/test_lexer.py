@@ -1,7 +1,8 @@
 import pytest
 
-from mathpreter.lexer import Lexer
-from mathpreter.token import TokenType
+from mathpreter.errors import LexerException
+from mathpreter.lexer import Lexer, RegexLexer, StreamLexer, SpanLexer, BufferLexer, map_file
+from mathpreter.token import BufferToken, CONSTANTS, TokenType
 
 
 @pytest.mark.parametrize(
@@ -62,3 +63,186 @@ def test_middle_size_equation(test_input, expected_types, expected_values):
         token = lexer.next_token()
         assert token.type == expected_type
         assert token.literal == expected_value
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    [
+        "32.5+25.2-1",
+        "\sum_{x=12}^{19}{3*x}",
+        "let x = -5;\n let y = x % 3 ;",
+        "_{1+3}\mathrm{\Pi}_{k*7} \\",
+        "1a 2.b x12y \pi\exp",
+        "1. + é2 + 3²",
+        "",
+        "   \t\n",
+    ],
+)
+def test_regex_lexer_emits_same_tokens(test_input):
+    expected = [(token.type, token.literal) for token in Lexer(test_input).tokenize()]
+
+    lexer = RegexLexer(test_input)
+    tokens = []
+    while not tokens or tokens[-1][0] != TokenType.EOF:
+        token = lexer.next_token()
+        tokens.append((token.type, token.literal))
+
+    assert tokens == expected
+    assert [(token.type, token.literal) for token in RegexLexer(test_input).tokenize()] == expected
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    ["1 + 2 $ 3", "12.5.3", "x = 1..2", "a + 3.2.", "let y = 7 ?"],
+)
+def test_regex_lexer_raises_same_exception(test_input):
+    with pytest.raises(LexerException) as expected:
+        Lexer(test_input).tokenize()
+
+    with pytest.raises(LexerException) as actual:
+        RegexLexer(test_input).tokenize()
+
+    assert str(actual.value) == str(expected.value)
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    [
+        "\sum_{x=12}^{19}{3*x}",
+        "let x = -5;\n let y = x % 3 ;",
+        "1a 2.b x12y \pi\exp",
+        "1. + é2 + 3²  abcé12 + 1",
+        "",
+        "   \t\n",
+    ],
+)
+def test_span_lexer_emits_same_tokens_with_spans(test_input):
+    expected = [(token.type, token.literal) for token in Lexer(test_input).tokenize()]
+
+    tokens = SpanLexer(test_input).tokenize()
+    assert [(token.type, token.literal) for token in tokens] == expected
+    for token in tokens:
+        source = test_input[token.start: token.end]
+        assert CONSTANTS.get(source, source) == token.literal
+    assert (tokens[-1].start, tokens[-1].end) == (len(test_input), len(test_input))
+
+
+def test_span_lexer_starts_in_the_middle():
+    text = "let a = 1; b * 22"
+    lexer = SpanLexer(text, c_pos=10, base=10)
+    tokens = lexer.tokenize()
+
+    assert [(token.literal, token.start, token.end) for token in tokens] == [
+        ("b", 1, 2), ("*", 3, 4), ("22", 5, 7), ("", 7, 7)
+    ]
+    assert lexer.tokens == tokens
+
+
+def split(text: str, size: int):
+    return [text[i: i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    [
+        "32.5+25.2-1",
+        "\sum_{x=12}^{19}{3*x}",
+        "let x = -5;\n let y = x % 3 ;",
+        "1a 2.b x12y \pi\exp",
+        "1. + é2 + 3²  abcé12 + 1",
+        "",
+        "   \t\n",
+    ],
+)
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+def test_stream_lexer_emits_same_tokens(test_input, size):
+    expected = [(token.type, token.literal) for token in Lexer(test_input).tokenize()]
+
+    tokens = StreamLexer(split(test_input, size)).tokenize()
+    assert [(token.type, token.literal) for token in tokens] == expected
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    ["1 + 2 $ 3", "12.5.3", "x = 1..2", "a + 3.2.", "let y = 7 ?"],
+)
+@pytest.mark.parametrize("size", [1, 2, 5])
+def test_stream_lexer_raises_same_exception(test_input, size):
+    with pytest.raises(LexerException) as expected:
+        Lexer(test_input).tokenize()
+
+    with pytest.raises(LexerException) as actual:
+        StreamLexer(split(test_input, size)).tokenize()
+
+    assert str(actual.value) == str(expected.value)
+
+
+def test_stream_lexer_discards_consumed_chunks():
+    lexer = StreamLexer(["x + 1;\n"] * 1000)
+    for _ in range(2000):
+        lexer.next_token()
+
+    assert len(lexer.buffer) < 20
+    assert lexer.c_pos == len("x + 1;\n") * 500 - 1
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    [
+        "32.5+25.2-1",
+        "\sum_{x=12}^{19}{3*x}",
+        "let x = -5;\n let y = x % 3 ;",
+        "_{1+3}\mathrm{\Pi}_{k*7} \\",
+        "1a 2.b x12y \pi\exp",
+        "1. + é2 + 3²  abcé12 + 1",
+        "lets let1 \\summ \\x1 a_b",
+        "",
+        "   \t\n",
+    ],
+)
+@pytest.mark.parametrize("wrap", [bytes, memoryview])
+def test_buffer_lexer_emits_same_tokens(test_input, wrap):
+    expected = [(token.type, token.literal) for token in Lexer(test_input).tokenize()]
+
+    tokens = BufferLexer(wrap(test_input.encode("utf-8"))).tokenize()
+    assert [(token.type, token.literal) for token in tokens] == expected
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    ["1 + 2 $ 3", "12.5.3", "x = 1..2", "a + 3.2.", "let y = 7 ?"],
+)
+def test_buffer_lexer_raises_same_exception(test_input):
+    with pytest.raises(LexerException) as expected:
+        Lexer(test_input).tokenize()
+
+    with pytest.raises(LexerException) as actual:
+        BufferLexer(test_input.encode("ascii")).tokenize()
+
+    assert str(actual.value) == str(expected.value)
+
+
+def test_buffer_token_points_into_buffer():
+    buffer = b"let abc = 12.5 * y"
+    tokens = BufferLexer(buffer).tokenize()
+
+    assert isinstance(tokens[1], BufferToken)
+    assert (tokens[1].start, tokens[1].end) == (4, 7)
+    assert tokens[1].text is None
+    assert tokens[1].literal == "abc"
+    assert tokens[1].text == "abc"
+    assert buffer[tokens[3].start: tokens[3].end] == b"12.5"
+
+
+def test_map_file(tmp_path):
+    path = tmp_path / "formulas.tex"
+    path.write_bytes("x + é;\n\sum_{k=1}^{3}{k}".encode("utf-8"))
+
+    with map_file(path) as buffer:
+        tokens = [(token.type, token.literal) for token in BufferLexer(buffer).tokenize()]
+    assert tokens == [(token.type, token.literal) for token in Lexer(path.read_text("utf-8")).tokenize()]
+
+    empty = tmp_path / "empty.tex"
+    empty.write_bytes(b"")
+    with map_file(empty) as buffer:
+        assert [token.type for token in BufferLexer(buffer).tokenize()] == [TokenType.EOF]
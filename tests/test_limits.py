@@ -0,0 +1,83 @@
+import time
+from decimal import Decimal
+
+import pytest
+
+from mathpreter.errors import LimitExceededException
+from mathpreter.evaluator import Evaluator, compile_program
+from mathpreter.lexer import Lexer
+from mathpreter.limits import EvaluationLimits, ast_depth
+from mathpreter.parser import Parser
+
+
+def parse(text: str, backend=None):
+    return Parser(Lexer(text), backend=backend).parse_program()
+
+
+def evaluate(mode: str, text: str, limits: EvaluationLimits, backend=None):
+    program = parse(text, backend)
+    if mode == "evaluator":
+        return Evaluator(backend=backend, limits=limits).evaluate(program)
+    return compile_program(program, backend=backend, limits=limits)()
+
+
+MODES = ["evaluator", "compiled"]
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize(
+    "test_input,limits,backend",
+    [
+        ("\sum_{k=1}^{10^12}{k % 7}", EvaluationLimits(max_iterations=10 ** 6), None),
+        ("\sum_{i=1}^{100}{\sum_{j=1}^{100}{i % j}}", EvaluationLimits(max_iterations=5000), None),
+        ("2^(10^9)", EvaluationLimits(max_digits=1000), "fraction"),
+        ("10^(10^7)", EvaluationLimits(max_digits=1000), None),
+        ("_{10^6}\mathrm{C}_{5*10^5}", EvaluationLimits(max_digits=1000), None),
+        ("_{10^6}\mathrm{H}_{10^6}", EvaluationLimits(max_digits=1000), None),
+        ("\sum_{k=1}^{10^9}{2^k}", EvaluationLimits(max_digits=1000), "fraction"),
+        ("\prod_{k=1}^{10^9}{3}", EvaluationLimits(max_digits=1000), "fraction"),
+        ("\prod_{k=1}^{5000}{k}", EvaluationLimits(max_digits=1000), "fraction"),
+        ("1+(1+(1+(1+(1+(1+1)))))", EvaluationLimits(max_depth=6), None),
+    ],
+)
+def test_limit_exceeded(mode, test_input, limits, backend):
+    with pytest.raises(LimitExceededException):
+        evaluate(mode, test_input, limits, backend)
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize(
+    "test_input,limits,expected",
+    [
+        # closed form은 반복하지 않음
+        ("\sum_{k=1}^{10^12}{k}", EvaluationLimits(max_iterations=10), Decimal(500000000000500000000000)),
+        ("\sum_{i=1}^{100}{\sum_{j=1}^{100}{i % j}}", EvaluationLimits(max_iterations=10100), Decimal(225076)),
+        ("2^60 + _{50}\mathrm{C}_{25}", EvaluationLimits(max_digits=20), Decimal(2 ** 60 + 126410606437752)),
+        ("0.5^1000 * 10^300", EvaluationLimits(max_digits=400), Decimal("0.5") ** 1000 * Decimal(10) ** 300),
+        ("1+(1+(1+1))", EvaluationLimits(max_depth=6), Decimal(4)),
+    ],
+)
+def test_within_limits(mode, test_input, limits, expected):
+    assert evaluate(mode, test_input, limits) == expected
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_timeout(mode):
+    begin = time.perf_counter()
+    with pytest.raises(LimitExceededException):
+        evaluate(mode, "\sum_{k=1}^{10^12}{k % 7}", EvaluationLimits(timeout=0.05))
+    assert time.perf_counter() - begin < 2
+
+
+def test_compiled_program_gets_new_budget_per_run():
+    run = compile_program(parse("\sum_{k=1}^{x}{k % 7}"), limits=EvaluationLimits(max_iterations=100))
+
+    assert [run({"x": 100}) for _ in range(3)] == [Decimal(297)] * 3
+    with pytest.raises(LimitExceededException):
+        run({"x": 101})
+
+
+def test_ast_depth():
+    assert ast_depth(parse("1")) == 3
+    assert ast_depth(parse("let a = 1 + 2; a")) == 4
+    assert ast_depth(parse("\sum_{k=1}^{3}{k * (k + 1)}")) == 6
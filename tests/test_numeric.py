@@ -0,0 +1,80 @@
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from mathpreter.ast import NumberLiteral
+from mathpreter.errors import EvaluatorException
+from mathpreter.evaluator import Evaluator, compile_program
+from mathpreter.lexer import Lexer
+from mathpreter.numeric import DecimalBackend, get_backend
+from mathpreter.parser import Parser
+
+
+def parse(text: str, backend=None):
+    return Parser(Lexer(text), backend=backend).parse_program()
+
+
+@pytest.mark.parametrize(
+    "backend,expected_type",
+    [("float", float), ("decimal", Decimal), ("fraction", Fraction)],
+)
+def test_parser_converts_literals_once(backend, expected_type):
+    program = parse("1.5 + \pi", backend)
+    expr = program.statements[0].expression
+
+    assert isinstance(expr.left, NumberLiteral)
+    assert type(expr.left.value) is expected_type
+    assert type(expr.right.value) is expected_type
+
+
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        ("1 + 3^3 * 5 + 2/5", Fraction(682, 5)),
+        ("-7 % 3 + 7 % -3", Fraction(0)),
+        ("\sum_{k=1}^{4}{1/k}", Fraction(25, 12)),
+        ("\prod_{k=1}^{3}{x / k}", Fraction(27, 6)),
+        ("_{6}\mathrm{C}_{2} / 4", Fraction(15, 4)),
+    ],
+)
+@pytest.mark.parametrize("backend", ["float", "decimal", "fraction"])
+def test_backends_agree(test_input, expected, backend):
+    program = parse(test_input, backend)
+    bindings = {"x": 3}
+
+    result = Evaluator(backend=backend).evaluate(program, bindings)
+    assert type(result) is get_backend(backend).number_type
+    assert float(result) == pytest.approx(float(expected))
+    assert compile_program(program, backend=backend)(bindings) == result
+
+
+def test_fraction_backend_is_exact():
+    program = parse("1/3 + 1/3 + 1/3 - 1")
+    assert Evaluator(backend="fraction").evaluate(program) == 0
+
+
+def test_decimal_backend_precision():
+    program = parse("1/3")
+    result = Evaluator(backend=DecimalBackend(precision=50)).evaluate(program)
+
+    assert str(result) == "0." + "3" * 50
+
+
+def test_fraction_backend_rejects_irrational_power():
+    with pytest.raises(EvaluatorException):
+        Evaluator(backend="fraction").evaluate(parse("2^0.5"))
+
+
+@pytest.mark.parametrize(
+    "test_input,error",
+    [("(0-8)^0.5", EvaluatorException), ("0^(0-1)", EvaluatorException), ("1 % 0", ZeroDivisionError)],
+)
+def test_float_backend_domain_error(test_input, error):
+    with pytest.raises(error):
+        Evaluator(backend="float").evaluate(parse(test_input))
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_backend("complex")
@@ -0,0 +1,89 @@
+import pytest
+
+from mathpreter.evaluator import Evaluator
+from mathpreter.lexer import Lexer
+from mathpreter.optimizer import optimize
+from mathpreter.parser import Parser
+
+
+def parse(text: str, backend=None):
+    return Parser(Lexer(text), backend=backend).parse_program()
+
+
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        ("1 + 3^3 * 5 + 2/5", "136.4"),
+        ("x * (3 - 2)", "x"),
+        ("(2 - 2) + x * 1 ^ 1", "x"),
+        ("--x", "x"),
+        ("-(2 * 3) + x", "(-6+x)"),
+        ("0 - x", "-x"),
+        ("x / 1 - 0", "x"),
+        ("_{5}\mathrm{C}_{2} * x", "(10*x)"),
+        ("let y = 2 * 3 + x; y", "let y = (6+x)\ny"),
+        ("\sum_{k=1}^{10}{x * 2}", "(20*x)"),
+        ("\prod_{k=1}^{3}{x}", "(x^3)"),
+        ("\sum_{k=1}^{4}{(x + 1) * 3 * k}", "(((x+1)*3)*\sum_{k=1}^{4}{k})"),
+        ("\sum_{k=1}^{4}{k^2 / (x + 1)}", "(\sum_{k=1}^{4}{(k^2)}/(x+1))"),
+        ("\sum_{k=1}^{n}{(x + 1) * 3 * k}", "\sum_{k=1}^{n}{(((x+1)*3)*k)}"),
+        ("\sum_{k=1}^{n}{k^2 / (x + 1)}", "\sum_{k=1}^{n}{((k^2)/(x+1))}"),
+        ("\prod_{k=1}^{4}{2 * k}", "(16*\prod_{k=1}^{4}{k})"),
+        ("\prod_{k=1}^{n}{2 * k}", "\prod_{k=1}^{n}{(2*k)}"),
+        ("1 / 0 + x", "((1/0)+x)"),
+        ("\prod_{k=1}^{0}{x}", "1"),
+        ("\prod_{k=3}^{1}{2 * k * x}", "1"),
+        ("\sum_{k=5}^{2}{y / x}", "0"),
+    ],
+)
+def test_optimize(test_input, expected):
+    assert str(optimize(parse(test_input))) == expected
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    [
+        "1 + 3^3 * 5 + 2/5 - x % 3",
+        "-(-(x)) * 1 + 0 * 2",
+        "\sum_{k=1}^{n}{(x + 1) * 3 * k + 0}",
+        "\sum_{k=2}^{n}{k^2 / (x + 1)}",
+        "\prod_{k=1}^{5}{(2 + x) * k}",
+        "\sum_{i=1}^{3}{\sum_{j=1}^{i}{i * j * x}}",
+        "\sum_{k=5}^{2}{x}",
+        "let a = 2^3; let b = a * \sum_{k=1}^{4}{a * k}; b - _{6}\mathrm{H}_{2}",
+    ],
+)
+@pytest.mark.parametrize("backend", ["decimal", "fraction"])
+def test_optimized_program_is_equivalent(test_input, backend):
+    program = parse(test_input, backend)
+    optimized = optimize(program, backend)
+    evaluator = Evaluator(backend=backend)
+    bindings = {"x": 3, "n": 6}
+
+    assert evaluator.evaluate(optimized, bindings) == evaluator.evaluate(program, bindings)
+
+
+@pytest.mark.parametrize("test_input", ["\prod_{k=1}^{0}{x}", "\prod_{k=1}^{0}{0}", "\prod_{k=1}^{0}{x * k}"])
+@pytest.mark.parametrize("backend", ["decimal", "fraction", "float"])
+def test_empty_product_is_identity(test_input, backend):
+    program = parse(test_input, backend)
+    evaluator = Evaluator(backend=backend)
+
+    assert evaluator.evaluate(optimize(program, backend), {"x": 0}) == evaluator.evaluate(program, {"x": 0}) == 1
+
+
+@pytest.mark.parametrize("test_input", ["\sum_{k=1}^{n}{k / c}", "\sum_{k=1}^{n}{k * y}", "\prod_{k=1}^{n}{k * y}"])
+@pytest.mark.parametrize("backend", ["decimal", "fraction", "float"])
+def test_symbolic_empty_range_is_identity(test_input, backend):
+    program = parse(test_input, backend)
+    evaluator = Evaluator(backend=backend)
+    bindings = {"n": 0, "c": 0}
+
+    assert evaluator.evaluate(optimize(program, backend), bindings) == evaluator.evaluate(program, bindings)
+
+
+def test_optimize_does_not_mutate_input():
+    program = parse("let y = 1 + 2; y * 1")
+    before = str(program)
+    optimize(program)
+    assert str(program) == before
@@ -0,0 +1,165 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+
+import pytest
+
+from mathpreter.errors import EvaluatorException
+from mathpreter.evaluator import Evaluator, compile_program
+from mathpreter.lexer import Lexer
+from mathpreter.limits import EvaluationLimits
+from mathpreter import parallel
+from mathpreter.parallel import balanced_product, chunk_ranges, split_range
+from mathpreter.reducer import PARALLEL_THRESHOLD
+from mathpreter.parser import Parser
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """ 제출된 작업 수를 세는 executor """
+
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+def parse(text: str, backend=None):
+    return Parser(Lexer(text), backend=backend).parse_program()
+
+
+@pytest.mark.parametrize(
+    "start,end,count,expected",
+    [
+        (1, 10, 3, [(1, 4), (5, 7), (8, 10)]),
+        (1, 4, 4, [(1, 1), (2, 2), (3, 3), (4, 4)]),
+        (1, 2, 5, [(1, 1), (2, 2)]),
+        (-3, 2, 2, [(-3, -1), (0, 2)]),
+        (5, 4, 3, []),
+    ],
+)
+def test_split_range(start, end, count, expected):
+    assert split_range(start, end, count) == expected
+
+
+@pytest.mark.parametrize(
+    "start,end,size,expected",
+    [
+        (1, 10, 4, [(1, 4), (5, 7), (8, 10)]),
+        (1, 8, 4, [(1, 4), (5, 8)]),
+        (1, 3, 4, [(1, 3)]),
+        (5, 4, 4, []),
+    ],
+)
+def test_chunk_ranges(start, end, size, expected):
+    assert chunk_ranges(start, end, size) == expected
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 7, 100])
+def test_balanced_product(n):
+    values = list(range(1, n + 1))
+    assert balanced_product(values, 1) == math.factorial(n)
+    assert balanced_product(values, Fraction(1)) == Fraction(math.factorial(n))
+
+
+@pytest.mark.parametrize(
+    "text,bindings",
+    [
+        ("\\prod_{k=1}^{n}{k}", {"n": 300}),
+        ("\\prod_{k=1}^{n}{(2*k + x)}", {"n": 200, "x": 1}),
+        ("\\sum_{k=1}^{n}{_{k}\\mathrm{C}_{2} / (k + x)}", {"n": 250, "x": 3}),
+        ("let m = 2; \\sum_{j=-n}^{n}{\\prod_{k=1}^{m}{(j + k)}}", {"n": 150}),
+        ("\\prod_{k=1}^{n}{k}", {"n": 5}),
+    ],
+)
+@pytest.mark.parametrize("workers", [1, 2])
+def test_same_as_sequential(text, bindings, workers):
+    program = parse(text, "fraction")
+    expected = Evaluator(backend="fraction", closed_form=False).evaluate(program, bindings)
+
+    evaluator = Evaluator(backend="fraction", parallel_threshold=10, workers=workers)
+    assert evaluator.evaluate(program, bindings) == expected
+    run = compile_program(program, backend="fraction", parallel_threshold=10, workers=workers)
+    assert run(bindings) == expected
+
+
+def test_splits_above_threshold():
+    program = parse("\\prod_{k=1}^{n}{(k + x)}", "fraction")
+    with CountingExecutor() as executor:
+        evaluator = Evaluator(backend="fraction", parallel_threshold=100, workers=2, executor=executor)
+        assert evaluator.evaluate(program, {"n": 100, "x": 0}) == math.factorial(100)
+        assert executor.submitted == 0
+
+        assert evaluator.evaluate(program, {"n": 101, "x": 0}) == math.factorial(101)
+        assert executor.submitted > 1
+
+        # 반복 변수와 같은 이름의 binding은 body에서 가려짐
+        run = compile_program(program, backend="fraction", parallel_threshold=100, workers=2, executor=executor)
+        assert run({"n": 200, "x": 1, "k": 7}) == math.factorial(201)
+
+
+def test_splits_by_default():
+    program = parse(f"\\sum_{{k=1}}^{{{PARALLEL_THRESHOLD + 1}}}{{k % 2}}")
+    with CountingExecutor() as executor:
+        assert Evaluator(workers=2, executor=executor).evaluate(program) == PARALLEL_THRESHOLD // 2 + 1
+        submitted = executor.submitted
+        assert submitted > 1
+
+        Evaluator(workers=2, executor=executor, parallel_threshold=None).evaluate(program)
+        assert executor.submitted == submitted
+
+
+@pytest.mark.parametrize("backend", ["float", "decimal"])
+def test_result_does_not_depend_on_workers(backend):
+    # 부분합을 더하는 순서가 결과를 바꾸는 수식
+    program = parse("\\sum_{k=1}^{n}{1 / (k * 7)}", backend)
+    bindings = {"n": 1000}
+    results = set()
+    for workers in (1, 2, 3):
+        with CountingExecutor() as executor:
+            results.add(Evaluator(backend=backend, parallel_threshold=40, workers=workers).evaluate(program, bindings))
+            evaluator = Evaluator(backend=backend, parallel_threshold=40, executor=executor)
+            results.add(evaluator.evaluate(program, bindings))
+            results.add(compile_program(program, backend=backend, parallel_threshold=40, workers=workers)(bindings))
+    assert len(results) == 1
+
+
+def test_pool_is_reused(monkeypatch):
+    created = []
+
+    class CountingPool(CountingExecutor):
+        def __init__(self, max_workers):
+            super().__init__()
+            created.append(self)
+
+    monkeypatch.setattr(parallel, "ProcessPoolExecutor", CountingPool)
+    monkeypatch.setattr(parallel, "_pools", {})
+    program = parse("\\sum_{j=1}^{3}{\\prod_{k=1}^{n}{(k + j)}}", "fraction")
+    expected = sum(math.factorial(100 + j) // math.factorial(j) for j in range(1, 4))
+    try:
+        assert Evaluator(backend="fraction", parallel_threshold=10, workers=2).evaluate(program, {"n": 100}) == expected
+        run = compile_program(program, backend="fraction", parallel_threshold=10, workers=2)
+        assert run({"n": 100}) == expected
+        assert len(created) == 1 and created[0].submitted > 3
+    finally:
+        for pool in created:
+            pool.shutdown()
+
+
+def test_not_split_with_limits():
+    program = parse("\\sum_{k=1}^{n}{k * x}", "fraction")
+    with CountingExecutor() as executor:
+        evaluator = Evaluator(
+            backend="fraction", closed_form=False, parallel_threshold=10, executor=executor,
+            limits=EvaluationLimits(max_iterations=1000)
+        )
+        assert evaluator.evaluate(program, {"n": 100, "x": 2}) == 10100
+        assert executor.submitted == 0
+
+
+def test_worker_error():
+    program = parse("\\sum_{k=1}^{n}{k * y}", "fraction")
+    with pytest.raises(EvaluatorException):
+        Evaluator(backend="fraction", closed_form=False, parallel_threshold=10, workers=2).evaluate(program, {"n": 100})
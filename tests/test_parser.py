@@ -1,8 +1,13 @@
 import pytest
 
-from mathpreter.ast import LetStatement, ExpressionStatement, MathReducerExpression, CombinatoricsExpression
-from mathpreter.lexer import Lexer
-from mathpreter.parser import Parser
+from mathpreter.ast import (
+    LetStatement, ExpressionStatement, MathReducerExpression, CombinatoricsExpression, node_children
+)
+from mathpreter.errors import ParserException
+from mathpreter.lexer import Lexer, RegexLexer
+from mathpreter.limits import ast_depth
+from mathpreter.parser import Parser, IterativeParser
+from mathpreter.token import TokenType
 
 
 @pytest.mark.parametrize(
@@ -91,3 +96,132 @@ def test_single_expression_statement_with_Combinatorics(
     assert expr.identifier.literal() == expected_identifier
     assert str(expr.left) == expected_left
     assert str(expr.right) == expected_right
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    [
+        "let x = 3 + 2 / 3;",
+        "\\sum^{15*2}_{x=1+2}{x+15 }",
+        "_{1+3}\\mathrm{\\Pi}_{k*7}",
+    ],
+)
+def test_parser_with_regex_lexer(test_input):
+    expected = Parser(Lexer(test_input)).parse_program()
+    program = Parser(RegexLexer(test_input)).parse_program()
+
+    assert str(program) == str(expected)
+
+
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        ("1 + 2 + 3", "((1+2)+3)"),
+        ("1 + 3^3 * 5 + 2/5", "((1+((3^3)*5))+(2/5))"),
+        ("7 % 4 * 2", "((7%4)*2)"),
+    ],
+)
+def test_operator_chain(test_input, expected):
+    program = Parser(Lexer(test_input)).parse_program()
+    assert len(program.statements) == 1
+    assert str(program) == expected
+
+
+def test_nodes_and_tokens_have_no_instance_dict():
+    program = Parser(Lexer("let y = -x * 2; \sum_{k=1}^{3}{k} + _{4}\mathrm{C}_{2}")).parse_program()
+    let_stmt, expr_stmt = program.statements
+    reducer, combinatorics = expr_stmt.expression.left, expr_stmt.expression.right
+
+    for node in (program, let_stmt, let_stmt.name, let_stmt.value, let_stmt.value.left, let_stmt.value.right,
+                 expr_stmt, reducer, combinatorics, let_stmt.token):
+        assert not hasattr(node, "__dict__")
+    assert str(program) == "let y = (-x*2)\n(\\sum_{k=1}^{3}{k}+_{4}\\mathrm{C}_{2}))"
+
+
+def test_dispatch_tables_are_built_once_per_class():
+    parser = Parser(Lexer("1 + 2"))
+
+    assert "prefix_parse_fns" not in vars(parser) and "infix_parse_fns" not in vars(parser)
+    assert parser.prefix_parse_fns is Parser.prefix_parse_fns
+    assert IterativeParser.prefix_parse_fns is not Parser.prefix_parse_fns
+
+
+def test_subclass_overrides_dispatch():
+    class DoublingParser(Parser):
+        def parse_number(self):
+            literal = super().parse_number()
+            literal.value *= 2
+            return literal
+
+    assert DoublingParser.prefix_parse_fns[TokenType.NUMBER] is DoublingParser.parse_number
+    assert Parser.prefix_parse_fns[TokenType.NUMBER] is Parser.parse_number
+    assert str(DoublingParser(Lexer("1 + x * 3")).parse_program().statements[0].expression.right.right.value) == "6"
+
+
+def same_tree(left, right) -> bool:
+    """ 깊은 트리도 비교할 수 있도록 stack으로 순회
+    """
+    stack = [(left, right)]
+    while stack:
+        a, b = stack.pop()
+        if type(a) is not type(b):
+            return False
+        if a is None:
+            continue
+        if hasattr(a, "token") and (a.token.type != b.token.type or a.token.literal != b.token.literal):
+            return False
+        a_children, b_children = node_children(a), node_children(b)
+        if len(a_children) != len(b_children):
+            return False
+        stack.extend(zip(a_children, b_children))
+    return True
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    [
+        "1 + 2 + 3",
+        "1 + 3^3 * 5 + 2/5",
+        "-2^2 * 3 - (4 - (5))",
+        "--x^-y % 2",
+        "2^3^2 / 4 / 2",
+        "((((1))))",
+        "let y = -x * 2; \\sum_{k=1}^{3}{k} + _{4}\\mathrm{C}_{2}",
+        "\\sum^{15*2}_{x=1+2}{x * (x - \\prod_{j=1}^{x}{-(j + 1)})}",
+        "let a = 1; let b = a * (a + 2); b - -a",
+    ],
+)
+def test_iterative_parser_builds_same_tree(test_input):
+    expected = Parser(Lexer(test_input)).parse_program()
+    program = IterativeParser(Lexer(test_input)).parse_program()
+
+    assert str(program) == str(expected)
+    assert same_tree(program, expected)
+
+
+@pytest.mark.parametrize("test_input", ["(1 + 2", "((1 + 2) * 3", "\\sum_{k=1}^{(3}{k}"])
+def test_iterative_parser_missing_paren(test_input):
+    with pytest.raises(ParserException):
+        IterativeParser(Lexer(test_input)).parse_program()
+
+
+def test_iterative_parser_deep_nesting():
+    depth = 20000
+    text = "(" * depth + "x" + ")" * depth + " + " + "-(" * depth + "1" + ")" * depth
+    program = IterativeParser(RegexLexer(text)).parse_program()
+
+    # Program, ExpressionStatement, `+`, `-` * depth, 1
+    assert ast_depth(program) == depth + 4
+
+
+def test_iterative_parser_long_chain():
+    terms = 20000
+    text = " + ".join(f"x{i} * {i}" for i in range(terms))
+    program = IterativeParser(RegexLexer(text)).parse_program()
+
+    expr = program.statements[0].expression
+    for i in reversed(range(1, terms)):
+        assert expr.token.literal == "+"
+        assert str(expr.right) == f"(x{i}*{i})"
+        expr = expr.left
+    assert str(expr) == "(x0*0)"
@@ -0,0 +1,81 @@
+import pytest
+
+from mathpreter.evaluator import Evaluator, ClosureCompiler, compile_program
+from mathpreter.lexer import Lexer, RegexLexer
+from mathpreter.parser import Parser, IterativeParser
+from mathpreter.profiling import profile
+
+FORMULA = "let a = 3; \\sum_{k=1}^{20}{k % 7 + \\prod_{j=1}^{3}{j % 5}} + a"
+
+
+@pytest.mark.parametrize("lexer_cls", [Lexer, RegexLexer])
+@pytest.mark.parametrize("parser_cls", [Parser, IterativeParser])
+def test_lexer_and_parser_counts(lexer_cls, parser_cls):
+    # parser는 EOF 다음 토큰까지 미리 읽음
+    expected_tokens = len(RegexLexer(FORMULA).tokenize()) + 1
+
+    with profile() as report:
+        parser_cls(lexer_cls(FORMULA)).parse_program()
+
+    assert report.counters["lexer.tokens"] == expected_tokens
+    assert report.counters["ast.Program"] == 1
+    assert report.counters["ast.LetStatement"] == 1
+    assert report.counters["ast.MathReducerExpression"] == 2
+    assert report.counters["ast.NumberLiteral"] == 7
+    assert report.timings["parser.parse_program"].count == 1
+    assert report.timings["parser.parse_prefix_reducer_expression"].count == 2
+    assert report.timings["lexer.next_token"].count == expected_tokens
+
+
+def test_tokenize_is_counted_once():
+    with profile() as report:
+        tokens = RegexLexer("x + é + 1").tokenize()
+
+    assert report.counters["lexer.tokens"] == len(tokens)
+    assert report.timings["lexer.next_token"].count == 1
+
+
+@pytest.mark.parametrize("mode", ["evaluator", "compiled"])
+def test_reducer_iterations(mode):
+    program = Parser(Lexer(FORMULA)).parse_program()
+
+    with profile() as report:
+        if mode == "evaluator":
+            result = Evaluator(closed_form=False).evaluate(program)
+        else:
+            result = compile_program(program, closed_form=False)()
+
+    assert result == Evaluator(closed_form=False).evaluate(program)
+    assert report.timings["reducer.\\sum"].count == 1
+    assert report.timings["reducer.\\sum.iteration"].count == 20
+    assert report.timings["reducer.\\prod"].count == 20
+    assert report.timings["reducer.\\prod.iteration"].count == 60
+    phases = report.as_dict()["phases"]
+    assert set(phases) == {"lexing", "parsing", "compiling", "evaluating"}
+    assert phases["evaluating"] > 0
+
+
+def test_instrumentation_is_removed():
+    originals = (Lexer.next_token, Parser.parse_program, Evaluator.evaluate, ClosureCompiler.compile_expression)
+    prefix_parse_fns = dict(Parser.prefix_parse_fns)
+
+    with profile():
+        with profile() as inner:
+            assert Parser.parse_program is not originals[1]
+        assert Parser.parse_program is not originals[1]
+
+    assert (Lexer.next_token, Parser.parse_program, Evaluator.evaluate, ClosureCompiler.compile_expression) == originals
+    assert Parser.prefix_parse_fns == prefix_parse_fns
+    assert IterativeParser.parse_expression is vars(IterativeParser)["parse_expression"]
+
+    Evaluator().evaluate(Parser(Lexer(FORMULA)).parse_program())
+    assert inner.counters == {} and inner.timings == {}
+
+
+def test_report_format():
+    with profile() as report:
+        Evaluator().evaluate(Parser(RegexLexer(FORMULA)).parse_program())
+
+    text = str(report)
+    assert "evaluator.evaluate" in text and "lexer.tokens" in text
+    assert report.as_dict()["timings"]["evaluator.evaluate"]["count"] == 1
@@ -0,0 +1,87 @@
+from decimal import Decimal
+
+import pytest
+
+from mathpreter.evaluator import Evaluator, compile_program
+from mathpreter.lexer import Lexer
+from mathpreter.parser import Parser
+from mathpreter.reducer import faulhaber
+
+
+def parse(text: str):
+    return Parser(Lexer(text)).parse_program()
+
+
+@pytest.mark.parametrize("p", range(8))
+@pytest.mark.parametrize("n", [-4, -1, 0, 1, 7])
+def test_faulhaber(p, n):
+    expected = sum(k ** p for k in range(1, n + 1)) if n >= 0 else -sum(k ** p for k in range(n + 1, 1))
+    assert faulhaber(p, n) == expected
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    [
+        "\sum_{k=1}^{50}{k}",
+        "\sum_{k=-3}^{20}{3*k^3 - 2*k + 7}",
+        "\sum_{k=1}^{30}{(k+1)*(k-2)/4}",
+        "\sum_{k=0}^{10}{2^k}",
+        "\sum_{k=2}^{12}{5 * 3^(2*k-1) + k^2}",
+        "\sum_{k=1}^{10}{-(x*k)^2}",
+        "\sum_{k=5}^{1}{k^2}",
+        "\prod_{k=1}^{6}{x + 1}",
+        "\prod_{k=1}^{6}{2^(k-1)}",
+        "\sum_{k=1}^{10}{k % 3}",
+        "\sum_{i=1}^{4}{\sum_{j=1}^{i}{i*j}}",
+    ],
+)
+def test_closed_form_matches_loop(test_input):
+    program = parse(test_input)
+    bindings = {"x": 3}
+    expected = Evaluator(closed_form=False).evaluate(program, bindings)
+
+    assert Evaluator().evaluate(program, bindings) == pytest.approx(expected)
+    assert compile_program(program)(bindings) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    ["\\sum_{k=1}^{n}{y}", "\\sum_{k=1}^{n}{1/0}", "\\prod_{k=1}^{n}{y}", "\\prod_{k=1}^{n}{2^(k/0)}"],
+)
+def test_closed_form_skips_body_of_empty_range(test_input):
+    program = parse(test_input)
+    expected = Evaluator(closed_form=False).evaluate(program, {"n": 0})
+
+    assert Evaluator().evaluate(program, {"n": 0}) == expected
+    assert compile_program(program)({"n": 0}) == expected
+
+
+@pytest.mark.parametrize("test_input", ["\\prod_{k=-3}^{5}{0^k}", "\\prod_{k=0}^{2}{0^k}"])
+def test_closed_form_product_of_zero_powers(test_input):
+    program = parse(test_input)
+    with pytest.raises(ArithmeticError):
+        Evaluator(closed_form=False).evaluate(program)
+    with pytest.raises(ArithmeticError):
+        Evaluator().evaluate(program)
+    with pytest.raises(ArithmeticError):
+        compile_program(program)()
+
+
+def test_closed_form_huge_range():
+    program = parse("\sum_{k=1}^{10^8}{k^2 + 1}")
+    n = 10 ** 8
+
+    assert compile_program(program)() == Decimal(n * (n + 1) * (2 * n + 1) // 6 + n)
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    ["\sum_{k=1}^{1000}{k % 7 + 1/k}", "\prod_{k=1}^{20}{1 + 1/k}"],
+)
+def test_vectorized_reduction(test_input):
+    pytest.importorskip("numpy")
+    program = parse(test_input)
+    expected = Evaluator(closed_form=False).evaluate(program)
+
+    assert float(Evaluator(vectorize_reducers=True).evaluate(program)) == pytest.approx(float(expected))
+    assert float(compile_program(program, vectorize_reducers=True)()) == pytest.approx(float(expected))
@@ -0,0 +1,40 @@
+from mathpreter.resolver import Resolver
+
+
+def test_resolve_top_level():
+    resolver = Resolver()
+
+    assert resolver.resolve("x") == 0
+    assert resolver.resolve("y") == 1
+    assert resolver.resolve("x") == 0
+    assert resolver.inputs == {"x": 0, "y": 1}
+    assert resolver.new_frame() == [None, None]
+
+
+def test_reducer_variable_shadows_outer_name():
+    resolver = Resolver()
+    outer = resolver.resolve("k")
+
+    inner = resolver.enter("k")
+    assert inner != outer
+    assert resolver.resolve("k") == inner
+    assert resolver.visible() == {"k": inner}
+
+    nested = resolver.enter("k")
+    assert resolver.resolve("k") == nested
+    resolver.leave()
+    assert resolver.resolve("k") == inner
+    resolver.leave()
+
+    assert resolver.resolve("k") == outer
+    assert resolver.inputs == {"k": outer}
+    assert resolver.slot_names == ["k", "k", "k"]
+
+
+def test_free_name_inside_reducer_is_top_level():
+    resolver = Resolver()
+    resolver.enter("k")
+    slot = resolver.resolve("x")
+    resolver.leave()
+
+    assert resolver.inputs == {"x": slot}
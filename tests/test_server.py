@@ -0,0 +1,142 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from mathpreter.limits import EvaluationLimits
+from mathpreter.server import EvaluationServer
+
+
+async def request_lines(writer: asyncio.StreamWriter, reader: asyncio.StreamReader, requests: list) -> list:
+    for request in requests:
+        writer.write((request if isinstance(request, str) else json.dumps(request)).encode("utf-8") + b"\n")
+    await writer.drain()
+    # 응답이 오지 않으면 기다리지 않고 실패
+    responses = [json.loads(await asyncio.wait_for(reader.readline(), 30)) for _ in requests]
+    writer.close()
+    await writer.wait_closed()
+    return responses
+
+
+def run_tcp(requests: list, **options) -> list:
+    async def main():
+        server = EvaluationServer(**options)
+        listener = await server.start_tcp()
+        host, port = listener.sockets[0].getsockname()[:2]
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            return await request_lines(writer, reader, requests)
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+
+def test_evaluate_requests():
+    responses = run_tcp([
+        {"id": 1, "formula": "1 + 3^3 * 5 + 2/5"},
+        {"id": 2, "formula": "let y = x^2; y + 1", "bindings": {"x": 3}},
+        {"id": 3, "formula": "1/3 + 1/3", "backend": "fraction"},
+        {"id": 4, "formula": "let a = 1"},
+    ])
+
+    assert sorted(responses, key=lambda response: response["id"]) == [
+        {"id": 1, "result": "136.4"},
+        {"id": 2, "result": "10"},
+        {"id": 3, "result": "2/3"},
+        {"id": 4, "result": None},
+    ]
+
+
+def test_error_responses():
+    responses = run_tcp([
+        {"id": 1, "formula": "x + 1"},
+        {"id": 2, "formula": "let = 1"},
+        {"id": 3, "formula": "1 / 0"},
+        "not json",
+        {"id": 5, "formula": "1", "backend": "complex"},
+    ])
+    errors = {response["id"]: response["error"]["type"] for response in responses}
+
+    assert errors[1] == "EvaluatorException"
+    assert errors[2] == "ParserException"
+    assert errors[3] in ("DivisionByZero", "ZeroDivisionError")
+    assert errors[5] == "RequestError"
+    assert [response["error"]["type"] for response in responses if response["id"] is None] == ["RequestError"]
+
+
+def test_every_request_gets_a_response():
+    responses = run_tcp([
+        {"id": 1, "formula": "x + 1", "bindings": 5},
+        {"id": 2, "formula": "1", "backend": ["float"]},
+        {"id": 3, "formula": "(" * 3000 + "1" + ")" * 3000},
+        {"id": 4, "formula": "1 + (" * 3000 + "1" + ")" * 3000},
+        {"id": 5, "formula": "(0-8)^0.5", "backend": "float"},
+        {"id": 6, "formula": "1 + 1"},
+    ])
+    by_id = {response["id"]: response for response in responses}
+
+    assert by_id[1]["error"]["type"] == "RequestError"
+    assert by_id[2]["error"]["type"] == "RequestError"
+    assert by_id[3] == {"id": 3, "result": "1"}
+    assert by_id[4]["error"]["type"] == "InternalError"
+    assert by_id[5]["error"]["type"] == "EvaluatorException"
+    assert by_id[6] == {"id": 6, "result": "2"}
+
+
+def test_timeout_cancels_runaway_reducer():
+    begin = time.perf_counter()
+    responses = run_tcp(
+        [{"id": 1, "formula": "\sum_{k=1}^{10^12}{k % 7}"}, {"id": 2, "formula": "1 + 1"}],
+        workers=1, queue_depth=2, timeout=0.2
+    )
+
+    assert responses[0] == {"id": 1, "error": {"type": "TimeoutError", "message": "evaluation timed out after 0.2s"}}
+    # 취소된 계산이 worker를 계속 점유하지 않음
+    assert responses[1] == {"id": 2, "result": "2"}
+    assert time.perf_counter() - begin < 5
+
+
+def test_limits_reject_runaway_formulas():
+    responses = run_tcp(
+        [
+            {"id": 1, "formula": "\sum_{k=1}^{10^12}{k % 7}"},
+            {"id": 2, "formula": "2^(10^9)", "backend": "fraction"},
+            {"id": 3, "formula": "\sum_{k=1}^{100}{k % 7}"},
+        ],
+        limits=EvaluationLimits(max_iterations=10 ** 4, max_digits=1000)
+    )
+    responses = {response["id"]: response for response in responses}
+
+    assert responses[1]["error"]["type"] == "LimitExceededException"
+    assert responses[2]["error"]["type"] == "LimitExceededException"
+    assert responses[3] == {"id": 3, "result": "297"}
+
+
+def test_backpressure_keeps_results():
+    requests = [{"id": i, "formula": f"\sum_{{k=1}}^{{200}}{{k % {i + 2}}}"} for i in range(20)]
+    responses = run_tcp(requests, workers=1, queue_depth=2)
+
+    assert sorted(response["id"] for response in responses) == list(range(20))
+    assert all("result" in response for response in responses)
+
+
+def test_unix_socket(tmp_path):
+    path = str(tmp_path / "mathpreter.sock")
+
+    async def main():
+        server = EvaluationServer()
+        await server.start_unix(path)
+        try:
+            reader, writer = await asyncio.open_unix_connection(path)
+            return await request_lines(writer, reader, [{"id": "a", "formula": "_{5}\mathrm{C}_{2}"}])
+        finally:
+            await server.close()
+
+    assert asyncio.run(main()) == [{"id": "a", "result": "10"}]
+
+
+def test_invalid_queue_depth():
+    with pytest.raises(ValueError):
+        EvaluationServer(workers=4, queue_depth=2)
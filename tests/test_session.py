@@ -0,0 +1,98 @@
+from decimal import Decimal
+
+import pytest
+
+from mathpreter.errors import EvaluatorException, LimitExceededException
+from mathpreter.evaluator import Evaluator
+from mathpreter.lexer import Lexer
+from mathpreter.limits import EvaluationLimits
+from mathpreter.parser import Parser
+from mathpreter.session import EvaluationSession, same_value
+
+PROGRAM = "let a = x^2; let b = \\sum_{k=1}^{n}{k}; let c = a + y; let d = b * 2; c + d"
+
+
+def parse(text: str):
+    return Parser(Lexer(text)).parse_program()
+
+
+@pytest.mark.parametrize(
+    "updates,expected",
+    [
+        ({}, []),
+        ({"y": 5}, [2, 4]),
+        ({"x": 3}, [0, 2, 4]),
+        ({"x": -2}, [0]),  # a의 값이 같으면 c, 결과는 다시 계산하지 않음
+        ({"n": 20}, [1, 3, 4]),
+        ({"x": 2.0}, [0, 2, 4]),
+    ],
+)
+def test_recomputes_only_affected_statements(updates, expected):
+    session = EvaluationSession(parse(PROGRAM))
+    bindings = {"x": 2, "y": 1, "n": 10}
+    session.evaluate(bindings)
+    assert session.recomputed == [0, 1, 2, 3, 4]
+
+    bindings = {**bindings, **updates}
+    assert session.evaluate(bindings) == Evaluator().evaluate(parse(PROGRAM), bindings)
+    assert session.recomputed == expected
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    [
+        "let x = x + 1; let x = x * 2; x + y",
+        "let k = 3; \\sum_{k=1}^{x}{k} + k",
+        "let a = x; let b = a; let a = y; a + b",
+        "x + 1; let z = x",
+    ],
+)
+def test_same_as_evaluator(test_input):
+    session = EvaluationSession(parse(test_input))
+    for bindings in [{"x": 1, "y": 2}, {"x": 1, "y": 3}, {"x": 4, "y": 3}, {"x": 4, "y": 3}, {"x": 1, "y": 2}]:
+        assert session.evaluate(bindings) == Evaluator().evaluate(parse(test_input), bindings)
+
+
+def test_variables():
+    session = EvaluationSession(parse(PROGRAM))
+    session.evaluate({"x": 2, "y": 1, "n": 10})
+
+    assert session.variables == {
+        "x": 2, "y": 1, "n": 10, "a": 4, "b": 55, "c": 5, "d": 110,
+    }
+
+
+def test_removed_binding():
+    session = EvaluationSession(parse("let a = 1; a + x"))
+    assert session.evaluate({"x": 1}) == 2
+
+    with pytest.raises(EvaluatorException):
+        session.evaluate({})
+    assert session.evaluate({"x": 1}) == 2
+    assert session.recomputed == [0, 1]
+
+
+def test_failed_evaluation_recomputes_everything():
+    limits = EvaluationLimits(max_iterations=100)
+    evaluator = Evaluator(closed_form=False, limits=limits)
+    session = EvaluationSession(parse("let a = x * 2; let b = \\sum_{k=1}^{n}{k}; a + b"), evaluator)
+    session.evaluate({"x": 1, "n": 10})
+
+    with pytest.raises(LimitExceededException):
+        session.evaluate({"x": 2, "n": 1000})
+    # a는 x=2로 계산되었지만 이전 입력으로 돌아가도 다시 계산
+    assert session.evaluate({"x": 1, "n": 10}) == 57
+    assert session.recomputed == [0, 1, 2]
+
+
+@pytest.mark.parametrize(
+    "left,right,expected",
+    [
+        (Decimal("1"), Decimal("1"), True),
+        (Decimal("1"), Decimal("1.0"), False),
+        (0.0, -0.0, False),
+        (1.0, Decimal("1"), False),
+    ],
+)
+def test_same_value(left, right, expected):
+    assert same_value(left, right) is expected
@@ -0,0 +1,68 @@
+import io
+
+import pytest
+
+from mathpreter.errors import ParserException
+from mathpreter.lexer import Lexer
+from mathpreter.parser import Parser
+from mathpreter.stream import iter_chunks, parse_stream
+
+TEXT = "let a = 2;\nlet b = a * x;\n\sum_{k=1}^{10}{k * b};\n_{5}\mathrm{C}_{2} + (1 - a) ^ 2"
+
+
+def expected_statements(text: str):
+    return [str(stmt) for stmt in Parser(Lexer(text)).parse_program().statements]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 16, 1 << 16])
+def test_parse_file_object(chunk_size):
+    statements = parse_stream(io.StringIO(TEXT), chunk_size=chunk_size)
+
+    assert [str(stmt) for stmt in statements] == expected_statements(TEXT)
+
+
+def test_parse_path(tmp_path):
+    path = tmp_path / "formulas.tex"
+    path.write_text(TEXT, encoding="utf-8")
+
+    assert [str(stmt) for stmt in parse_stream(path)] == expected_statements(TEXT)
+    assert [str(stmt) for stmt in parse_stream(str(path), chunk_size=5)] == expected_statements(TEXT)
+
+
+def test_parse_lines():
+    lines = io.StringIO(TEXT).readlines()
+
+    assert [str(stmt) for stmt in parse_stream(lines)] == expected_statements(TEXT)
+
+
+def test_statements_are_yielded_lazily():
+    consumed = []
+
+    def lines():
+        for i in range(1000):
+            consumed.append(i)
+            yield f"x + {i};\n"
+
+    statements = parse_stream(lines())
+    assert str(next(statements)) == "(x+0)"
+    assert len(consumed) <= 3
+    statements.close()
+
+
+def test_iter_chunks_closes_file(tmp_path):
+    path = tmp_path / "formulas.tex"
+    path.write_text(TEXT, encoding="utf-8")
+
+    statements = parse_stream(path, chunk_size=4)
+    next(statements)
+    statements.close()
+
+    assert list(iter_chunks(path, chunk_size=1 << 16)) == [TEXT]
+
+
+def test_parse_stream_failure():
+    statements = parse_stream(["let a = 1;\n", "let = 2;\n"])
+
+    assert str(next(statements)) == "let a = 1"
+    with pytest.raises(ParserException):
+        next(statements)
@@ -1,6 +1,6 @@
 import pytest
 
-from mathpreter.token import TokenType, Token
+from mathpreter.token import CONSTANTS, TOKEN_TABLE, SpanToken, TokenType, Token
 
 
 @pytest.mark.parametrize(
@@ -46,3 +46,39 @@ def test_initialize_token(test_input, expected):
 )
 def test_illegal_token(test_input):
     assert Token(test_input).type == TokenType.ILLEGAL
+
+
+@pytest.mark.parametrize(
+    "test_input,expected_type,expected_literal",
+    [
+        ("", TokenType.EOF, ""),
+        ("  + ", TokenType.PLUS, "+"),
+        ("\pi", TokenType.NUMBER, CONSTANTS["\pi"]),
+        ("\sum", TokenType.TEX_REDUCE_OP, "\sum"),
+        ("let", TokenType.LET, "let"),
+    ],
+)
+def test_token_table_lookup(test_input, expected_type, expected_literal):
+    assert TOKEN_TABLE.get(test_input.strip()) == (expected_type, expected_literal)
+
+    token = Token(test_input)
+    assert token.type == expected_type
+    assert token.literal == expected_literal
+
+
+def test_token_type_hash_and_eq():
+    table = {token_type: token_type.value for token_type in TokenType}
+
+    assert all(table[token_type] == token_type.value for token_type in TokenType)
+    assert TokenType.PLUS != "+" and TokenType("+") == TokenType.PLUS
+    assert "+" not in table
+    assert TokenType.PLUS == TokenType.PLUS and TokenType.PLUS != TokenType.MINUS
+
+
+def test_span_token():
+    token = SpanToken("\\pi", 3, 6)
+
+    assert (token.type, token.literal) == (TokenType.NUMBER, CONSTANTS["\\pi"])
+    shifted = token.shifted(-3)
+    assert (shifted.type, shifted.literal, shifted.start, shifted.end) == (TokenType.NUMBER, token.literal, 0, 3)
+    assert (token.start, token.end) == (3, 6)
@@ -0,0 +1,50 @@
+import pytest
+
+from mathpreter.errors import EvaluatorException
+from mathpreter.evaluator import compile_program
+from mathpreter.lexer import Lexer
+from mathpreter.parser import Parser
+
+np = pytest.importorskip("numpy")
+
+from mathpreter.vectorize import evaluate_vectorized, vectorize_program  # noqa: E402
+
+
+def parse(text: str):
+    return Parser(Lexer(text)).parse_program()
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    [
+        "x^2 + 3*x",
+        "-x / 4 - 1",
+        "let y = x * \pi; y % 3 + \exp^x",
+        "(x - 2) * (x + 2) / 5",
+    ],
+)
+def test_vectorized_matches_scalar_evaluation(test_input):
+    program = parse(test_input)
+    xs = np.linspace(-3, 3, 13)
+
+    result = evaluate_vectorized(program, {"x": xs})
+
+    run = compile_program(program)
+    expected = [float(run({"x": float(x)})) for x in xs]
+    np.testing.assert_allclose(result, expected)
+
+
+def test_vectorized_broadcasting():
+    run = vectorize_program(parse("a * b + 1"))
+
+    result = run({"a": np.arange(3), "b": 2})
+    np.testing.assert_array_equal(result, [1, 3, 5])
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    ["_{5}\mathrm{C}_{x}", "y + 1"],
+)
+def test_vectorized_failure(test_input):
+    with pytest.raises(EvaluatorException):
+        evaluate_vectorized(parse(test_input), {"x": np.arange(3)})
@@ -0,0 +1,71 @@
+import pytest
+
+from mathpreter.code import Opcode, disassemble, make
+from mathpreter.compiler import compile_to_bytecode
+from mathpreter.errors import EvaluatorException
+from mathpreter.evaluator import Evaluator
+from mathpreter.lexer import Lexer
+from mathpreter.parser import Parser
+from mathpreter.vm import VM
+
+
+def parse(text: str, backend=None):
+    return Parser(Lexer(text), backend=backend).parse_program()
+
+
+def test_make_and_disassemble():
+    instructions = make(Opcode.CONSTANT, 0) + make(Opcode.LOAD, 1) + make(Opcode.ADD) + make(Opcode.RESULT)
+    assert instructions == [0, 0, 1, 1, 3, 16]
+    assert disassemble(instructions) == "0000 CONSTANT 0\n0002 LOAD 1\n0004 ADD\n0005 RESULT"
+
+
+def test_make_checks_operand_count():
+    with pytest.raises(ValueError):
+        make(Opcode.LOOP, 1, 2)
+
+
+@pytest.mark.parametrize(
+    "test_input,bindings",
+    [
+        ("1 + 3^3 * 5 + 2/5", None),
+        ("- (5 - 2) ^ 2 % 4", None),
+        ("\sum_{k=1}^{5} {k+5}", None),
+        ("\prod_{k=1}^{3} {2*k}", None),
+        ("\sum_{k=3}^{2} {k}", None),
+        ("\sum_{i=1}^{4}{\prod_{j=1}^{i}{j + i}}", None),
+        ("\sum_{x=1}^{3}{x} + x", {"x": 10}),
+        ("\sum_{k=1}^{k}{k}", {"k": 4}),
+        ("_{5}\mathrm{P}_{2} + _{5}\mathrm{C}_{2} + _{3}\mathrm{\Pi}_{2} + _{3}\mathrm{H}_{2}", None),
+        ("let a = 2; let b = a * x; let a = b + a; a", {"x": 3}),
+        ("let x = x + 1; x * 2", {"x": 3}),
+    ],
+)
+@pytest.mark.parametrize("backend", ["float", "decimal", "fraction"])
+def test_vm_matches_evaluator(test_input, bindings, backend):
+    program = parse(test_input, backend)
+    expected = Evaluator(backend=backend, closed_form=False).evaluate(program, bindings)
+
+    vm = VM(compile_to_bytecode(program, backend))
+    assert vm.run(bindings) == expected
+    # 같은 VM을 반복 실행
+    assert vm.run(bindings) == expected
+
+
+def test_constants_are_deduplicated():
+    bytecode = compile_to_bytecode(parse("2 * x + 2 * y + 2"))
+    assert len(bytecode.constants) == 1
+    assert set(bytecode.inputs) == {"x", "y"}
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    ["x + 1", "\sum_{k=1}^{2.5}{k}", "_{3}\mathrm{C}_{-1}"],
+)
+def test_vm_failure(test_input):
+    with pytest.raises(EvaluatorException):
+        VM(compile_to_bytecode(parse(test_input))).run()
+
+
+def test_compile_failure():
+    with pytest.raises(EvaluatorException):
+        compile_to_bytecode(parse("_{3}\mathrm{Q}_{2}"))